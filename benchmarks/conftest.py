@@ -0,0 +1,51 @@
+import pytest
+
+from mock_wris import MockWRISServer
+from pywris import HydroFrame
+from pywris.surface_water.storage.reservoir import get_reservoirs
+
+pytest.importorskip("pytest_benchmark")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("pywris benchmarks")
+    group.addoption("--wris-reservoirs", type=int, default=200,
+                    help="Number of synthetic reservoirs served by the mock server (default 200).")
+    group.addoption("--wris-years", type=int, default=3,
+                    help="Years of daily data per reservoir (default 3).")
+    group.addoption("--wris-latency", type=float, default=0.0,
+                    help="Seconds added to every mock response (default 0).")
+    group.addoption("--wris-error-rate", type=float, default=0.0,
+                    help="Fraction of mock requests answered with HTTP 503 (default 0).")
+
+@pytest.fixture(scope="session")
+def wris_scale(request):
+    years = request.config.getoption("--wris-years")
+    return {
+        'n_reservoirs': request.config.getoption("--wris-reservoirs"),
+        'start_date': f"{2024 - years + 1}-01-01",
+        'end_date': "2024-12-31",
+    }
+
+@pytest.fixture(scope="session")
+def wris_server(request, wris_scale):
+    """Mock IndiaWRIS server for the whole session, with pywris pointed at it."""
+    server = MockWRISServer(
+        wris_scale['n_reservoirs'], wris_scale['start_date'], wris_scale['end_date'],
+        latency=request.config.getoption("--wris-latency"),
+        error_rate=request.config.getoption("--wris-error-rate"),
+    )
+    with server, server.patch_config():
+        yield server
+
+@pytest.fixture(scope="session")
+def wris_hydroframe(wris_server, wris_scale):
+    """HydroFrame with all reservoirs of the mock server, fetched once for the processing benchmarks."""
+    reservoirs, reservoirs_gdf, store = get_reservoirs(
+        wris_scale['end_date'], wris_scale['start_date'], selected_states='all', max_workers=8
+    )
+    hf = HydroFrame()
+    hf.add_state('all')
+    hf.reservoirs, hf.reservoirs_gdf, hf.reservoirs_rawData = reservoirs, reservoirs_gdf, store
+    hf.timestep, hf.start_date, hf.end_date = 'Daily', wris_scale['start_date'], wris_scale['end_date']
+    return hf
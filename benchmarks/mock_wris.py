@@ -0,0 +1,351 @@
+"""
+Local stand-in for the IndiaWRIS endpoints in `requests_config`, serving synthetic data.
+
+Run it on its own with `python benchmarks/mock_wris.py --reservoirs 1000 --port 8765`, or use
+`MockWRISServer` as a context manager and `patch_config` to point pywris at it.
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from pywris.static_data.request_urls import requests_config, transport_config
+from pywris.static_data.state_ids import state_id
+from pywris.utils.fetch_wris import close_sessions, reset_limiters
+from pywris.utils.memoize import clear_memoized
+
+DISTRICTS_PER_STATE = 4
+# ArcGIS where clauses: "field IN ('a','b')", "field >= 10", "field = 'a'"
+CONDITION_IN = re.compile(r"^\s*(\w+)\s+IN\s*\((.*)\)\s*$", re.IGNORECASE | re.DOTALL)
+CONDITION_COMPARE = re.compile(r"^\s*(\w+)\s*(>=|<=|=)\s*(.+?)\s*$", re.DOTALL)
+STRING_LITERAL = re.compile(r"'((?:[^']|'')*)'")
+
+
+def parse_literals(text):
+    """
+    Returns the values of a comma-separated list of SQL literals.
+    """
+    strings = [value.replace("''", "'") for value in STRING_LITERAL.findall(text)]
+    if strings:
+        return strings
+    return [float(value) for value in text.split(",") if value.strip()]
+
+def split_conditions(where):
+    """
+    Splits a where clause on AND, ignoring ANDs inside quoted literals.
+    """
+    conditions, current, quoted = [], [], False
+    for token in re.split(r"(\s+AND\s+|')", where, flags=re.IGNORECASE):
+        if token == "'":
+            quoted = not quoted
+        if not quoted and re.fullmatch(r"\s+AND\s+", token, flags=re.IGNORECASE):
+            conditions.append("".join(current))
+            current = []
+        else:
+            current.append(token)
+    conditions.append("".join(current))
+    return [condition for condition in conditions if condition.strip()]
+
+
+class SyntheticWRIS:
+    """
+    Deterministic synthetic IndiaWRIS database: reservoir metadata, districts and daily series.
+
+    Parameters:
+    ----------
+    n_reservoirs : int
+        Number of reservoirs, spread over all states (default is 100).
+    start_date, end_date : str
+        Range of the available data (default is '1991-01-01' to '2024-12-31').
+    seed : int
+        Seed of the synthetic attributes (default is 0).
+    """
+
+    def __init__(self, n_reservoirs=100, start_date='1991-01-01', end_date='2024-12-31', seed=0):
+        self.start_date = start_date
+        self.end_date = end_date
+        rng = np.random.default_rng(seed)
+        states = list(state_id.keys())
+        self.reservoirs = []
+        for i in range(n_reservoirs):
+            state = states[i % len(states)]
+            capacity = float(np.round(rng.lognormal(4, 1.2), 2))
+            self.reservoirs.append({
+                'station_name': f"Reservoir {i:05d}",
+                'station_type': 'Reservoir',
+                'state_name': state,
+                'state_code': state_id[state],
+                'district_name': f"{state} District {i // len(states) % DISTRICTS_PER_STATE}",
+                'block_name': f"Block {i % 7}",
+                'basin_name': f"Basin {i % 12}",
+                'basin_code': f"B{i % 12:02d}",
+                'sub_basin_name': f"Sub-Basin {i % 40}",
+                'agency_name': f"Agency {i % 5}",
+                'dam_code': f"D{i:05d}",
+                'lat': float(np.round(rng.uniform(8, 34), 4)),
+                'long': float(np.round(rng.uniform(68, 97), 4)),
+                'frl': float(np.round(rng.uniform(50, 1500), 1)),
+                'lsc_frl': capacity,
+            })
+        self.by_name = {reservoir['station_name']: reservoir for reservoir in self.reservoirs}
+
+    def districts(self, state_codes):
+        features = []
+        for code in state_codes:
+            state = state_id.inverse.get(code)
+            for k in range(DISTRICTS_PER_STATE):
+                features.append({'attributes': {
+                    'district': f"{state} District {k}", 'state': code,
+                    'district_code': zlib.crc32(f"{code}{k}".encode()) % 100000,
+                    'st_area(shape)': 1000.0 + k, 'st_length(shape)': 100.0 + k,
+                }})
+        return {'features': features}
+
+    def reservoir_names(self, states, districts):
+        names = sorted(
+            reservoir['station_name'] for reservoir in self.reservoirs
+            if reservoir['state_name'] in states and reservoir['district_name'] in districts
+        )
+        return [[name] for name in names]
+
+    def reservoir_info(self, where):
+        selected = self.reservoirs
+        for condition in split_conditions(where):
+            match = CONDITION_IN.match(condition)
+            if match:
+                field, values = match.group(1), set(parse_literals(match.group(2)))
+                selected = [reservoir for reservoir in selected if reservoir.get(field) in values]
+                continue
+            match = CONDITION_COMPARE.match(condition)
+            if not match:
+                raise ValueError(f"Unsupported condition: {condition}")
+            field, operator, value = match.group(1), match.group(2), parse_literals(match.group(3))[0]
+            if operator == '=':
+                selected = [reservoir for reservoir in selected if reservoir.get(field) == value]
+            elif operator == '>=':
+                selected = [reservoir for reservoir in selected if reservoir.get(field) >= value]
+            else:
+                selected = [reservoir for reservoir in selected if reservoir.get(field) <= value]
+        return {'features': [{'attributes': reservoir} for reservoir in selected]}
+
+    def timeseries(self, names, timestep, start_date, end_date):
+        """
+        Returns the JSON body of a `resdnlddata` response: a seasonal level and storage series per reservoir.
+        """
+        start = max(pd.Timestamp(start_date), pd.Timestamp(self.start_date))
+        end = min(pd.Timestamp(end_date), pd.Timestamp(self.end_date))
+        freq = {'Daily': 'D', 'Monthly': 'MS', 'Yearly': 'YS'}[timestep]
+        dates = pd.date_range(start, end, freq=freq)
+        date_strings = dates.strftime('%Y-%m-%d').tolist()
+        season = np.sin(2 * np.pi * (dates.dayofyear.to_numpy() - 150) / 365.25)
+        parts = []
+        for name in names:
+            reservoir = self.by_name.get(name)
+            if reservoir is None or not len(dates):
+                continue
+            phase = zlib.crc32(name.encode()) % 1000 / 1000
+            fill = np.clip(0.55 + 0.35 * season + 0.1 * np.sin(np.arange(len(dates)) / 97 + phase * 6), 0.02, 1)
+            storage = np.round(fill * reservoir['lsc_frl'], 3)
+            level = np.round(reservoir['frl'] * (0.7 + 0.3 * fill), 2)
+            prefix = (
+                f'{{"Reservoir Name":{json.dumps(name)},"Parent":{json.dumps(reservoir["state_name"])},'
+                f'"Child":{json.dumps(reservoir["district_name"])},"Date":"'
+            )
+            parts.extend(
+                f'{prefix}{date}","Level":{lev},"Current Live Storage":{sto}}}'
+                for date, lev, sto in zip(date_strings, level.tolist(), storage.tolist())
+            )
+        return "[" + ",".join(parts) + "]"
+
+
+class MockWRISServer:
+    """
+    HTTP server implementing `getReservoirBusinessData`, `resdnlddata` and the ArcGIS query endpoints
+    of `requests_config` on localhost, in a background thread.
+
+    Parameters:
+    ----------
+    n_reservoirs, start_date, end_date, seed :
+        Size and range of the synthetic database (see `SyntheticWRIS`).
+    latency : float, optional
+        Seconds added to every response (default is 0).
+    error_rate : float, optional
+        Fraction of requests answered with HTTP 503 (default is 0).
+    port : int, optional
+        Port to listen on; 0 (default) picks a free port.
+
+    Example:
+    --------
+    >>> with MockWRISServer(n_reservoirs=1000, latency=0.05) as server, server.patch_config():
+    ...     reservoirs, gdf, store = get_reservoirs('2024-12-31', selected_states='all')
+    """
+
+    def __init__(self, n_reservoirs=100, start_date='1991-01-01', end_date='2024-12-31', seed=0,
+                 latency=0.0, error_rate=0.0, port=0):
+        self.database = SyntheticWRIS(n_reservoirs, start_date, end_date, seed)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @contextmanager
+    def patch_config(self, throttle=False):
+        """
+        Points every endpoint of `requests_config` at this server, and clears the in-process caches,
+        pooled sessions and limiters on entry and exit.
+
+        Parameters:
+        ----------
+        throttle : bool, optional
+            If False (default), the rate limits are lifted so that benchmarks measure pywris rather
+            than the limiter. True keeps the production limiter settings.
+        """
+        saved_urls = {}
+        saved_limits = {}
+        for group_name, group in requests_config.items():
+            for name, endpoint in group.items():
+                saved_urls[group_name, name] = endpoint['url']
+                path = urlsplit(endpoint['url'])
+                endpoint['url'] = self.url + path.path + ('?' if endpoint['url'].endswith('?') else '')
+                if not throttle and 'rate_limit' in endpoint:
+                    saved_limits[group_name, name] = endpoint['rate_limit']
+                    endpoint['rate_limit'] = {**endpoint['rate_limit'], 'rate': None, 'max_concurrency': 64}
+        saved_default_limits = transport_config['rate_limit']
+        if not throttle:
+            transport_config['rate_limit'] = {**saved_default_limits, 'rate': None, 'max_concurrency': 64}
+
+        def reset():
+            clear_memoized()
+            close_sessions()
+            reset_limiters()
+
+        reset()
+        try:
+            yield self
+        finally:
+            for (group_name, name), url in saved_urls.items():
+                requests_config[group_name][name]['url'] = url
+            for (group_name, name), limits in saved_limits.items():
+                requests_config[group_name][name]['rate_limit'] = limits
+            transport_config['rate_limit'] = saved_default_limits
+            reset()
+
+    def _fail(self):
+        with self._lock:
+            self.requests += 1
+            return self.error_rate > 0 and self._random.random() < self.error_rate
+
+    def _route(self, method, path, query, payload):
+        """
+        Returns the response body of a request, or None for an unknown endpoint.
+        """
+        database = self.database
+        if method == 'POST' and path.endswith('/getReservoirBusinessData'):
+            sql = payload['stnVal']['qry']
+            if 'distinct(reservoir_name)' in sql:
+                states_sql, districts_sql = re.search(
+                    r"state_name in \((.*)\) and district_name in \((.*)\) order by", sql, re.DOTALL
+                ).groups()
+                return json.dumps(database.reservoir_names(set(parse_literals(states_sql)), set(parse_literals(districts_sql))))
+            return json.dumps([[database.start_date, database.end_date]])
+        if method == 'POST' and path.endswith('/resdnlddata'):
+            request = payload['stnVal']
+            names = parse_literals(request['Reservoir'].strip('"'))
+            return database.timeseries(names, request['Timestep'], request['Startdate'], request['Enddate'])
+        if method == 'GET' and path.endswith('/Reservoir_Points/MapServer/0/query'):
+            return json.dumps(database.reservoir_info(query.get('where', [''])[0]))
+        if method == 'GET' and path.endswith('/Administrative_NWIC/MapServer/1/query'):
+            match = CONDITION_IN.match(query.get('where', [''])[0])
+            return json.dumps(database.districts(parse_literals(match.group(2)) if match else []))
+        return None
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, like the real server, so that pooled connections are reused
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _respond(self, method):
+                parts = urlsplit(self.path)
+                length = int(self.headers.get('Content-Length') or 0)
+                payload = json.loads(self.rfile.read(length)) if length else None
+                if server.latency:
+                    time.sleep(server.latency)
+                if server._fail():
+                    body, status = b'{"error": "Service Unavailable"}', 503
+                else:
+                    try:
+                        text = server._route(method, parts.path, parse_qs(parts.query), payload)
+                    except (KeyError, TypeError, ValueError, AttributeError) as error:
+                        text, status = json.dumps({'error': str(error)}), 400
+                    else:
+                        status = 200 if text is not None else 404
+                        text = text if text is not None else '{"error": "Not Found"}'
+                    body = text.encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                self._respond('GET')
+
+            def do_POST(self):
+                self._respond('POST')
+
+        return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in for the IndiaWRIS endpoints used by pywris.")
+    parser.add_argument("--reservoirs", type=int, default=100)
+    parser.add_argument("--start", default="1991-01-01")
+    parser.add_argument("--end", default="2024-12-31")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args(argv)
+    server = MockWRISServer(args.reservoirs, args.start, args.end, latency=args.latency,
+                            error_rate=args.error_rate, port=args.port)
+    print(f"Serving {args.reservoirs} synthetic reservoirs on {server.url}")
+    server.httpd.serve_forever()
+
+if __name__ == "__main__":
+    main()
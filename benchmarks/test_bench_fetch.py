@@ -0,0 +1,49 @@
+"""
+Benchmarks of downloading from the mock IndiaWRIS server: metadata, time series and the full
+`get_reservoirs` pipeline. Every round starts with empty in-process caches and a new connection pool.
+"""
+from pywris.surface_water.storage.reservoir import get_reservoirs, fetch_reservoir_timeseries, select_reservoirs
+from pywris.utils.fetch_wris import close_sessions
+from pywris.utils.memoize import clear_memoized
+
+
+def cold_start():
+    clear_memoized()
+    close_sessions()
+
+def test_select_reservoirs(benchmark, wris_server, wris_scale):
+    selection = benchmark.pedantic(
+        select_reservoirs, args=(wris_scale['end_date'], wris_scale['start_date'], 'Daily', 'all'),
+        setup=cold_start, rounds=5,
+    )
+    assert len(selection[0]) == wris_scale['n_reservoirs']
+
+def test_fetch_reservoir_timeseries(benchmark, wris_server, wris_scale):
+    names = [reservoir['station_name'] for reservoir in wris_server.database.reservoirs]
+    store = benchmark.pedantic(
+        fetch_reservoir_timeseries, args=(names, 'Daily', wris_scale['start_date'], wris_scale['end_date']),
+        kwargs={'max_workers': 8}, setup=cold_start, rounds=3,
+    )
+    assert store['Reservoir Name'].nunique() == len(names)
+
+def test_get_reservoirs(benchmark, wris_server, wris_scale):
+    result = benchmark.pedantic(
+        get_reservoirs, args=(wris_scale['end_date'], wris_scale['start_date'], 'Daily'),
+        kwargs={'selected_states': 'all', 'max_workers': 8}, setup=cold_start, rounds=3,
+    )
+    assert len(result[0]) == wris_scale['n_reservoirs']
+
+def test_get_reservoirs_filtered(benchmark, wris_server, wris_scale):
+    result = benchmark.pedantic(
+        get_reservoirs, args=(wris_scale['end_date'], wris_scale['start_date'], 'Daily'),
+        kwargs={'selected_states': 'all', 'filters': {'live_cap_frl': (100, None)}, 'max_workers': 8},
+        setup=cold_start, rounds=3,
+    )
+    assert result is None or (result[1]['live_cap_frl'] >= 100).all()
+
+def test_get_reservoirs_monthly(benchmark, wris_server, wris_scale):
+    result = benchmark.pedantic(
+        get_reservoirs, args=(wris_scale['end_date'], wris_scale['start_date'], 'Monthly'),
+        kwargs={'selected_states': 'all', 'max_workers': 8}, setup=cold_start, rounds=3,
+    )
+    assert len(result[0]) == wris_scale['n_reservoirs']
@@ -0,0 +1,92 @@
+"""
+Benchmarks of the in-memory hot paths on data served by the mock IndiaWRIS server: parsing,
+object building, filtering, aggregation and HTML rendering. No requests are timed.
+"""
+import io
+
+import pandas as pd
+import pytest
+
+import pywris.geo_units.components as geo_components
+import pywris.surface_water.storage.reservoir as py_reservoir
+from pywris.surface_water.storage.climatology import compute_climatology
+from pywris.utils.fetch_wris import iter_json_items
+from pywris.utils.ingest import RecordBuffer
+
+
+@pytest.fixture(scope="module")
+def response_body(wris_server, wris_scale):
+    """Body of one `resdnlddata` response with 50 reservoirs over the whole date range."""
+    names = [reservoir['station_name'] for reservoir in wris_server.database.reservoirs[:50]]
+    return wris_server.database.timeseries(names, 'Daily', wris_scale['start_date'], wris_scale['end_date']).encode()
+
+@pytest.fixture(scope="module")
+def reservoir_info_df(wris_server):
+    return pd.json_normalize(wris_server.database.reservoir_info("station_type='Reservoir'")['features'])
+
+def parse_response(body):
+    records = RecordBuffer(numeric_columns=py_reservoir.TIMESERIES_COLUMNS[2:])
+    records.extend(iter_json_items(io.BytesIO(body)))
+    return py_reservoir.build_timeseries_store(records.to_frame(), date_format='%Y-%m-%d')
+
+#Parse: JSON response -> typed columnar store
+def test_parse_response(benchmark, response_body):
+    store = benchmark(parse_response, response_body)
+    assert store['Reservoir Name'].nunique() == 50
+
+#Build: columnar store -> Reservoir objects and GeoDataFrame
+def test_build_timeseries_store(benchmark, wris_hydroframe):
+    raw = wris_hydroframe.reservoirs_rawData.assign(
+        **{'Reservoir Name': wris_hydroframe.reservoirs_rawData['Reservoir Name'].astype(str)}
+    )
+    store = benchmark(py_reservoir.build_timeseries_store, raw)
+    assert len(store) == len(raw)
+
+def test_build_reservoirs(benchmark, wris_hydroframe, reservoir_info_df):
+    names = list(wris_hydroframe.reservoirs)
+    district_dict = geo_components.get_districts('all')
+    reservoirs = benchmark(
+        py_reservoir.build_reservoirs, names, reservoir_info_df, wris_hydroframe.reservoirs_rawData, district_dict
+    )
+    assert len(reservoirs) == len(names)
+
+def test_build_reservoirs_gdf(benchmark, reservoir_info_df):
+    gdf = benchmark(py_reservoir.build_reservoirs_gdf, reservoir_info_df)
+    assert len(gdf) == len(reservoir_info_df)
+
+#Filter: attribute and spatial selections
+def test_filter_range(benchmark, wris_hydroframe):
+    subset = benchmark(wris_hydroframe.filter, 'reservoir', 'live_cap_frl', range=(100, 1000))
+    assert len(subset.reservoirs) <= len(wris_hydroframe.reservoirs)
+
+def test_within_distance(benchmark, wris_hydroframe):
+    wris_hydroframe.within_distance((78.0, 20.0), 500)  # build the spatial index outside the timing
+    subset = benchmark(wris_hydroframe.within_distance, (78.0, 20.0), 500)
+    assert len(subset.reservoirs) <= len(wris_hydroframe.reservoirs)
+
+#Aggregate: uncached computations on the whole store
+def test_aggregate_storage(benchmark, wris_hydroframe):
+    result = benchmark(
+        py_reservoir.aggregate_storage, wris_hydroframe.reservoirs_rawData, wris_hydroframe.reservoirs_gdf, 'state'
+    )
+    assert not result.empty
+
+def test_resample_monthly(benchmark, wris_hydroframe):
+    result = benchmark(py_reservoir.resample_timeseries, wris_hydroframe.reservoirs_rawData, 'MS')
+    assert not result.empty
+
+def test_climatology(benchmark, wris_hydroframe):
+    climatology, anomalies = benchmark.pedantic(
+        compute_climatology, args=(wris_hydroframe.reservoirs_rawData,), rounds=3
+    )
+    assert len(anomalies) == len(wris_hydroframe.reservoirs_rawData)
+
+#Render: notebook HTML representations
+def test_hydroframe_repr_html(benchmark, wris_hydroframe):
+    html = benchmark(wris_hydroframe._repr_html_)
+    assert "Reservoir" in html
+
+def test_reservoir_repr_html(benchmark, wris_hydroframe):
+    reservoir = next(iter(wris_hydroframe.reservoirs.values()))
+    html = benchmark(reservoir._repr_html_)
+    assert "Static Data" in html
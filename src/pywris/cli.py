@@ -0,0 +1,175 @@
+import argparse
+import logging
+import os
+import shutil
+import sys
+import time
+
+from pywris.utils import instrumentation, xarray_io
+from pywris.utils.bulk_download import BulkDownloadJob
+
+# Directory inside --out where the resumable job keeps its manifest and downloaded units
+JOB_DIR = ".pywris-job"
+
+
+class ProgressReporter:
+    """
+    Prints one line per downloaded unit with the progress and throughput of a bulk download.
+
+    Throughput is measured from the start of the run: rows/s counts downloaded time series rows,
+    MB/s the response bytes received from IndiaWRIS (see `pywris.utils.instrumentation.metrics`).
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream
+        self.started = time.monotonic()
+        self.rows = 0
+        self.bytes_before = instrumentation.metrics.total('bytes')
+
+    def __call__(self, unit_id, unit, job):
+        self.rows += unit['rows']
+        received = instrumentation.metrics.total('bytes') - self.bytes_before
+        status = job.status()
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        done = status['done']
+        print(
+            f"[{done}/{status['units']}] {unit['state']} {unit['start_date']}..{unit['end_date']} "
+            f"{len(unit['reservoirs'])} reservoirs, {unit['rows']:,} rows | "
+            f"{self.rows / elapsed:,.0f} rows/s, {received / elapsed / 1e6:.2f} MB/s",
+            file=self.stream or sys.stderr, flush=True,
+        )
+
+def build_parser():
+    """
+    Returns the argument parser of the `pywris` command.
+    """
+    parser = argparse.ArgumentParser(prog="pywris", description="Python Package for India WRIS Database")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    download = subparsers.add_parser(
+        "download",
+        help="Download reservoir time series to a directory.",
+        description=(
+            "Download reservoir time series to a directory. Units of work are saved as they complete, "
+            "so an interrupted download resumes where it stopped when the same command is run again."
+        ),
+    )
+    download.add_argument("--states", nargs="+", default=["all"],
+                          help="State names, or 'all' (default).")
+    download.add_argument("--districts", nargs="+", default=["all"],
+                          help="District names, or 'all' (default).")
+    download.add_argument("--reservoirs", nargs="+", default=["all"],
+                          help="Reservoir names, or 'all' (default).")
+    download.add_argument("--timestep", choices=["Daily", "Monthly", "Yearly"], default="Daily")
+    download.add_argument("--start", default="1991-01-01", help="Start date, YYYY-MM-DD (default 1991-01-01).")
+    download.add_argument("--end", required=True, help="End date, YYYY-MM-DD.")
+    download.add_argument("--out", required=True, help="Output directory.")
+    download.add_argument("--format", choices=["parquet", "zarr"], default="parquet",
+                          help="'parquet' (partitioned by state and year, default) or 'zarr'.")
+    download.add_argument("--workers", type=int, default=4, help="Concurrent requests (default 4).")
+    download.add_argument("--batch-size", type=int, default=50, help="Reservoirs per request (default 50).")
+    download.add_argument("--retries", type=int, default=2, help="Retries of a failed request (default 2).")
+    download.add_argument("--float32", action="store_true", help="Store values as float32 instead of float64.")
+    download.add_argument("--keep-parts", action="store_true",
+                          help=f"Keep the downloaded units in <out>/{JOB_DIR} after the output is written.")
+    download.add_argument("--metrics", metavar="PATH",
+                          help="Write request metrics in Prometheus text format to PATH when the run ends "
+                               "(e.g. for the node_exporter textfile collector).")
+    download.add_argument("--log-requests", action="store_true", help="Log every request to stderr.")
+    download.add_argument("--quiet", action="store_true", help="Do not print progress.")
+    download.set_defaults(handler=run_download)
+    return parser
+
+def selection_argument(values):
+    return "all" if values == ["all"] else values
+
+def write_metrics(path):
+    """
+    Writes the request metrics of the process to `path` in Prometheus text format, atomically.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(instrumentation.metrics.to_prometheus())
+    os.replace(tmp_path, path)
+
+def run_download(args):
+    """
+    Runs `pywris download`. Returns the exit status.
+    """
+    if args.workers < 1 or args.batch_size < 1 or args.retries < 0:
+        raise ValueError("--workers and --batch-size must be positive and --retries must not be negative.")
+
+    if args.log_requests:
+        logging.basicConfig(stream=sys.stderr, format="%(asctime)s %(levelname)s %(message)s")
+        logging.getLogger("pywris").setLevel(logging.INFO)
+        instrumentation.enable_logging()
+    try:
+        return download(args)
+    finally:
+        if args.log_requests:
+            instrumentation.disable_logging()
+        if args.metrics:
+            write_metrics(args.metrics)
+
+def download(args):
+    """
+    Downloads the selection of `pywris download` and writes the output. Returns the exit status.
+    """
+    # Fail before downloading anything if the output format cannot be written
+    if args.format == "zarr":
+        xarray_io._require_xarray()
+        xarray_io._require_zarr()
+
+    job_path = os.path.join(args.out, JOB_DIR)
+    job = BulkDownloadJob(
+        job_path,
+        end_date=args.end,
+        start_date=args.start,
+        timestep=args.timestep,
+        selected_states=selection_argument(args.states),
+        selected_districts=selection_argument(args.districts),
+        selected_reservoirs=selection_argument(args.reservoirs),
+        batch_size=args.batch_size,
+        float_dtype="float32" if args.float32 else "float64",
+    )
+    started = time.monotonic()
+    reporter = None if args.quiet else ProgressReporter()
+    try:
+        status = job.run(max_workers=args.workers, max_retries=args.retries, progress=reporter)
+    except RuntimeError as error:
+        print(f"pywris: {error}", file=sys.stderr)
+        return 1
+
+    hf = job.to_hydroframe()
+    if hf.reservoirs_rawData is None:
+        print("pywris: no time series found for the selection.", file=sys.stderr)
+        return 1
+    if args.format == "parquet":
+        hf.save(args.out)
+    else:
+        hf.to_zarr(os.path.join(args.out, "reservoirs.zarr"))
+    if not args.keep_parts:
+        shutil.rmtree(job_path)
+
+    if not args.quiet:
+        elapsed = max(time.monotonic() - started, 1e-9)
+        print(
+            f"Saved {status['rows']:,} rows of {len(hf.reservoirs)} reservoirs to {args.out} "
+            f"in {elapsed:.1f} s",
+            file=sys.stderr,
+        )
+    return 0
+
+def main(argv=None):
+    """
+    Entry point of the `pywris` command.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        return args.handler(args)
+    except (ValueError, ImportError) as error:
+        parser.error(str(error))
+
+if __name__ == "__main__":
+    sys.exit(main())
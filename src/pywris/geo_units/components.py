@@ -1,5 +1,6 @@
 
-from copy import deepcopy
+from html import escape
+from itertools import islice
 
 import pandas as pd
 from IPython.display import display, HTML
@@ -8,6 +9,8 @@ import json
 from pywris.utils.fetch_wris import get_response
 from pywris.static_data.state_ids import state_id
 from pywris.static_data.request_urls import requests_config
+from pywris.utils.html_repr import REPR_MAX_ITEMS, more_items_html
+from pywris.utils.memoize import memoize
 
 class State:
     def __init__(self, state_name):
@@ -32,23 +35,26 @@ class State:
         html = """<div style="margin-left: 20px;">"""
         html += f"State ID: {self.state_id if self.state_id else 'N/A'}<br>"
 
-        # Fetch districts if not already fetched
+        # Districts are only shown once fetched; rendering never sends a request
         if not self.districts:
-            self.fetch_districts()
-        
+            html += "Districts: <i>not loaded</i> (call State.fetch_districts() to load)"
+            html += "</div>"
+            return html
+
         # Representing districts as expandable details
         html += f"""
         <details>
             <summary>Districts ({len(self.districts)})</summary>
             <div style="margin-left: 20px;"> 
         """
-        for district_name, district_obj in self.districts.items():
+        for district_name, district_obj in islice(self.districts.items(), REPR_MAX_ITEMS):
             html += f"""
             <details>
-                <summary>{district_name}</summary>
+                <summary>{escape(str(district_name))}</summary>
                 {district_obj._repr_html_() if hasattr(district_obj, '_repr_html_') else '<p>No details available</p>'}
             </details>
             """
+        html += more_items_html(min(len(self.districts), REPR_MAX_ITEMS), len(self.districts), "Use State.districts to access all districts.")
         html += "</div></details>"
         html += "</div>"
         return html
@@ -81,6 +87,7 @@ class Basin:
         self.basin_name = basin_name
         self.basin_code = basin_code
 
+@memoize(ttl=requests_config["geounits"]["get_districts"]["cache_ttl"])
 def get_districts(selected_states):
     """
     Fetches list of districts given state names.
@@ -102,8 +109,7 @@ def get_districts(selected_states):
     # Fetch district data
     # Get url, payload and method
     url = requests_config["geounits"]["get_districts"]["url"]
-    payload = deepcopy(requests_config["geounits"]["get_districts"]["payload"])
-    payload = payload.format(state_ids_list_str)
+    payload = requests_config["geounits"]["get_districts"]["payload"].format(state_ids_list_str)
 
     method = requests_config["geounits"]["get_districts"]["method"]
     # Send request and get response
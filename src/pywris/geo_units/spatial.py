@@ -0,0 +1,92 @@
+import numpy as np
+import shapely
+from shapely.strtree import STRtree
+
+# Mean Earth radius in km and length of one degree of latitude in km
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = np.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine_km(lon, lat, lons, lats):
+    """
+    Great-circle distances in km from one point to arrays of points (all in degrees).
+    """
+    lon, lat, lons, lats = map(np.radians, (lon, lat, np.asarray(lons, dtype=float), np.asarray(lats, dtype=float)))
+    a = np.sin((lats - lat) / 2) ** 2 + np.cos(lat) * np.cos(lats) * np.sin((lons - lon) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+def as_lon_lat(point):
+    """
+    Returns (longitude, latitude) from a shapely Point or a (longitude, latitude) tuple.
+    """
+    if isinstance(point, shapely.Point):
+        return point.x, point.y
+    lon, lat = point
+    return float(lon), float(lat)
+
+
+class ReservoirIndex:
+    """
+    STRtree spatial index over the reservoir points of a GeoDataFrame (EPSG:4326).
+
+    The tree is built once when the index is created. All queries return positional indices
+    into the GeoDataFrame the index was built from; distances are great-circle distances in km.
+    Reservoirs without valid coordinates are left out of the index.
+
+    Parameters:
+    ----------
+    reservoir_gdf : geopandas.GeoDataFrame
+        Reservoir points, e.g. `HydroFrame.reservoirs_gdf`.
+    """
+
+    def __init__(self, reservoir_gdf):
+        geometries = np.asarray(reservoir_gdf.geometry.values, dtype=object)
+        valid = ~(shapely.is_missing(geometries) | shapely.is_empty(geometries))
+        coords = np.full((len(geometries), 2), np.nan)
+        coords[valid] = shapely.get_coordinates(geometries[valid])
+        valid &= np.isfinite(coords).all(axis=1)
+
+        self.positions = np.flatnonzero(valid)
+        self.lons = coords[self.positions, 0]
+        self.lats = coords[self.positions, 1]
+        self.tree = STRtree(geometries[self.positions])
+
+    def __len__(self):
+        return len(self.positions)
+
+    def within(self, geometry, predicate='covers'):
+        """
+        Returns the positions of reservoirs inside `geometry` (points on its boundary included).
+        """
+        return np.sort(self.positions[self.tree.query(geometry, predicate=predicate)])
+
+    def within_distance(self, point, distance_km):
+        """
+        Returns the positions of reservoirs within `distance_km` of `point`, and their distances in km,
+        sorted by distance.
+        """
+        lon, lat = as_lon_lat(point)
+        # Bounding box in degrees containing the search circle, refined with exact distances
+        dlat = distance_km / KM_PER_DEGREE
+        dlon = min(distance_km / (KM_PER_DEGREE * max(np.cos(np.radians(lat)), 1e-6)), 180.0)
+        candidates = self.tree.query(shapely.box(lon - dlon, lat - dlat, lon + dlon, lat + dlat))
+        distances = haversine_km(lon, lat, self.lons[candidates], self.lats[candidates])
+        keep = distances <= distance_km
+        order = np.argsort(distances[keep], kind='stable')
+        return self.positions[candidates[keep][order]], distances[keep][order]
+
+    def nearest(self, point, k=1):
+        """
+        Returns the positions of the `k` reservoirs nearest to `point`, and their distances in km,
+        sorted by distance.
+        """
+        if k < 1:
+            raise ValueError("k must be a positive integer.")
+        k = min(k, len(self))
+        radius_km = 25.0
+        while True:
+            positions, distances = self.within_distance(point, radius_km)
+            # All reservoirs within the radius are found, so the k nearest are among them
+            if len(positions) >= k or radius_km > np.pi * EARTH_RADIUS_KM:
+                return positions[:k], distances[:k]
+            radius_km *= 2
@@ -1,11 +1,25 @@
+import copy
+import logging
 import pandas as pd
 # from IPython.display import display, HTML
 
-import time
+from html import escape
+from itertools import islice
+
 import pywris.geo_units.components as geo_components
 import pywris.surface_water.storage.reservoir as py_reservoir
+import pywris.surface_water.storage.climatology as climatology
+import pywris.utils.instrumentation as instrumentation
+import pywris.utils.parquet_store as parquet_store
+import pywris.utils.xarray_io as xarray_io
+from pywris.utils.bulk_download import BulkDownloadJob
+from pywris.utils.ingest import memory_usage_report
+from pywris.geo_units.spatial import ReservoirIndex
 from pywris.static_data.state_ids import state_id
+from pywris.utils.html_repr import REPR_MAX_ITEMS, more_items_html
+from pywris.visualization.plot import plot_data
 
+logger = logging.getLogger(__name__)
 
 class HydroFrame:
 
@@ -14,8 +28,17 @@ class HydroFrame:
         self.basins = {}
         self.reservoirs = {}
         self.reservoirs_gdf = None
+        self._data_version = 0
+        self._derived_cache = {}
         self.reservoirs_rawData = None
         self.selection_allState = False
+        self.timestep = None
+        self.start_date = None
+        self.end_date = None
+        self._spatial_index = None
+        self._spatial_index_gdf = None
+        # Requests sent by fetch_reservoir_data, load_data and update (see HydroFrame.request_summary)
+        self._request_metrics = instrumentation.RequestMetrics()
         
         ## Validate input 
         if states is not None:
@@ -29,6 +52,20 @@ class HydroFrame:
         #     for res in reservoirs:
         #         self.add_reservoir(res, 'None')
     
+    @property
+    def reservoirs_rawData(self):
+        """
+        Columnar store of the time series of all reservoirs (see `build_timeseries_store`).
+        """
+        return self._reservoirs_rawData
+
+    @reservoirs_rawData.setter
+    def reservoirs_rawData(self, store):
+        # Results derived from the store (e.g. HydroFrame.resample) are recomputed after it changes
+        self._reservoirs_rawData = store
+        self._data_version += 1
+        self._derived_cache.clear()
+
     def add_state(self, state_names):
         
         if isinstance(state_names, list):
@@ -47,35 +84,355 @@ class HydroFrame:
     #     if reservoir_name not in self.reservoirs:
     #         self.reservoirs[reservoir_name] = geo_components.Reservoir(reservoir_name, state_name)
             
-    def fetch_reservoir_data(self, end_date, start_date='1991-01-01', timestep='Daily'):
-        print("Fetching reservoir data...")
-        start_time = time.time()  # Record the start time
+    def fetch_reservoir_data(self, end_date, start_date='1991-01-01', timestep='Daily', **kwargs):
+        """
+        Fetches reservoir metadata and time series for the states in the HydroFrame.
+
+        Parameters:
+        ----------
+        end_date : str
+            The end date of the data to fetch, in the format 'YYYY-MM-DD'.
+        start_date : str, optional
+            The start date of the data to fetch, in the format 'YYYY-MM-DD' (default is '1991-01-01').
+        timestep : str, optional
+            'Daily', 'Monthly' or 'Yearly'. Default is 'Daily'.
+        **kwargs :
+            Additional options passed on to `get_reservoirs` (e.g. `batch_size`, `max_workers`, or `filters`
+            to download only reservoirs matching attribute conditions on the server). With `lazy=True`, only
+            metadata is fetched and each reservoir's time series is downloaded when its `data` is first
+            accessed; call `HydroFrame.load_data()` to download the rest and fill `reservoirs_rawData`.
+
+        Example:
+        --------
+        >>> hf = HydroFrame(states=['Karnataka', 'Telangana'])
+        >>> hf.fetch_reservoir_data('2024-12-31', filters={'basin': ['Krishna'], 'live_cap_frl': (100, None)})
+        """
+        logger.info("Fetching reservoir data...")
+        requests_before = self._request_metrics.total('requests')
         
         if self.selection_allState:
-            self.reservoirs, self.reservoirs_gdf, self.reservoirs_rawData = py_reservoir.get_reservoirs(
-                end_date, start_date, timestep, selected_states='all'
-            )
+            selection = {'selected_states': 'all'}
         elif self.states.keys():
-            
-            self.reservoirs, self.reservoirs_gdf, self.reservoirs_rawData = py_reservoir.get_reservoirs(
-                end_date, start_date, timestep, selected_states=list(self.states.keys())
-            )
+            selection = {'selected_states': list(self.states.keys())}
         elif self.basins.keys():
-            self.reservoirs, self.reservoirs_gdf, self.reservoirs_rawData = py_reservoir.get_reservoirs(
-                end_date, start_date, timestep, selected_basins=list(self.basins.keys())
-            )
+            selection = {'selected_basins': list(self.basins.keys())}
         else:
             raise ValueError("No states or basins defined in the HydroFrame.")
-        
-        end_time = time.time()  # Record the end time
-        time_taken = end_time - start_time  # Calculate duration
+
+        with instrumentation.collect(self._request_metrics):
+            result = py_reservoir.get_reservoirs(end_date, start_date, timestep, **selection, **kwargs)
+        # get_reservoirs returns None when no reservoir matches the selection or has data
+        if result is None:
+            result = ({}, py_reservoir.build_reservoirs_gdf(None), None)
+        self.reservoirs, self.reservoirs_gdf, self.reservoirs_rawData = result
+        requests_sent = self._request_metrics.total('requests') - requests_before
+
+        self.timestep = timestep
+        self.start_date = start_date
+        self.end_date = end_date
         
         if self.reservoirs:
-            print(f"Reservoir data fetched for {len(self.reservoirs)} reservoirs.")
-        
-            print(f"Time taken: {time_taken:.2f} seconds")
+            # Timings of the requests are reported by the request events (see HydroFrame.request_summary)
+            logger.info("Reservoir data fetched for %d reservoirs (%d requests).", len(self.reservoirs), requests_sent)
         else:
-            print("No reservoirs found.")
+            logger.info("No reservoirs found.")
+
+    def load_data(self, reservoir_names=None):
+        """
+        Downloads the time series of a lazily fetched HydroFrame (see `fetch_reservoir_data(lazy=True)`)
+        in batched requests, and sets `reservoirs_rawData` to all time series downloaded so far.
+
+        Parameters:
+        ----------
+        reservoir_names : list of str, optional
+            Reservoirs to download. Default is all reservoirs whose data has not been accessed yet.
+        """
+        loader = next((res._loader for res in self.reservoirs.values() if res._loader is not None), None)
+        if loader is None:
+            raise ValueError("No lazily fetched reservoir data. Please call HydroFrame.fetch_reservoir_data(lazy=True) first.")
+
+        # The loader records its requests in the collectors of fetch_reservoir_data
+        loader.load(loader.pending() if reservoir_names is None else list(reservoir_names))
+        store = loader.store()
+        if store is not None:
+            self.reservoirs_rawData = store
+            # Point every reservoir to the combined store so the per-batch stores can be released
+            py_reservoir.attach_timeseries(self.reservoirs, store)
+
+    def update(self, end_date=None, **kwargs):
+        """
+        Fetches observations newer than the last date of each reservoir, but not older than the previous
+        `end_date`, and appends them in place (see `fetch_new_reservoir_data`).
+
+        Parameters:
+        ----------
+        end_date : str, optional
+            The end date of the data to fetch, in the format 'YYYY-MM-DD'.
+            Defaults to the latest date available on IndiaWRIS.
+        **kwargs :
+            Additional options passed on to `fetch_reservoir_timeseries` (e.g. `batch_size`, `max_workers`).
+        """
+        if self.reservoirs_rawData is None or not self.reservoirs:
+            raise ValueError("No reservoir data to update. Please call HydroFrame.fetch_reservoir_data() first.")
+
+        with instrumentation.collect(self._request_metrics):
+            valid_date_range = py_reservoir.get_reservoir_data_valid_date_range()
+            if end_date is None:
+                end_date = valid_date_range[1]
+            py_reservoir.check_valid_date_range(self.start_date, end_date, valid_date_range)
+
+            logger.info("Updating reservoir data...")
+            self.reservoirs_rawData, updated_reservoirs = py_reservoir.fetch_new_reservoir_data(
+                self.reservoirs_rawData, end_date, self.timestep, previous_end_date=self.end_date,
+                reservoir_names=list(self.reservoirs), **kwargs
+            )
+        # Row ranges shift when rows are added, so every reservoir is re-pointed to the new store
+        py_reservoir.attach_timeseries(self.reservoirs, self.reservoirs_rawData)
+        self.end_date = end_date
+
+        logger.info("Reservoir data updated for %d reservoirs up to %s.", len(updated_reservoirs), end_date)
+
+    def resample(self, timestep='Monthly', how=py_reservoir.RESAMPLE_STATISTICS, columns=None):
+        """
+        Aggregates the downloaded time series of all reservoirs to a coarser timestep without any request
+        to IndiaWRIS. Results are cached until `reservoirs_rawData` changes (e.g. by `HydroFrame.update`).
+
+        Parameters:
+        ----------
+        timestep : str, optional
+            'Weekly', 'Monthly' (default), 'Yearly' or any pandas frequency string (e.g. '10D').
+        how : str or list of str, optional
+            Statistics among 'mean', 'min', 'max', 'last' and 'count' (default is all of them).
+        columns : list of str, optional
+            Columns to aggregate (default is 'Level' and 'Current Live Storage').
+
+        Returns:
+        -------
+        pandas.DataFrame
+            One row per reservoir and period, indexed by ('Reservoir Name', 'Date'), see
+            `pywris.surface_water.storage.reservoir.resample_timeseries`.
+
+        Example:
+        --------
+        >>> hf.fetch_reservoir_data('2024-12-31', timestep='Daily')
+        >>> monthly = hf.resample('Monthly', how=['mean', 'last'])
+        >>> yearly_storage = hf.resample('Yearly', how='max', columns=['Current Live Storage'])
+        """
+        if self.reservoirs_rawData is None:
+            raise ValueError("No reservoir data loaded. Please call HydroFrame.fetch_reservoir_data() first.")
+
+        key = ('resample', timestep, how if isinstance(how, str) else tuple(how), None if columns is None else tuple(columns))
+        if key not in self._derived_cache:
+            self._derived_cache[key] = py_reservoir.resample_timeseries(self.reservoirs_rawData, timestep, how, columns)
+        # A shallow copy shares the cached data but keeps the cache unchanged if the result is modified
+        return self._derived_cache[key].copy(deep=False)
+
+    def aggregate(self, by='state', column='Current Live Storage'):
+        """
+        Total live storage and capacity-weighted fill fraction per group of reservoirs and date,
+        computed locally in one grouped pass. Results are cached per grouping until `reservoirs_rawData`
+        or `reservoirs_gdf` changes.
+
+        Parameters:
+        ----------
+        by : str, optional
+            Column of `reservoirs_gdf` to group by: 'state' (default), 'district', 'basin', 'sub_basin', 'agency', ...
+        column : str, optional
+            Storage column to sum (default is 'Current Live Storage').
+
+        Returns:
+        -------
+        pandas.DataFrame
+            Indexed by (`by`, 'Date') with 'Live Storage', 'Reporting Capacity', 'Fill Fraction',
+            'Reservoirs Reporting' and 'Total Capacity', see
+            `pywris.surface_water.storage.reservoir.aggregate_storage`.
+
+        Example:
+        --------
+        >>> basin_storage = hf.aggregate(by='basin')
+        >>> basin_storage.loc['Krishna', 'Fill Fraction'].plot()
+        """
+        if self.reservoirs_rawData is None or self.reservoirs_gdf is None:
+            raise ValueError("No reservoir data loaded. Please call HydroFrame.fetch_reservoir_data() first.")
+
+        key = ('aggregate', by, column)
+        cached = self._derived_cache.get(key)
+        # The grouping comes from reservoirs_gdf, so a cached result is only valid for the same GeoDataFrame
+        if cached is None or cached[0] is not self.reservoirs_gdf:
+            cached = (self.reservoirs_gdf, py_reservoir.aggregate_storage(self.reservoirs_rawData, self.reservoirs_gdf, by, column))
+            self._derived_cache[key] = cached
+        return cached[1].copy(deep=False)
+
+    def _climatology_results(self, column, baseline, percentiles, n_jobs):
+        if self.reservoirs_rawData is None:
+            raise ValueError("No reservoir data loaded. Please call HydroFrame.fetch_reservoir_data() first.")
+        key = ('climatology', column, None if baseline is None else tuple(baseline), tuple(percentiles))
+        if key not in self._derived_cache:
+            self._derived_cache[key] = climatology.compute_climatology(
+                self.reservoirs_rawData, column, baseline, percentiles, n_jobs
+            )
+        return self._derived_cache[key]
+
+    def climatology(self, column='Current Live Storage', baseline=None, percentiles=(10, 50, 90), n_jobs=1):
+        """
+        Day-of-year climatology (mean and percentiles over a baseline period) of every reservoir.
+        Computed together with `HydroFrame.anomalies` and cached until `reservoirs_rawData` changes.
+
+        Parameters:
+        ----------
+        column : str, optional
+            Column to analyse (default is 'Current Live Storage').
+        baseline : tuple, optional
+            First and last year of the baseline period, e.g. (1991, 2020). Default uses all years.
+        percentiles : tuple of float, optional
+            Percentiles to compute (default is (10, 50, 90)).
+        n_jobs : int, optional
+            Number of worker processes for very large HydroFrames (default is 1).
+
+        Returns:
+        -------
+        pandas.DataFrame
+            Indexed by ('Reservoir Name', 'Day of Year') with 'Mean', 'P<q>' columns and 'Years',
+            see `pywris.surface_water.storage.climatology.compute_climatology`.
+        """
+        return self._climatology_results(column, baseline, percentiles, n_jobs)[0].copy(deep=False)
+
+    def anomalies(self, column='Current Live Storage', baseline=None, percentiles=(10, 50, 90), n_jobs=1):
+        """
+        Anomaly from the day-of-year climatology and percentile rank of every observation.
+        Parameters are the same as for `HydroFrame.climatology`.
+
+        Returns:
+        -------
+        pandas.DataFrame
+            One row per row of `reservoirs_rawData`, with the same index, so the rows of a reservoir are
+            `anomalies.loc[hf.reservoirs[name].data.index]`.
+
+        Example:
+        --------
+        >>> anomalies = hf.anomalies(baseline=(1991, 2020))
+        >>> anomalies[anomalies['Percentile Rank'] < 10]   # observations in the driest decile
+        """
+        return self._climatology_results(column, baseline, percentiles, n_jobs)[1].copy(deep=False)
+
+    def plot(self, reservoir_names=None, column='Current Live Storage', layout='overlay', **args):
+        """
+        Plots the time series of many reservoirs in one figure (WebGL traces, downsampled for display).
+
+        Parameters:
+        ----------
+        reservoir_names : list of str, optional
+            Reservoirs to plot (default is all reservoirs with data).
+        column : str, optional
+            Column to plot (default is 'Current Live Storage').
+        layout : str, optional
+            'overlay' (default) for one set of axes, 'facets' for one subplot per reservoir.
+        **args :
+            Additional arguments passed on to `pywris.visualization.plot.plot_reservoirs`
+            (e.g. `facet_cols`, `title`, `max_points`, `max_total_points`, `max_traces`, `downsample_method`).
+        """
+        plot_data(self, reservoir_names=reservoir_names, column=column, layout=layout, **args)
+
+    def memory_usage(self):
+        """
+        Reports the memory used by each column of `reservoirs_rawData`.
+
+        Returns:
+        -------
+        pandas.DataFrame
+            dtype, bytes and megabytes per column, with the total in the last row.
+        """
+        if self.reservoirs_rawData is None:
+            raise ValueError("No reservoir data loaded. Please call HydroFrame.fetch_reservoir_data() first.")
+        return memory_usage_report(self.reservoirs_rawData)
+
+    def request_summary(self, prometheus=False):
+        """
+        Summarizes the requests sent by `fetch_reservoir_data`, `load_data` and `update` of this HydroFrame,
+        including the lazy loads of `Reservoir.data` (see `fetch_reservoir_data(lazy=True)`), per endpoint: number of requests, errors, cache hits and retries, megabytes received, and time
+        queued by the rate limiter, latency (network and server) and duration (including transfer and
+        parsing). Requests sent concurrently by other HydroFrames or threads are not included.
+
+        Parameters:
+        ----------
+        prometheus : bool, optional
+            If True, returns the metrics in the Prometheus text format instead (default is False).
+
+        Returns:
+        -------
+        pandas.DataFrame or str
+            One row per endpoint, or the Prometheus text.
+
+        Example:
+        --------
+        >>> hf.fetch_reservoir_data('2024-12-31')
+        >>> hf.request_summary()[['Requests', 'Mean Latency (s)', 'Total Duration (s)']]
+        """
+        if prometheus:
+            return self._request_metrics.to_prometheus()
+        return self._request_metrics.summary()
+
+    def save(self, path):
+        """
+        Saves the reservoir data to a directory: `reservoirs_gdf` as GeoParquet and `reservoirs_rawData`
+        as Parquet partitioned by state and year, with a manifest of the saved selection. Requires pyarrow.
+
+        Parameters:
+        ----------
+        path : str
+            Output directory.
+        """
+        parquet_store.save_hydroframe(self, path)
+
+    @classmethod
+    def load(cls, path, states=None, start_date=None, end_date=None, columns=None):
+        """
+        Loads a HydroFrame saved with `HydroFrame.save`, reading only the requested states, years and columns.
+
+        Parameters:
+        ----------
+        path : str
+            Directory written by `HydroFrame.save`.
+        states : list of str, optional
+            States to load (default is all saved states).
+        start_date, end_date : str, optional
+            Date range to load in 'YYYY-MM-DD' format (default is the saved range).
+        columns : list of str, optional
+            Time series columns to load besides 'Reservoir Name' and 'Date' (default is all columns).
+
+        Example:
+        --------
+        >>> hf = HydroFrame.load('data/india_daily', states=['Kerala'], start_date='2020-01-01', end_date='2024-12-31')
+        """
+        return parquet_store.load_hydroframe(path, states, start_date, end_date, columns)
+
+    def to_xarray(self, chunks='auto'):
+        """
+        Returns the reservoir time series as a reservoir x time xarray.Dataset with variables 'Level' and
+        'Current Live Storage', and the static data of `reservoirs_gdf` (lat, long, state, basin, frl,
+        live_cap_frl, ...) as coordinates. Requires xarray; arrays are dask-chunked when dask is installed.
+
+        Parameters:
+        ----------
+        chunks : dict, 'auto' or None, optional
+            Chunk sizes, e.g. {'reservoir': 500, 'time': 3653}. Default is 'auto'.
+        """
+        return xarray_io.hydroframe_to_xarray(self, chunks)
+
+    def to_zarr(self, path, chunks='auto', mode='w'):
+        """
+        Writes the reservoir x time cube returned by `HydroFrame.to_xarray` to a Zarr store. Requires zarr.
+
+        Parameters:
+        ----------
+        path : str
+            Path of the Zarr store.
+        chunks : dict, 'auto' or None, optional
+            Chunk sizes of the written arrays. Default is 'auto'.
+        mode : str, optional
+            Zarr write mode (default is 'w', overwrite).
+        """
+        return xarray_io.hydroframe_to_zarr(self, path, chunks, mode)
 
     def filter(self, on, by, range=None, values=None):
         return filter(self, on, by, range, values)
@@ -111,36 +468,38 @@ class HydroFrame:
         
         # States Section
         if self.states:
+            # Group reservoirs by state once
+            state_reservoirs = {}
+            for res_obj in self.reservoirs.values():
+                state_reservoirs.setdefault(res_obj.state.state_name if res_obj.state else None, []).append(res_obj)
+
             html += f"<h3 style='margin-bottom: 0;'>States/UT's: ({len(self.states)})</h3>"
             for state_name, state_obj in self.states.items():
                 html += f"""
                 <details>
-                    <summary><strong>{state_name}</strong></summary>
+                    <summary><strong>{escape(str(state_name))}</strong></summary>
                     {state_obj._repr_html_() if hasattr(state_obj, '_repr_html_') else '<p>No details available for this state.</p>'}
                     <div style="margin-left: 20px;">
                     
                 """
                 
 
-                # Reservoirs Section within State
-                state_reservoirs = [
-                    res_obj for res_name, res_obj in self.reservoirs.items()
-                    if res_obj.state.state_name == state_name
-                ]
-                if state_reservoirs:
+                # Reservoirs Section within State (listed as one-line summaries)
+                reservoirs_in_state = state_reservoirs.get(state_name, [])
+                if reservoirs_in_state:
                     html += f"""
                     <details>
-                        <summary>Reservoirs ({len(state_reservoirs)}):</summary>
-                        <div style="margin-left: 20px;">
+                        <summary>Reservoirs ({len(reservoirs_in_state)}):</summary>
+                        <ul style="margin-top: 0; margin-left: 20px; list-style-type: none; padding-left: 0;">
                     """
-                    for res_obj in state_reservoirs:
-                        html += f"""
-                        <details>
-                            <summary>{res_obj.reservoir_name}</summary>
-                            {res_obj._repr_html_() if hasattr(res_obj, '_repr_html_') else '<p>No details available for this reservoir.</p>'}
-                        </details>
-                        """
-                    html += "</div></details>"
+                    for res_obj in reservoirs_in_state[:REPR_MAX_ITEMS]:
+                        html += res_obj._summary_html_() if hasattr(res_obj, '_summary_html_') else f"<li>{escape(str(res_obj.reservoir_name))}</li>"
+                    html += "</ul>"
+                    html += more_items_html(
+                        min(len(reservoirs_in_state), REPR_MAX_ITEMS), len(reservoirs_in_state),
+                        "Use HydroFrame.reservoirs or HydroFrame.reservoirs_gdf to access all reservoirs.",
+                    )
+                    html += "</details>"
                 else:
                     pass
 
@@ -153,13 +512,14 @@ class HydroFrame:
         # Basins Section
         if self.basins:
             html += f"<h3>Basins ({len(self.basins)}):</h3>"
-            for basin_name, basin_obj in self.basins.items():
+            for basin_name, basin_obj in islice(self.basins.items(), REPR_MAX_ITEMS):
                 html += f"""
                 <details>
-                    <summary><strong>Basin: {basin_name}</strong></summary>
+                    <summary><strong>Basin: {escape(str(basin_name))}</strong></summary>
                     {basin_obj._repr_html_() if hasattr(basin_obj, '_repr_html_') else '<p>No details available for this basin.</p>'}
                 </details>
                 """
+            html += more_items_html(min(len(self.basins), REPR_MAX_ITEMS), len(self.basins), "Use HydroFrame.basins to access all basins.")
         else:
             pass
 
@@ -205,15 +565,108 @@ class HydroFrame:
         else:
             raise ValueError("Invalid filter on.")
             
+        return hf._subset(filtered_df)
+
+    def _subset(self, filtered_df):
+        """
+        Returns a new HydroFrame restricted to the reservoirs in `filtered_df` (a subset of `reservoirs_gdf`).
+        """
         filtered_hf = HydroFrame()
         filtered_hf.reservoirs_gdf = filtered_df
-        filtered_hf.states =  {key: hf.states[key] for key in filtered_df['state'].unique() if key in hf.states}
-        filtered_hf.basins =  {key: hf.basins[key] for key in filtered_df['basin'].unique() if key in hf.basins}
-        filtered_hf.reservoirs = {key: hf.reservoirs[key] for key in filtered_df['reservoir_name'].unique() if key in hf.reservoirs}
-
-        
+        filtered_hf.states =  {key: self.states[key] for key in filtered_df['state'].unique() if key in self.states}
+        filtered_hf.basins =  {key: self.basins[key] for key in filtered_df['basin'].unique() if key in self.basins}
+        filtered_hf.reservoirs = {key: self.reservoirs[key] for key in filtered_df['reservoir_name'].unique() if key in self.reservoirs}
+        if self.reservoirs_rawData is not None:
+            # The store is sorted by reservoir, so the selected rows keep the store layout
+            store = self.reservoirs_rawData
+            subset = store[store['Reservoir Name'].isin(list(filtered_hf.reservoirs.keys()))].reset_index(drop=True)
+            subset['Reservoir Name'] = subset['Reservoir Name'].cat.remove_unused_categories()
+            filtered_hf.reservoirs_rawData = subset
+            # Reservoir data must index into the new store: copies are attached to it, the
+            # reservoirs of this HydroFrame keep pointing to its own store
+            copies = {name: copy.copy(filtered_hf.reservoirs[name]) for name in subset['Reservoir Name'].cat.categories}
+            py_reservoir.attach_timeseries(copies, subset)
+            filtered_hf.reservoirs.update(copies)
+        filtered_hf.timestep = self.timestep
+        filtered_hf.start_date = self.start_date
+        filtered_hf.end_date = self.end_date
         return filtered_hf
 
+    def _get_spatial_index(self):
+        """
+        Returns the spatial index of `reservoirs_gdf`, building it only when the GeoDataFrame changed.
+        """
+        if self.reservoirs_gdf is None:
+            raise ValueError("No reservoir data loaded. Please call HydroFrame.fetch_reservoir_data() first.")
+        if self._spatial_index is None or self._spatial_index_gdf is not self.reservoirs_gdf:
+            self._spatial_index = ReservoirIndex(self.reservoirs_gdf)
+            self._spatial_index_gdf = self.reservoirs_gdf
+        return self._spatial_index
+
+    def within(self, geometry):
+        """
+        Returns a HydroFrame with the reservoirs inside a polygon (e.g. a catchment boundary).
+
+        Parameters:
+        ----------
+        geometry : shapely geometry, geopandas.GeoSeries or geopandas.GeoDataFrame
+            Area to select reservoirs in, in EPSG:4326. GeoSeries/GeoDataFrames are reprojected and
+            merged into one geometry.
+
+        Returns:
+        -------
+        HydroFrame
+            Filtered HydroFrame, like `HydroFrame.filter`.
+        """
+        if hasattr(geometry, 'geometry'):
+            geometry = geometry.geometry
+        if hasattr(geometry, 'to_crs'):
+            geometry = geometry.to_crs("EPSG:4326").union_all() if geometry.crs else geometry.union_all()
+        positions = self._get_spatial_index().within(geometry)
+        return self._subset(self.reservoirs_gdf.iloc[positions])
+
+    def within_distance(self, point, distance_km):
+        """
+        Returns a HydroFrame with the reservoirs within a great-circle distance of a point.
+
+        Parameters:
+        ----------
+        point : shapely.Point or tuple
+            (longitude, latitude) in degrees.
+        distance_km : float
+            Search radius in kilometers.
+
+        Returns:
+        -------
+        HydroFrame
+            Filtered HydroFrame sorted by distance, with a 'distance_km' column in `reservoirs_gdf`.
+        """
+        positions, distances = self._get_spatial_index().within_distance(point, distance_km)
+        return self._subset(self.reservoirs_gdf.iloc[positions].assign(distance_km=distances))
+
+    def nearest(self, point, k=1):
+        """
+        Returns a HydroFrame with the k reservoirs nearest to a point.
+
+        Parameters:
+        ----------
+        point : shapely.Point or tuple
+            (longitude, latitude) in degrees.
+        k : int, optional
+            Number of reservoirs to return (default is 1).
+
+        Returns:
+        -------
+        HydroFrame
+            Filtered HydroFrame sorted by distance, with a 'distance_km' column in `reservoirs_gdf`.
+
+        Example:
+        --------
+        >>> hf.nearest((76.27, 9.93), k=5)   # 5 reservoirs nearest to Kochi
+        """
+        positions, distances = self._get_spatial_index().nearest(point, k)
+        return self._subset(self.reservoirs_gdf.iloc[positions].assign(distance_km=distances))
+
 ## Things to DO:
 ## 1. Add representation to individual classes of State, Reservoir and District. (done)
 ## 2. Adjust indentation and padding in HydroFrame representation (done)
@@ -3,32 +3,69 @@ requests_config = {
         'get_reservoir_names':{
             'url': 'https://indiawris.gov.in/getReservoirBusinessData',
             'payload': {"stnVal":{"qry":"select distinct(reservoir_name) from public.reservoir_data where state_name in ({}) and district_name in ({}) order by reservoir_name asc"}},
-            'method': 'POST'
+            'method': 'POST',
+            'timeout': (10, 60),
+            'cache_ttl': 24 * 3600
         },
         'get_reservoir_data_valid_date_range':{
             'url': 'https://indiawris.gov.in/getReservoirBusinessData',
             'payload': {"stnVal":{"qry":"select min(to_char(date, \'yyyy-mm-dd\')), max(to_char(date, \'yyyy-mm-dd\')) from public.reservoir_data"}},
-            'method': 'POST'
+            'method': 'POST',
+            'timeout': (10, 30),
+            'cache_ttl': 3600
         },
         'get_reservoir_data':{
             'url': 'https://indiawris.gov.in/resdnlddata',
             'payload': {"stnVal":{"Reporttype":"Level & Storage Timeseries","View":"Admin","Agencyname":"All",
                               "Reservoir":"\"{}\"","Timestep":"{}","Parent":"","Child":"","Startdate":"{}","Enddate":"{}"}},
-            'method': 'POST'
+            'method': 'POST',
+            'timeout': (10, 300),
+            'cache_ttl': 6 * 3600,
+            'date_format': '%Y-%m-%d',
+            'rate_limit': {'rate': 2.0, 'burst': 4, 'initial_concurrency': 2, 'max_concurrency': 8}
         },
         'get_reservoir_info':{
             'url':'https://arc.indiawris.gov.in/server/rest/services/NWIC/Reservoir_Points/MapServer/0/query?',
-            'payload':'f=json&outFields=*&returnGeometry=false&spatialRel=esriSpatialRelIntersects&where=station_type=%27Reservoir%27%20AND%20station_name%20IN%20({})',
             'payload_all_reservoirs':'f=json&outFields=*&returnGeometry=false&spatialRel=esriSpatialRelIntersects&where=station_type=%27Reservoir%27',
-            'method': 'GET'
+            'payload_where':'f=json&outFields=*&returnGeometry=false&spatialRel=esriSpatialRelIntersects&where={}',
+            'method': 'GET',
+            'timeout': (10, 120),
+            'cache_ttl': 7 * 24 * 3600
         }
     },
     'geounits': {
         'get_districts':{
             'url': 'https://arc.indiawris.gov.in/server/rest/services/Admin/Administrative_NWIC/MapServer/1/query?',
             'payload': 'f=json&orderByFields=district&outFields=*&returnGeometry=false&spatialRel=esriSpatialRelIntersects&where=state%20in%20(%27{}%27)',
-            'method': 'GET'
+            'method': 'GET',
+            'timeout': (10, 60),
+            'cache_ttl': 30 * 24 * 3600
         }
     },
 
 }
+
+# Settings for the shared HTTP transport used by pywris.utils.fetch_wris.get_response.
+# 'timeout' is the (connect, read) timeout in seconds used when an endpoint in
+# requests_config does not define its own. The 'cache_ttl' of an endpoint is the number
+# of seconds its responses are served from the response cache (pywris.utils.cache).
+# 'rate_limit' holds the default settings of the adaptive limiter of each host
+# (pywris.utils.rate_limit.AdaptiveLimiter). An endpoint with its own 'rate_limit' entry
+# gets a separate limiter, with its settings merged over these defaults.
+transport_config = {
+    'pool_connections': 4,
+    'pool_maxsize': 16,
+    'max_retries': 5,
+    'backoff_factor': 0.5,
+    'status_forcelist': (500, 502, 503, 504),
+    'timeout': (10, 60),
+    'rate_limit': {
+        'rate': 10.0,
+        'burst': 10,
+        'initial_concurrency': 4,
+        'min_concurrency': 1,
+        'max_concurrency': 16,
+        'decrease_factor': 0.5,
+        'latency_spike': 3.0,
+    },
+}
@@ -0,0 +1,199 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from pywris.surface_water.storage.reservoir import reservoir_row_ranges
+
+# Day-of-year slots: Feb 29 has its own slot, so that every other calendar day keeps the same
+# slot in leap and non-leap years (Mar 1 is always day 61)
+DAYS_IN_YEAR = 366
+FEB_29_SLOT = 59
+# Observations ranked at a time against their baseline values (see _climatology_chunk)
+RANK_BLOCK_ROWS = 1 << 17
+
+
+def day_of_year_slots(dates):
+    """
+    Returns the 0-based day-of-year slot (0 to 365) of each date, aligned across leap and non-leap years.
+
+    Parameters:
+    ----------
+    dates : pandas.Series or pandas.DatetimeIndex
+        Dates.
+
+    Returns:
+    -------
+    numpy.ndarray
+        int64 slots; slot 59 is Feb 29.
+    """
+    dates = pd.DatetimeIndex(dates)
+    slots = dates.dayofyear.to_numpy().astype(np.int64) - 1
+    # Days after Feb 28 of non-leap years move up one slot
+    slots += (~dates.is_leap_year & (slots >= FEB_29_SLOT)).astype(np.int64)
+    return slots
+
+def sorted_percentiles(cube, counts, percentiles):
+    """
+    Percentiles along axis 1 of a 3-d array with missing values, with linear interpolation
+    (same result as `numpy.nanpercentile(cube, percentiles, axis=1)`, computed with one sort
+    instead of one call per slice).
+
+    Returns:
+    -------
+    numpy.ndarray
+        Shape (len(percentiles), cube.shape[0], cube.shape[2]); NaN where `counts` is 0.
+    """
+    n_percentiles = len(percentiles)
+    if not n_percentiles or cube.shape[1] == 0:
+        return np.full((n_percentiles, cube.shape[0], cube.shape[2]), np.nan)
+    # NaNs are sorted last, so the k-th valid value of each slice is at position k
+    ordered = np.sort(cube, axis=1)
+    positions = np.asarray(percentiles, dtype='float64')[:, None, None] / 100 * (counts - 1)
+    positions = np.clip(positions, 0, None)
+    lower = np.floor(positions).astype(np.int64)
+    upper = np.ceil(positions).astype(np.int64)
+    lower_values = np.take_along_axis(ordered[None], lower[:, :, None, :], axis=2)[:, :, 0, :]
+    upper_values = np.take_along_axis(ordered[None], upper[:, :, None, :], axis=2)[:, :, 0, :]
+    return np.where(counts > 0, lower_values + (upper_values - lower_values) * (positions - lower), np.nan)
+
+def _climatology_chunk(codes, years, slots, values, n_reservoirs, baseline_years, percentiles):
+    """
+    Climatology, anomalies and percentile ranks of one chunk of reservoirs (rows sorted by reservoir).
+
+    Runs in worker processes when `compute_climatology` is called with n_jobs > 1.
+    """
+    n_years = len(baseline_years)
+    # reservoir x baseline year x day-of-year cube of the baseline observations
+    cube = np.full((n_reservoirs, n_years, DAYS_IN_YEAR), np.nan)
+    year_positions = np.searchsorted(baseline_years, years)
+    if n_years:
+        in_baseline = (year_positions < n_years) & (baseline_years[np.minimum(year_positions, n_years - 1)] == years)
+    else:
+        # No baseline year (e.g. no valid date in the store): no climatology, every result is NaN
+        in_baseline = np.zeros(len(years), dtype=bool)
+    cube[codes[in_baseline], year_positions[in_baseline], slots[in_baseline]] = values[in_baseline]
+
+    counts = np.sum(~np.isnan(cube), axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sums = np.nansum(cube, axis=1)
+        mean = np.where(counts > 0, sums / counts, np.nan)
+    quantiles = sorted_percentiles(cube, counts, percentiles)
+
+    # Percentile rank of every observation among the baseline values of its reservoir and day.
+    # The baseline values of each (reservoir, day) are made contiguous, then compared block by block
+    # to keep the temporary (rows x years) arrays small
+    baseline_values = np.ascontiguousarray(cube.transpose(0, 2, 1)).reshape(n_reservoirs * DAYS_IN_YEAR, n_years)
+    flat_positions = codes * DAYS_IN_YEAR + slots
+    less = np.zeros(len(values))
+    equal = np.zeros(len(values))
+    for start in range(0, len(values), RANK_BLOCK_ROWS):
+        block = slice(start, start + RANK_BLOCK_ROWS)
+        reference = baseline_values[flat_positions[block]]
+        block_values = values[block, None]
+        less[block] = np.count_nonzero(reference < block_values, axis=1)
+        equal[block] = np.count_nonzero(reference == block_values, axis=1)
+    row_counts = counts[codes, slots]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ranks = np.where((row_counts > 0) & ~np.isnan(values), 100 * (less + 0.5 * equal) / row_counts, np.nan)
+    row_mean = mean[codes, slots]
+    return mean, quantiles, counts, values - row_mean, row_mean, ranks
+
+def compute_climatology(store, column='Current Live Storage', baseline=None, percentiles=(10, 50, 90),
+                        n_jobs=1, chunk_size=500):
+    """
+    Computes the day-of-year climatology of every reservoir over a baseline period, and the anomaly
+    and percentile rank of every observation, vectorized over reservoir x year x day-of-year arrays.
+
+    Parameters:
+    ----------
+    store : pandas.DataFrame
+        Columnar time series store built by `build_timeseries_store`.
+    column : str, optional
+        Column to analyse (default is 'Current Live Storage').
+    baseline : tuple, optional
+        First and last year of the baseline period, inclusive (e.g. (1991, 2020)); dates are
+        accepted too. Default uses all years of the store; when no date is valid, the climatology is
+        empty ('Years' is 0) and all anomalies and ranks are NaN.
+    percentiles : tuple of float, optional
+        Percentiles of the climatology (default is (10, 50, 90)).
+    n_jobs : int, optional
+        Number of worker processes. Chunks of `chunk_size` reservoirs are computed in parallel when
+        greater than 1 (default is 1, computed in this process).
+    chunk_size : int, optional
+        Number of reservoirs per chunk (default is 500). Bounds the size of the arrays built at a time.
+
+    Returns:
+    -------
+    pandas.DataFrame
+        Climatology indexed by ('Reservoir Name', 'Day of Year') with 'Mean', one 'P<q>' column per
+        percentile and 'Years' (number of baseline values). Day of year 60 is Feb 29.
+    pandas.DataFrame
+        One row per row of `store` (same index, so it aligns with `Reservoir.data`) with
+        'Reservoir Name', 'Date', `column`, 'Climatology Mean', 'Anomaly' and 'Percentile Rank' (0-100).
+    """
+    if column not in store.columns:
+        raise KeyError(f"The column {column} is missing from data.")
+    if chunk_size < 1 or n_jobs < 1:
+        raise ValueError("chunk_size and n_jobs must be positive integers.")
+    percentiles = tuple(percentiles)
+
+    dates = store['Date']
+    valid = dates.notna().to_numpy()
+    years = np.zeros(len(store), dtype=np.int64)
+    years[valid] = dates[valid].dt.year.to_numpy()
+    if baseline is None:
+        baseline_start, baseline_end = (years[valid].min(), years[valid].max()) if valid.any() else (0, -1)
+    else:
+        baseline_start, baseline_end = (
+            bound if isinstance(bound, (int, np.integer)) else pd.Timestamp(bound).year for bound in baseline
+        )
+        if baseline_start > baseline_end:
+            raise ValueError("Invalid baseline. The first year must not be after the last year.")
+    baseline_years = np.arange(int(baseline_start), int(baseline_end) + 1)
+
+    slots = np.zeros(len(store), dtype=np.int64)
+    slots[valid] = day_of_year_slots(dates[valid])
+    values = store[column].to_numpy(dtype='float64').copy()
+    values[~valid] = np.nan
+
+    # Rows of each reservoir are contiguous, so each chunk of reservoirs is one slice of rows
+    row_ranges = list(reservoir_row_ranges(store).items())
+    chunks = [row_ranges[i:i + chunk_size] for i in range(0, len(row_ranges), chunk_size)]
+    tasks = []
+    for chunk in chunks:
+        rows = slice(chunk[0][1].start, chunk[-1][1].stop)
+        # Position of the reservoir of each row within the chunk
+        chunk_codes = np.repeat(np.arange(len(chunk)), [row_range.stop - row_range.start for _, row_range in chunk])
+        tasks.append((chunk_codes, years[rows], slots[rows], values[rows], len(chunk), baseline_years, percentiles))
+
+    if n_jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(tasks))) as executor:
+            results = list(executor.map(_climatology_chunk, *zip(*tasks)))
+    else:
+        results = [_climatology_chunk(*task) for task in tasks]
+
+    names = [name for chunk in chunks for name, _ in chunk]
+    index = pd.MultiIndex.from_product([names, np.arange(1, DAYS_IN_YEAR + 1)], names=['Reservoir Name', 'Day of Year'])
+    climatology = pd.DataFrame({'Mean': np.concatenate([r[0].ravel() for r in results]) if results else []}, index=index)
+    for i, q in enumerate(percentiles):
+        climatology[f"P{q:g}"] = np.concatenate([r[1][i].ravel() for r in results]) if results else []
+    climatology['Years'] = np.concatenate([r[2].ravel() for r in results]) if results else np.zeros(0, dtype=np.int64)
+
+    # Rows outside the reservoir ranges (missing names) get no result
+    anomaly = np.full(len(store), np.nan)
+    row_mean = np.full(len(store), np.nan)
+    ranks = np.full(len(store), np.nan)
+    for chunk, result in zip(chunks, results):
+        rows = slice(chunk[0][1].start, chunk[-1][1].stop)
+        anomaly[rows], row_mean[rows], ranks[rows] = result[3], result[4], result[5]
+
+    anomalies = pd.DataFrame({
+        'Reservoir Name': store['Reservoir Name'],
+        'Date': dates,
+        column: store[column],
+        'Climatology Mean': row_mean,
+        'Anomaly': anomaly,
+        'Percentile Rank': ranks,
+    }, index=store.index)
+    return climatology, anomalies
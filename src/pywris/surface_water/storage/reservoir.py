@@ -1,18 +1,29 @@
-from copy import deepcopy
+import threading
+import time
+from html import escape
+from concurrent.futures import Future, ThreadPoolExecutor
 
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
-from pywris.utils.fetch_wris import get_response
+from pywris.utils.fetch_wris import RESPONSE_BODY_ERRORS, get_response, iter_response_records
+from pywris.utils.ingest import RecordBuffer
+from pywris.utils.instrumentation import propagate
+from pywris.utils.memoize import memoize
+from pywris.utils.query import compile_filters, encode_where, quote_list
 from pywris.static_data.state_ids import state_id
 from pywris.static_data.request_urls import requests_config
 from pywris.visualization.plot import plot_data
 import pywris.geo_units.components as geo_components
-from shapely.geometry import Point
 import geopandas as gpd
 
 
+# Leading columns of the columnar time series store (see build_timeseries_store)
+TIMESERIES_COLUMNS = ['Reservoir Name', 'Date', 'Level', 'Current Live Storage']
+
+
 class Reservoir:
     def __init__(self, reservoir_name, state, district=None):
         self.reservoir_name = reservoir_name
@@ -28,7 +39,22 @@ class Reservoir:
         self.frl = None
         self.live_cap_frl = None
         self.data = None
+        # Set when the HydroFrame was fetched lazily (see TimeseriesLoader)
+        self._loader = None
+
+    @property
+    def data(self):
+        """
+        Time series of the reservoir ('Date', 'Level', 'Current Live Storage').
+        In a lazily fetched HydroFrame, it is downloaded the first time it is accessed.
+        """
+        if self._data is None and self._loader is not None:
+            self._loader.load([self.reservoir_name], prefetch=True)
+        return self._data
 
+    @data.setter
+    def data(self, value):
+        self._data = value
 
     def plot(self, **args):
         """
@@ -71,14 +97,18 @@ class Reservoir:
             basin=self.basin if self.basin else "N/A",
         )
 
-        # Add DataFrame representation if it exists
-        if self.data is not None and isinstance(self.data, pd.DataFrame):
+        # Add DataFrame representation if it exists (not loaded data is not downloaded for display)
+        if self._data is None and self._loader is not None:
+            html += """
+            <div style="margin-left: 20px; margin-bottom: 0"> Live Data: <i>not loaded</i> (access Reservoir.data to load) </div>
+            """
+        elif self._data is not None and isinstance(self._data, pd.DataFrame):
             html += """
             <div style="margin-left: 20px; margin-bottom: 0"> Live Data (preview) <br> <i>pandas.dataFrame</i> </div>
             <div style="overflow-x: auto; padding-left: 20px;">
             {}
             </div>
-            """.format(self.data.tail(4).to_html(index=False, classes="dataframe"))
+            """.format(self._data.tail(4).to_html(index=False, classes="dataframe"))
 
         # Add attribute descriptions
         html += """
@@ -97,6 +127,171 @@ class Reservoir:
         """
         return html
 
+    def _summary_html_(self):
+        """
+        Generate a one-line HTML summary used when the reservoir is listed inside a HydroFrame or State.
+        """
+        if self._data is not None and isinstance(self._data, pd.DataFrame):
+            data_status = f"{len(self._data)} records"
+        else:
+            data_status = "data not loaded" if self._loader is not None else "no data"
+        return """<li>{name} <i>({district}, Live Capacity (FRL): {live_cap_frl} MCM, {data_status})</i></li>""".format(
+            name=escape(str(self.reservoir_name)),
+            district=escape(str(self.district.district_name)) if self.district and self.district.district_name else "N/A",
+            live_cap_frl=self.live_cap_frl if self.live_cap_frl else "N/A",
+            data_status=data_status,
+        )
+
+
+class TimeseriesLoader:
+    """
+    Downloads reservoir time series on demand for a lazily fetched HydroFrame.
+
+    `Reservoir.data` calls `load` the first time it is accessed, prefetching the time series of
+    the next pending reservoirs up to `batch_size`, so that accessing reservoirs one after another
+    (e.g. in a loop or `plot_reservoirs`) sends one request per batch. Requests arriving within
+    `coalesce_delay` seconds of each other (e.g. from several threads or a `HydroFrame.load_data`
+    call) are collected into one batch and fetched with `fetch_reservoir_timeseries`. Reservoirs
+    already being downloaded are not requested again; callers wait for the batch that contains them.
+    Each downloaded batch is kept as a columnar store, and every reservoir's data is a view into it.
+    Requests are recorded in the request collectors active when the loader is created (see
+    `pywris.utils.instrumentation.collect`), whichever thread or context later accesses the data.
+
+    Parameters:
+    ----------
+    reservoirs : dict
+        Reservoir objects keyed by reservoir name.
+    timestep, start_date, end_date :
+        Time series to fetch, as in `fetch_reservoir_timeseries`.
+    batch_size, max_workers, date_window, float_dtype :
+        Passed on to `fetch_reservoir_timeseries`.
+    coalesce_delay : float, optional
+        Seconds a new batch waits for more requests before it is sent (default is 0.05).
+    """
+
+    def __init__(self, reservoirs, timestep, start_date, end_date, batch_size=50, max_workers=4,
+                 date_window="auto", float_dtype="float64", coalesce_delay=0.05):
+        self.reservoirs = reservoirs
+        # Prefetching order: reservoir names and the position of each name in it
+        self._order = list(reservoirs)
+        self._positions = {name: position for position, name in enumerate(self._order)}
+        self.timestep = timestep
+        self.start_date = start_date
+        self.end_date = end_date
+        self.fetch_kwargs = {
+            'batch_size': batch_size, 'max_workers': max_workers,
+            'date_window': date_window, 'float_dtype': float_dtype,
+        }
+        self.coalesce_delay = coalesce_delay
+        self.stores = []
+        self.loaded = set()
+        self._in_flight = {}
+        self._collecting = None
+        self._lock = threading.Lock()
+        # Lazy loads run outside the block that created the loader (e.g. HydroFrame.fetch_reservoir_data)
+        self._fetch_batch = propagate(self._fetch)
+
+    def pending(self):
+        """
+        Returns the names of the reservoirs whose time series has not been downloaded yet.
+        """
+        with self._lock:
+            return [name for name in self.reservoirs if name not in self.loaded]
+
+    def load(self, names, prefetch=False):
+        """
+        Downloads the time series of the given reservoirs unless already loaded, and attaches it
+        to their `data`. Blocks until all of them are available.
+
+        Parameters:
+        ----------
+        names : list of str
+            Reservoir names.
+        prefetch : bool, optional
+            Also download the pending reservoirs that follow the last of `names` (in the order of
+            `reservoirs`), up to `batch_size` reservoirs in the batch (default is False).
+        """
+        leader = False
+        waiting = []
+        with self._lock:
+            for name in names:
+                if name in self.loaded or name not in self.reservoirs:
+                    continue
+                if name not in self._in_flight:
+                    if self._collecting is None:
+                        self._collecting = ([], Future())
+                        leader = True
+                    self._collecting[0].append(name)
+                    self._in_flight[name] = self._collecting[1]
+                waiting.append(self._in_flight[name])
+            if prefetch and leader:
+                self._add_prefetched(names[-1])
+            batch = self._collecting if leader else None
+
+        if leader:
+            # Give concurrent accesses a chance to join the batch before it is sent
+            time.sleep(self.coalesce_delay)
+            with self._lock:
+                self._collecting = None
+            self._fetch_batch(*batch)
+
+        for future in set(waiting):
+            future.result()
+
+    def _add_prefetched(self, name):
+        """
+        Adds the pending reservoirs following `name` to the batch being collected, up to `batch_size`
+        and the last reservoir of `reservoirs`. Must be called with the lock held.
+        """
+        batch_names, future = self._collecting
+        if name not in self._positions:
+            return
+        for position in range(self._positions[name] + 1, len(self._order)):
+            if len(batch_names) >= self.fetch_kwargs['batch_size']:
+                break
+            candidate = self._order[position]
+            if candidate not in self.loaded and candidate not in self._in_flight:
+                batch_names.append(candidate)
+                self._in_flight[candidate] = future
+
+    def _fetch(self, batch_names, future):
+        try:
+            store = fetch_reservoir_timeseries(
+                batch_names, self.timestep, self.start_date, self.end_date, **self.fetch_kwargs
+            )
+            with self._lock:
+                if not store.empty:
+                    attach_timeseries(self.reservoirs, store)
+                    self.stores.append(store)
+                self.loaded.update(batch_names)
+            future.set_result(store)
+        except Exception as error:
+            future.set_exception(error)
+        finally:
+            with self._lock:
+                for name in batch_names:
+                    self._in_flight.pop(name, None)
+
+    def store(self):
+        """
+        Returns one columnar store (see `build_timeseries_store`) with all downloaded time series,
+        or None if nothing was downloaded. Reservoir data still points to the per-batch stores
+        until it is re-attached to the returned store (see `HydroFrame.load_data`).
+        """
+        with self._lock:
+            stores = list(self.stores)
+        if not stores:
+            return None
+        if len(stores) == 1:
+            return stores[0]
+        merged = build_timeseries_store(pd.concat(
+            [store.assign(**{'Reservoir Name': store['Reservoir Name'].astype(str)}) for store in stores],
+            ignore_index=True,
+        ), self.fetch_kwargs['float_dtype'])
+        # Keep only the merged store; batches downloaded meanwhile are appended after it
+        with self._lock:
+            self.stores = [merged] + self.stores[len(stores):]
+        return merged
 
 
 def get_reservoirs(
@@ -107,6 +302,12 @@ def get_reservoirs(
     selected_districts="all",
     selected_basins=None,
     selected_reservoirs="all",
+    batch_size=50,
+    max_workers=4,
+    date_window="auto",
+    float_dtype="float64",
+    filters=None,
+    lazy=False,
 ):
     """
     Fetches a list of reservoir objects based on specified filters and returns detailed information including time series data.
@@ -127,6 +328,23 @@ def get_reservoirs(
         List of basin names to filter reservoirs. It is required when selected_states is None.
     selected_reservoirs : list of str or "all", optional
         List of reservoir names to fetch. Use "all" to include all reservoirs within the filtered states and districts.
+    batch_size : int, optional
+        Maximum number of reservoirs requested in a single time series request (default is 50).
+    max_workers : int, optional
+        Maximum number of time series requests sent concurrently (default is 4).
+    date_window : str or None, optional
+        Pandas frequency string used to split long date ranges into separate requests. "auto" (default)
+        splits 'Daily' requests into yearly windows. None sends the whole date range in one request.
+    float_dtype : str, optional
+        dtype of the 'Level' and 'Current Live Storage' columns, 'float64' (default) or 'float32'.
+    filters : dict, optional
+        Conditions on reservoir attributes applied by the IndiaWRIS server, e.g.
+        {'basin': ['Krishna'], 'live_cap_frl': (100, None)}. Only the metadata and time series of
+        matching reservoirs are downloaded. See `pywris.utils.query.compile_filters` for the format.
+    lazy : bool, optional
+        If True, only metadata is fetched and the time series of each reservoir is downloaded the
+        first time its `data` is accessed (see `TimeseriesLoader`). The returned store is None.
+        Default is False.
 
     Returns:
     -------
@@ -141,6 +359,7 @@ def get_reservoirs(
         - If `selected_districts` is not a list of strings or "all".
         - If `selected_reservoirs` is not a list of strings or "all".
         - If any of the provided states, districts, or reservoirs are invalid.
+        - If `filters` contains a column that cannot be filtered on the server.
 
     Notes:
     ------
@@ -156,12 +375,79 @@ def get_reservoirs(
             timestep='Daily'
         )
 
+    Fetch only the large reservoirs of a basin:
+    >>> reservoirs = get_reservoirs(
+            end_date='2024-12-01',
+            selected_states='all',
+            filters={'basin': ['Krishna'], 'live_cap_frl': (500, None)}
+        )
+
     Access metadata and time series for a specific reservoir:
     >>> res = reservoirs['Krishna Reservoir']
     >>> print(res.latitude, res.longitude)
     >>> print(res.data.head())
     """
     
+    selection = select_reservoirs(
+        end_date, start_date, timestep, selected_states, selected_districts, selected_reservoirs, filters
+    )
+    if selection is None:
+        return None
+    selected_reservoirs, reservoir_info_df, district_dict = selection
+
+    if lazy:
+        reservoirs = build_reservoirs(selected_reservoirs, reservoir_info_df, None, district_dict)
+        loader = TimeseriesLoader(
+            reservoirs, timestep, start_date, end_date, batch_size, max_workers, date_window, float_dtype
+        )
+        for reservoir in reservoirs.values():
+            reservoir._loader = loader
+        return reservoirs, build_reservoirs_gdf(reservoir_info_df), None
+
+    # Fetch reservoir time series data
+    reservoir_data_df = fetch_reservoir_timeseries(
+        selected_reservoirs, timestep, start_date, end_date, batch_size, max_workers, date_window,
+        float_dtype=float_dtype,
+    )
+    if reservoir_data_df.empty:
+        return None
+    # Create dictionary of reservoir objects
+    reservoirs = build_reservoirs(selected_reservoirs, reservoir_info_df, reservoir_data_df, district_dict)
+
+    # Return the combined geodataframe of static reservoir data as well
+    reservoir_combined_gdf = build_reservoirs_gdf(reservoir_info_df)
+
+    return reservoirs, reservoir_combined_gdf, reservoir_data_df
+
+def select_reservoirs(
+    end_date,
+    start_date='1991-01-01',
+    timestep='Daily',
+    selected_states=None,
+    selected_districts="all",
+    selected_reservoirs="all",
+    filters=None,
+):
+    """
+    Validates a reservoir selection and fetches the metadata of the selected reservoirs, without
+    downloading any time series. Used by `get_reservoirs` and `BulkDownloadJob`.
+
+    Parameters:
+    ----------
+    end_date, start_date, timestep, selected_states, selected_districts, selected_reservoirs, filters :
+        As in `get_reservoirs`.
+
+    Returns:
+    -------
+    tuple or None
+        (selected reservoir names, normalized `get_reservoir_info` response or None, district dictionary),
+        or None if no reservoir matches `filters`.
+
+    Raises:
+    ------
+    ValueError
+        If the timestep, states, districts, reservoirs, filters or date range are invalid.
+    """
     # Check if timestep is valid
     if timestep not in ["Daily", "Monthly", "Yearly"]:
         raise ValueError("Timestep must be 'Daily', 'Monthly' or 'Yearly'.")
@@ -182,8 +468,11 @@ def get_reservoirs(
     else:
         raise ValueError("States must be a list of strings or 'all'.")
 
+    # Compile the filters first so that invalid filters fail before any request is sent
+    filter_conditions = compile_filters(filters) if filters else None
+
     # Prepare list of state ids
-    states_list_str = ",".join(["'" + state + "'" for state in selected_states])
+    states_list_str = quote_list(selected_states)
 
     # Check if selected_districts has valid input
     district_dict = geo_components.get_districts(selected_states)
@@ -201,9 +490,7 @@ def get_reservoirs(
         raise ValueError("Districts must be a list of strings or 'all'.")
 
     # Prepare list of ditrict names
-    district_names_list_str = ",".join(
-        ["'" + district + "'" for district in selected_districts]
-    )
+    district_names_list_str = quote_list(selected_districts)
 
     # Fetch reservoir names data
     reservoir_list = get_reservoir_names(states_list_str, district_names_list_str)
@@ -224,8 +511,11 @@ def get_reservoirs(
         raise ValueError("Reservoirs must be a list of strings or 'all'.")
     
     # Fetch reservoir attributes (primarily latitute and longitude)
-    reservoir_names_str = ",".join(["'" + reservoir + "'" for reservoir in selected_reservoirs])
-    reservoir_info = get_reservoir_info(reservoir_names_str, selection_all_states)
+    reservoir_names_str = quote_list(selected_reservoirs)
+    if filter_conditions:
+        reservoir_info = get_reservoir_info(reservoir_names_str, selection_all_states, filter_conditions)
+    else:
+        reservoir_info = get_reservoir_info(reservoir_names_str, selection_all_states)
     if reservoir_info:
         if 'features' in reservoir_info.keys():
             reservoir_info_df = pd.json_normalize(reservoir_info['features'])
@@ -234,80 +524,509 @@ def get_reservoirs(
     else:
         reservoir_info_df = None
 
+    # Only the reservoirs matching the filters are returned by the server; time series are fetched for those only
+    if filter_conditions:
+        if reservoir_info_df is None or reservoir_info_df.empty:
+            return None
+        matching_reservoirs = set(reservoir_info_df['attributes.station_name'])
+        selected_reservoirs = [reservoir for reservoir in selected_reservoirs if reservoir in matching_reservoirs]
+        if not selected_reservoirs:
+            return None
+
     # Fetch reservoir valid dates and check if user provided valid dates
     reservoir_data_valid_date_range = get_reservoir_data_valid_date_range()
     check_valid_date_range(start_date, end_date, reservoir_data_valid_date_range)
-    
-    # Fetch reservoir time series data
-    reservoir_data = get_reservoir_data(reservoir_names_str, timestep, start_date, end_date)
-    if reservoir_data:
-        reservoir_data_df = pd.json_normalize(reservoir_data)
+
+    return selected_reservoirs, reservoir_info_df, district_dict
+
+def build_reservoirs(selected_reservoirs, reservoir_info_df, reservoir_data_df, district_dict):
+    """
+    Builds Reservoir objects for the selected reservoirs in a single pass over the downloaded data.
+
+    The info DataFrame is grouped once by reservoir name; when a reservoir has several rows, each
+    attribute takes the last distinct value of its group.
+
+    Parameters:
+    ----------
+    selected_reservoirs : list of str
+        Reservoir names to build objects for.
+    reservoir_info_df : pandas.DataFrame or None
+        Normalized response of `get_reservoir_info` ('attributes.*' columns).
+    reservoir_data_df : pandas.DataFrame or None
+        Columnar time series store built by `build_timeseries_store` (with a 'Child' column).
+        Each Reservoir.data is a view into the rows of its reservoir. If None (lazy fetching),
+        no data is attached and districts are taken from the info DataFrame.
+    district_dict : dict
+        District objects keyed by district name, as returned by `geo_components.get_districts`.
+
+    Returns:
+    -------
+    dict
+        Reservoir objects keyed by reservoir name, in the order of `selected_reservoirs`.
+    """
+    info_columns = [
+        'attributes.state_name', 'attributes.lat', 'attributes.long', 'attributes.agency_name',
+        'attributes.dam_code', 'attributes.frl', 'attributes.lsc_frl', 'attributes.block_name',
+        'attributes.basin_name', 'attributes.basin_code', 'attributes.sub_basin_name',
+    ]
+    if reservoir_data_df is None:
+        info_columns.append('attributes.district_name')
+    if reservoir_info_df is not None and 'attributes.station_name' in reservoir_info_df.columns:
+        reservoir_info = last_unique_values(reservoir_info_df, 'attributes.station_name', info_columns).to_dict('index')
     else:
-        return None
-    # return reservoir_data_df
-    # Create dictionary of reservoir objects 
+        reservoir_info = {}
+
+    # Row range of each reservoir in the sorted store
+    if reservoir_data_df is not None:
+        reservoir_rows = reservoir_row_ranges(reservoir_data_df)
+        reservoir_districts = last_unique_values(reservoir_data_df, 'Reservoir Name', ['Child'])['Child'].to_dict()
+    else:
+        reservoir_rows = {}
+        reservoir_districts = {
+            res_name: info['attributes.district_name'] for res_name, info in reservoir_info.items()
+            if info.get('attributes.district_name') in district_dict
+        }
+
     reservoirs = {}
     for res_name in selected_reservoirs:
-        if res_name in reservoir_info_df['attributes.station_name'].unique():
-            sel_res_info_df = reservoir_info_df[reservoir_info_df['attributes.station_name']==res_name]
-            sel_res_state = sel_res_info_df['attributes.state_name'].unique()[-1]
-            sel_res = Reservoir(res_name, sel_res_state)
-            sel_res.latitude = sel_res_info_df['attributes.lat'].unique()[-1]
-            sel_res.longitude = sel_res_info_df['attributes.long'].unique()[-1]
-            sel_res.agency = sel_res_info_df['attributes.agency_name'].unique()[-1]
-            sel_res.dam_code = sel_res_info_df['attributes.dam_code'].unique()[-1]
-            sel_res.frl = sel_res_info_df['attributes.frl'].unique()[-1]
-            sel_res.live_cap_frl = sel_res_info_df['attributes.lsc_frl'].unique()[-1]
-            sel_res.block_name = sel_res_info_df['attributes.block_name'].unique()[-1]
-            basin_name = sel_res_info_df['attributes.basin_name'].unique()[-1]
-            basin_code = sel_res_info_df['attributes.basin_code'].unique()[-1]
-            sel_res.basin = geo_components.Basin(basin_name, basin_code)
-            sel_res.sub_basin_name = sel_res_info_df['attributes.sub_basin_name'].unique()[-1]
-            sel_res.sub_basin_name = sel_res_info_df['attributes.sub_basin_name'].unique()[-1] 
+        if res_name in reservoir_info:
+            sel_res_info = reservoir_info[res_name]
+            sel_res = Reservoir(res_name, sel_res_info['attributes.state_name'])
+            sel_res.latitude = sel_res_info['attributes.lat']
+            sel_res.longitude = sel_res_info['attributes.long']
+            sel_res.agency = sel_res_info['attributes.agency_name']
+            sel_res.dam_code = sel_res_info['attributes.dam_code']
+            sel_res.frl = sel_res_info['attributes.frl']
+            sel_res.live_cap_frl = sel_res_info['attributes.lsc_frl']
+            sel_res.block_name = sel_res_info['attributes.block_name']
+            sel_res.basin = geo_components.Basin(sel_res_info['attributes.basin_name'], sel_res_info['attributes.basin_code'])
+            sel_res.sub_basin_name = sel_res_info['attributes.sub_basin_name']
         else:
             sel_res = Reservoir(res_name, None)
 
-        if res_name in reservoir_data_df['Reservoir Name'].unique():
-            sel_res_data_df = reservoir_data_df[reservoir_data_df['Reservoir Name']==res_name]
-            sel_res.data = sel_res_data_df[['Date','Level','Current Live Storage']]
-            sel_res.data['Date'] = pd.to_datetime(sel_res.data['Date'])
-            sel_res.district = district_dict[sel_res_data_df['Child'].unique()[-1]]
+        if res_name in reservoir_rows or (reservoir_data_df is None and res_name in reservoir_districts):
+            sel_res.district = district_dict[reservoir_districts[res_name]]
         else:
             pass
-        
+
         reservoirs[res_name] = sel_res
-        
-        # Return the comined dataframe as well
-        reservoir_data_df_drop_dl = reservoir_data_df.drop_duplicates(subset=['Reservoir Name'],keep='last')
-        reservoir_combined_df = reservoir_info_df.merge(reservoir_data_df_drop_dl, how='left', left_on='attributes.station_name', right_on='Reservoir Name')
-        # Rename columns names to attribute names
-
-        # Dropping and renaming columns from reservoir_combined_df
-        required_columns = {
-            'attributes.station_name':'reservoir_name',
-            'attributes.lat':'latitude',
-            'attributes.long':'longitude',
-            'attributes.agency_name':'agency',
-            'attributes.state_name':'state',
-            'attributes.state_code':'state_code',
-            'attributes.district_name':'district',
-            'attributes.block_name':'block_name',
-            'attributes.basin_name':'basin',
-            'attributes.sub_basin_name':'sub_basin',
-            'attributes.dam_code':'dam_code',
-            'attributes.frl':'frl',
-            'attributes.lsc_frl':'live_cap_frl',
-        }
-        reservoir_combined_formatted = reservoir_combined_df[list(required_columns.keys())].rename(columns=required_columns)
-       
-        #Converting to a geodataframe
-        reservoir_combined_formatted['geometry'] = reservoir_combined_formatted.apply(lambda row: 
-        Point(row['longitude'], row['latitude']), axis=1)
-        reservoir_combined_gdf = gpd.GeoDataFrame(reservoir_combined_formatted,geometry='geometry',
-        crs="EPSG:4326")
-        
-    return reservoirs, reservoir_combined_gdf, reservoir_data_df
 
+    if reservoir_data_df is not None:
+        attach_timeseries(reservoirs, reservoir_data_df)
+    return reservoirs
+
+def build_reservoirs_from_gdf(reservoir_gdf, store=None):
+    """
+    Builds Reservoir objects from a GeoDataFrame of static reservoir data (see `build_reservoirs_gdf`)
+    without any request to IndiaWRIS, e.g. when a saved HydroFrame is loaded.
+
+    Parameters:
+    ----------
+    reservoir_gdf : geopandas.GeoDataFrame
+        Static reservoir data with the renamed attribute columns.
+    store : pandas.DataFrame, optional
+        Columnar time series store. Reservoirs that only appear in the store are created without
+        static data, and the data of every reservoir is attached as a view into the store.
+
+    Returns:
+    -------
+    dict
+        Reservoir objects keyed by reservoir name.
+    """
+    reservoir_info = reservoir_gdf.drop_duplicates(subset=['reservoir_name'], keep='last')
+    reservoirs = {}
+    for sel_res_info in reservoir_info.to_dict('records'):
+        res_name = sel_res_info['reservoir_name']
+        sel_res = Reservoir(res_name, sel_res_info['state'])
+        sel_res.district = geo_components.District(sel_res_info['state'], sel_res_info['district'])
+        sel_res.latitude = sel_res_info['latitude']
+        sel_res.longitude = sel_res_info['longitude']
+        sel_res.agency = sel_res_info['agency']
+        sel_res.dam_code = sel_res_info['dam_code']
+        sel_res.frl = sel_res_info['frl']
+        sel_res.live_cap_frl = sel_res_info['live_cap_frl']
+        sel_res.block_name = sel_res_info['block_name']
+        sel_res.basin = geo_components.Basin(sel_res_info['basin'], sel_res_info.get('basin_code'))
+        sel_res.sub_basin_name = sel_res_info['sub_basin']
+        reservoirs[res_name] = sel_res
+
+    if store is not None:
+        for res_name in reservoir_row_ranges(store):
+            if res_name not in reservoirs:
+                reservoirs[res_name] = Reservoir(res_name, None)
+        attach_timeseries(reservoirs, store)
+    return reservoirs
+
+def build_timeseries_store(reservoir_data_df, float_dtype='float64', date_format=None):
+    """
+    Converts downloaded time series into the columnar store shared by a HydroFrame and its reservoirs.
+
+    The store is a single long-format table with 'Reservoir Name' (categorical), 'Date' (datetime64),
+    'Level' and 'Current Live Storage' (float) as its first columns, followed by any other columns
+    of the response. 'Level' or 'Current Live Storage' may be left out (e.g. when loaded with column
+    pruning). Rows are de-duplicated on ('Reservoir Name', 'Date') and sorted by reservoir and date,
+    so the rows of each reservoir form one contiguous range (see `reservoir_row_ranges`).
+
+    All columns are typed in one pass over the table: repeated strings ('Child', 'Parent', ...) become
+    categoricals, the value columns become `float_dtype`, and each distinct date is parsed once.
+
+    Parameters:
+    ----------
+    reservoir_data_df : pandas.DataFrame
+        Time series with at least 'Reservoir Name' and 'Date' columns.
+    float_dtype : str, optional
+        dtype of 'Level' and 'Current Live Storage', 'float64' (default) or 'float32'.
+    date_format : str, optional
+        strftime format of the 'Date' strings (e.g. '%Y-%m-%d'). If None, or if parsing with it fails,
+        the format is inferred.
+
+    Returns:
+    -------
+    pandas.DataFrame
+        The columnar store with a fresh RangeIndex.
+    """
+    if float_dtype not in ('float32', 'float64'):
+        raise ValueError("float_dtype must be 'float32' or 'float64'.")
+
+    timeseries_columns = [col for col in TIMESERIES_COLUMNS if col in reservoir_data_df.columns]
+    other_columns = [col for col in reservoir_data_df.columns if col not in timeseries_columns]
+    store = reservoir_data_df[timeseries_columns + other_columns].copy()
+
+    names = store['Reservoir Name']
+    if not isinstance(names.dtype, pd.CategoricalDtype):
+        names = names.astype(str).astype('category')
+    # Keep the categorical codes, with the categories as sorted strings
+    names = names.cat.remove_unused_categories()
+    names = names.cat.rename_categories(names.cat.categories.astype(str))
+    store['Reservoir Name'] = names.cat.reorder_categories(sorted(names.cat.categories))
+
+    store['Date'] = parse_dates(store['Date'], date_format)
+    for col in timeseries_columns[2:]:
+        store[col] = decode_categories(
+            store[col], lambda values: pd.to_numeric(values, errors='coerce')
+        ).astype(float_dtype)
+    for col in other_columns:
+        if pd.api.types.is_object_dtype(store[col]) or pd.api.types.is_string_dtype(store[col]):
+            store[col] = store[col].astype('category')
+
+    store = store.drop_duplicates(subset=['Reservoir Name', 'Date'], keep='last')
+    store = store.sort_values(['Reservoir Name', 'Date'], kind='stable').reset_index(drop=True)
+    return store
+
+def parse_dates(dates, date_format=None):
+    """
+    Parses a Series of date strings, converting each distinct value only once.
+
+    Parameters:
+    ----------
+    dates : pandas.Series
+        Date strings (object, string or categorical dtype) or already parsed dates.
+    date_format : str, optional
+        strftime format of the strings. If None, or if parsing with it fails, the format is inferred.
+
+    Returns:
+    -------
+    pandas.Series
+        datetime64 Series with the index of `dates`.
+    """
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates
+
+    def to_datetime(values):
+        if date_format is not None:
+            try:
+                return pd.to_datetime(values, format=date_format)
+            except ValueError:
+                pass
+        return pd.to_datetime(values)
+
+    if not isinstance(dates.dtype, pd.CategoricalDtype):
+        dates = dates.astype('category')
+    return decode_categories(dates, to_datetime)
+
+def decode_categories(values, convert):
+    """
+    Applies `convert` to the distinct values of a categorical Series and expands the result to all rows.
+    Non-categorical Series are converted directly.
+    """
+    if not isinstance(values.dtype, pd.CategoricalDtype):
+        return pd.Series(convert(values), index=values.index)
+    converted = pd.Series(convert(pd.Series(values.cat.categories)))
+    # Code -1 (missing) takes the trailing missing value
+    converted = pd.concat([converted, pd.Series([None], dtype=converted.dtype)], ignore_index=True)
+    return pd.Series(converted.to_numpy()[values.cat.codes.to_numpy()], index=values.index)
+
+def reservoir_row_ranges(store):
+    """
+    Returns the contiguous row range of every reservoir in a store built by `build_timeseries_store`.
+
+    Parameters:
+    ----------
+    store : pandas.DataFrame
+        Columnar time series store, sorted by reservoir.
+
+    Returns:
+    -------
+    dict
+        slice objects keyed by reservoir name.
+    """
+    codes = store['Reservoir Name'].cat.codes.to_numpy()
+    if len(codes) == 0:
+        return {}
+    starts = np.concatenate([[0], np.flatnonzero(np.diff(codes)) + 1])
+    stops = np.concatenate([starts[1:], [len(codes)]])
+    categories = store['Reservoir Name'].cat.categories
+    return {
+        categories[codes[start]]: slice(int(start), int(stop))
+        for start, stop in zip(starts, stops) if codes[start] >= 0
+    }
+
+def attach_timeseries(reservoirs, store):
+    """
+    Points the data of each reservoir to its rows in the columnar store (without copying).
+
+    Parameters:
+    ----------
+    reservoirs : dict
+        Reservoir objects keyed by reservoir name.
+    store : pandas.DataFrame
+        Columnar time series store built by `build_timeseries_store`.
+    """
+    # 'Date' and the value columns directly follow 'Reservoir Name' in the store
+    data_columns = slice(1, len([col for col in TIMESERIES_COLUMNS if col in store.columns]))
+    for res_name, rows in reservoir_row_ranges(store).items():
+        if res_name in reservoirs:
+            reservoirs[res_name].data = store.iloc[rows, data_columns]
+
+# pandas.Grouper arguments of each timestep name accepted by `resample_timeseries`; every period
+# is labelled by its first day (weeks run from Monday to Sunday)
+RESAMPLE_FREQUENCIES = {
+    'Daily': {'freq': 'D'},
+    'Weekly': {'freq': 'W-MON', 'closed': 'left', 'label': 'left'},
+    'Monthly': {'freq': 'MS'},
+    'Yearly': {'freq': 'YS'},
+}
+RESAMPLE_STATISTICS = ('mean', 'min', 'max', 'last', 'count')
+
+def resample_timeseries(store, freq, how=RESAMPLE_STATISTICS, columns=None):
+    """
+    Aggregates the time series of all reservoirs to a coarser timestep in one grouped pass.
+
+    Parameters:
+    ----------
+    store : pandas.DataFrame
+        Columnar time series store built by `build_timeseries_store`.
+    freq : str
+        'Weekly', 'Monthly', 'Yearly', 'Daily' or any pandas frequency string (e.g. '10D', 'QS').
+    how : str or list of str, optional
+        Statistics to compute among 'mean', 'min', 'max', 'last' and 'count' (default is all of them).
+    columns : list of str, optional
+        Value columns to aggregate (default is 'Level' and 'Current Live Storage').
+
+    Returns:
+    -------
+    pandas.DataFrame
+        One row per reservoir and period, indexed by ('Reservoir Name', 'Date') where 'Date' is the
+        start of the period (the Monday of 'Weekly' periods; pandas frequency strings keep their
+        own labels, e.g. 'ME' labels months by their last day). Columns are (column, statistic) pairs, or the columns alone if `how`
+        is a single statistic. Periods without observations are left out.
+    """
+    statistics = [how] if isinstance(how, str) else list(how)
+    invalid_statistics = [stat for stat in statistics if stat not in RESAMPLE_STATISTICS]
+    if invalid_statistics or not statistics:
+        raise ValueError(f"Statistics must be among {', '.join(RESAMPLE_STATISTICS)}.")
+    if columns is None:
+        columns = [col for col in TIMESERIES_COLUMNS[2:] if col in store.columns]
+    else:
+        missing_cols = [col for col in columns if col not in store.columns]
+        if missing_cols:
+            raise KeyError(f"The following columns are missing from data: {missing_cols}")
+
+    grouped = store.groupby(
+        ['Reservoir Name', pd.Grouper(key='Date', **RESAMPLE_FREQUENCIES.get(freq, {'freq': freq}))],
+        observed=True, sort=True,
+    )[columns]
+    resampled = grouped.agg(statistics[0] if isinstance(how, str) else statistics)
+    # Periods without any row of a reservoir appear as empty groups of the date Grouper
+    return resampled[grouped.size().to_numpy() > 0]
+
+def aggregate_storage(store, reservoir_gdf, by='state', column='Current Live Storage'):
+    """
+    Sums the live storage of reservoirs per group (e.g. state or basin) and date, and the fill
+    fraction of the live capacity at FRL, in one grouped pass over the columnar store.
+
+    The fill fraction of a group is capacity-weighted: the storage of its reporting reservoirs with a
+    known capacity divided by their total capacity ('live_cap_frl'). Reservoirs that do not report
+    on a date are left out of both sums for that date.
+
+    Parameters:
+    ----------
+    store : pandas.DataFrame
+        Columnar time series store built by `build_timeseries_store`.
+    reservoir_gdf : geopandas.GeoDataFrame
+        Static reservoir data (see `build_reservoirs_gdf`) with 'reservoir_name', 'live_cap_frl' and `by`.
+    by : str, optional
+        Column of `reservoir_gdf` to group by, e.g. 'state' (default), 'district', 'basin',
+        'sub_basin' or 'agency'.
+    column : str, optional
+        Storage column to sum (default is 'Current Live Storage').
+
+    Returns:
+    -------
+    pandas.DataFrame
+        Indexed by (`by`, 'Date') with the columns:
+        - 'Live Storage': total storage of the reporting reservoirs
+        - 'Reporting Capacity': total live capacity of the reporting reservoirs with a known capacity
+        - 'Fill Fraction': storage / capacity of the reporting reservoirs with a known capacity
+        - 'Reservoirs Reporting': number of reservoirs with a value on the date
+        - 'Total Capacity': total live capacity of all reservoirs of the group
+    """
+    if by not in reservoir_gdf.columns or by == 'geometry':
+        raise KeyError(f"{by} is not a column of the reservoir GeoDataFrame.")
+    if column not in store.columns:
+        raise KeyError(f"The column {column} is missing from data.")
+
+    # Group and capacity of every reservoir category of the store, looked up once
+    reservoir_info = reservoir_gdf.drop_duplicates(subset=['reservoir_name'], keep='last').set_index('reservoir_name')
+    names = store['Reservoir Name'].cat.categories
+    groups = reservoir_info[by].reindex(names)
+    capacities = pd.to_numeric(reservoir_info['live_cap_frl'], errors='coerce').reindex(names).to_numpy(dtype='float64')
+    group_codes, group_values = pd.factorize(groups.to_numpy(), sort=True, use_na_sentinel=True)
+
+    # Per-row values, broadcast from the reservoir codes (-1 marks reservoirs without static data)
+    name_codes = store['Reservoir Name'].cat.codes.to_numpy()
+    row_groups = np.where(name_codes >= 0, group_codes[name_codes], -1)
+    storage = store[column].to_numpy(dtype='float64')
+    reporting = ~np.isnan(storage)
+    row_capacity = np.where(name_codes >= 0, capacities[name_codes], np.nan)
+    weighted = reporting & ~np.isnan(row_capacity)
+
+    rows = pd.DataFrame({
+        by: pd.Categorical.from_codes(row_groups, categories=group_values),
+        'Date': store['Date'].to_numpy(),
+        'Live Storage': np.where(reporting, storage, 0.0),
+        'Weighted Storage': np.where(weighted, storage, 0.0),
+        'Reporting Capacity': np.where(weighted, row_capacity, 0.0),
+        'Reservoirs Reporting': reporting.astype('int64'),
+    })
+    aggregated = rows[row_groups >= 0].groupby([by, 'Date'], observed=True, sort=True).sum()
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        aggregated['Fill Fraction'] = np.where(
+            aggregated['Reporting Capacity'] > 0,
+            aggregated['Weighted Storage'] / aggregated['Reporting Capacity'],
+            np.nan,
+        )
+    total_capacity = pd.Series(capacities, index=groups.to_numpy()).groupby(level=0).sum(min_count=1)
+    aggregated['Total Capacity'] = aggregated.index.get_level_values(by).map(total_capacity).to_numpy(dtype='float64')
+    aggregated.loc[aggregated['Reservoirs Reporting'] == 0, 'Live Storage'] = np.nan
+    return aggregated[['Live Storage', 'Reporting Capacity', 'Fill Fraction', 'Reservoirs Reporting', 'Total Capacity']]
+
+def timeseries_matrix(store, columns=None):
+    """
+    Reshapes the columnar store into dense reservoir x time matrices in one vectorized pass.
+
+    Parameters:
+    ----------
+    store : pandas.DataFrame
+        Columnar time series store built by `build_timeseries_store`.
+    columns : list of str, optional
+        Value columns to reshape (default is all of 'Level' and 'Current Live Storage' in the store).
+
+    Returns:
+    -------
+    pandas.Index
+        Reservoir names (rows of the matrices), in store order.
+    pandas.DatetimeIndex
+        Sorted distinct dates (columns of the matrices).
+    dict
+        numpy arrays of shape (reservoirs, dates) keyed by column. Missing observations are NaN.
+    """
+    if columns is None:
+        columns = [col for col in TIMESERIES_COLUMNS[2:] if col in store.columns]
+
+    names = store['Reservoir Name'].cat.remove_unused_categories()
+    reservoir_index = names.cat.categories
+    dates = pd.DatetimeIndex(np.unique(store['Date'].dropna().to_numpy()))
+
+    valid = store['Date'].notna().to_numpy()
+    row_positions = names.cat.codes.to_numpy()[valid]
+    col_positions = dates.searchsorted(store['Date'].to_numpy()[valid])
+
+    matrices = {}
+    for col in columns:
+        matrix = np.full((len(reservoir_index), len(dates)), np.nan, dtype=store[col].dtype)
+        matrix[row_positions, col_positions] = store[col].to_numpy()[valid]
+        matrices[col] = matrix
+    return reservoir_index, dates, matrices
+
+def build_reservoirs_gdf(reservoir_info_df):
+    """
+    Builds the GeoDataFrame of static reservoir data from the response of `get_reservoir_info`.
+
+    Parameters:
+    ----------
+    reservoir_info_df : pandas.DataFrame or None
+        Normalized response of `get_reservoir_info` ('attributes.*' columns).
+
+    Returns:
+    -------
+    geopandas.GeoDataFrame
+        One row per reservoir feature with renamed attribute columns and point geometries (EPSG:4326).
+    """
+    # Dropping and renaming columns from reservoir_info_df
+    required_columns = {
+        'attributes.station_name':'reservoir_name',
+        'attributes.lat':'latitude',
+        'attributes.long':'longitude',
+        'attributes.agency_name':'agency',
+        'attributes.state_name':'state',
+        'attributes.state_code':'state_code',
+        'attributes.district_name':'district',
+        'attributes.block_name':'block_name',
+        'attributes.basin_name':'basin',
+        'attributes.basin_code':'basin_code',
+        'attributes.sub_basin_name':'sub_basin',
+        'attributes.dam_code':'dam_code',
+        'attributes.frl':'frl',
+        'attributes.lsc_frl':'live_cap_frl',
+    }
+    if reservoir_info_df is None:
+        reservoir_info_df = pd.DataFrame(columns=list(required_columns.keys()))
+    reservoir_formatted = reservoir_info_df[list(required_columns.keys())].rename(columns=required_columns)
+
+    #Converting to a geodataframe
+    geometry = gpd.points_from_xy(reservoir_formatted['longitude'], reservoir_formatted['latitude'])
+    reservoir_gdf = gpd.GeoDataFrame(reservoir_formatted, geometry=geometry, crs="EPSG:4326")
+    return reservoir_gdf
+
+def last_unique_values(df, key, columns):
+    """
+    Returns, for every value of `key`, the last distinct value of each column in its group
+    (equivalent to `df[df[key] == value][column].unique()[-1]`, computed for all groups at once).
+
+    Parameters:
+    ----------
+    df : pandas.DataFrame
+        Input data.
+    key : str
+        Column to group by.
+    columns : list of str
+        Columns to reduce.
+
+    Returns:
+    -------
+    pandas.DataFrame
+        One row per distinct `key`, indexed by `key`.
+    """
+    last_values = {}
+    for column in columns:
+        # Keep the first occurrence of each distinct value, then the last of those per group
+        distinct_df = df.drop_duplicates(subset=[key, column], keep='first')
+        last_values[column] = distinct_df.drop_duplicates(subset=[key], keep='last').set_index(key)[column]
+    return pd.DataFrame(last_values, columns=columns)
+
+@memoize(ttl=requests_config["reservoir"]["get_reservoir_names"]["cache_ttl"])
 def get_reservoir_names(states_list_str,district_names_list_str):
     """
     Fetches reservoir names based on the provided states and districts.
@@ -325,15 +1044,14 @@ def get_reservoir_names(states_list_str,district_names_list_str):
         A nested list of reservoir names corresponding to the specified states and districts.
     """    
     url = requests_config["reservoir"]["get_reservoir_names"]["url"]
-    # Create a copy of the payload to avoid modifying the original
-    payload = deepcopy(requests_config["reservoir"]["get_reservoir_names"]["payload"])
-    payload["stnVal"]["qry"] = payload["stnVal"]["qry"].format(
-     states_list_str, district_names_list_str
-    )
+    # Build a new payload from the template instead of modifying the original
+    template = requests_config["reservoir"]["get_reservoir_names"]["payload"]
+    payload = {"stnVal": {"qry": template["stnVal"]["qry"].format(states_list_str, district_names_list_str)}}
     method = requests_config["reservoir"]["get_reservoir_names"]["method"]
     reservoir_names = get_response(url, payload, method, "get_reservoir_names")
     return reservoir_names
 
+@memoize(ttl=requests_config["reservoir"]["get_reservoir_data_valid_date_range"]["cache_ttl"])
 def get_reservoir_data_valid_date_range():
     """
     Fetches the valid date range for reservoir data availability.
@@ -349,7 +1067,7 @@ def get_reservoir_data_valid_date_range():
     reservoir_data_valid_date_range = get_response(url, payload, method, "get_reservoir_data_valid_date_range")
     return reservoir_data_valid_date_range[0]
 
-def get_reservoir_data(reservoir_names_str, timestep, start_date, end_date):
+def get_reservoir_data(reservoir_names_str, timestep, start_date, end_date, stream=False):
     """
     Fetches time-series data for specified reservoirs within a given date range.
 
@@ -364,21 +1082,229 @@ def get_reservoir_data(reservoir_names_str, timestep, start_date, end_date):
     end_date : str
         The end date for the data range in 'YYYY-MM-DD' format.
 
+    stream : bool, optional
+        If True, return an iterator that parses the response incrementally and yields one record at a time.
+
     Returns:
     -------
-    list of dict
+    list of dict (or iterator of dict if `stream` is True)
         A list where each element is a dictionary containing time-series data for a reservoir.
     """
     url = requests_config["reservoir"]["get_reservoir_data"]["url"]
-    payload = deepcopy(requests_config["reservoir"]["get_reservoir_data"]["payload"])
-    payload["stnVal"]["Reservoir"] = payload["stnVal"]["Reservoir"].format(reservoir_names_str)
-    payload["stnVal"]["Timestep"] = payload["stnVal"]["Timestep"].format(timestep)
-    payload["stnVal"]["Startdate"] = payload["stnVal"]["Startdate"].format(start_date)
-    payload["stnVal"]["Enddate"] = payload["stnVal"]["Enddate"].format(end_date)
+    template = requests_config["reservoir"]["get_reservoir_data"]["payload"]["stnVal"]
+    payload = {"stnVal": {
+        **template,
+        "Reservoir": template["Reservoir"].format(reservoir_names_str),
+        "Timestep": template["Timestep"].format(timestep),
+        "Startdate": template["Startdate"].format(start_date),
+        "Enddate": template["Enddate"].format(end_date),
+    }}
     method = requests_config["reservoir"]["get_reservoir_data"]["method"]
+    if stream:
+        return iter_response_records(url, payload, method, "get_reservoir_data")
     reservoir_data = get_response(url, payload, method, "get_reservoir_data")
     return reservoir_data
 
+def fetch_reservoir_timeseries(
+    selected_reservoirs,
+    timestep,
+    start_date,
+    end_date,
+    batch_size=50,
+    max_workers=4,
+    date_window="auto",
+    max_retries=2,
+    float_dtype="float64",
+):
+    """
+    Fetches time-series data for a list of reservoirs in concurrent batches and date windows.
+
+    The reservoir list is split into batches of at most `batch_size` names and the date range
+    into windows of `date_window`. Each (batch, window) unit is requested separately on a thread
+    pool of at most `max_workers` threads and retried on its own if it fails. Responses are parsed
+    incrementally into typed column buffers, then stitched together, de-duplicated on
+    ('Reservoir Name', 'Date') and sorted by reservoir and date.
+
+    Parameters:
+    ----------
+    selected_reservoirs : list of str
+        Reservoir names to fetch.
+    timestep : str
+        The desired time interval for the data. Acceptable values are 'Daily', 'Monthly', or 'Yearly'.
+    start_date : str
+        The start date for the data range in 'YYYY-MM-DD' format.
+    end_date : str
+        The end date for the data range in 'YYYY-MM-DD' format.
+    batch_size : int, optional
+        Maximum number of reservoirs per request (default is 50).
+    max_workers : int, optional
+        Maximum number of concurrent requests (default is 4).
+    date_window : str or None, optional
+        Length of the date windows as a pandas frequency string (e.g. 'YS' for yearly windows).
+        "auto" (default) uses yearly windows for 'Daily' data and a single window otherwise.
+        None requests the whole date range at once.
+    max_retries : int, optional
+        Number of times a unit whose response body could not be read or parsed (e.g. a truncated
+        body) is requested again before the error is raised (default is 2). HTTP errors and
+        connection errors are retried per request by `pywris.utils.fetch_wris.send_request` and are
+        raised at once.
+    float_dtype : str, optional
+        dtype of the 'Level' and 'Current Live Storage' columns, 'float64' (default) or 'float32'.
+
+    Returns:
+    -------
+    pandas.DataFrame
+        The merged time series as a columnar store (see `build_timeseries_store`).
+    """
+    if batch_size < 1 or max_workers < 1:
+        raise ValueError("batch_size and max_workers must be positive integers.")
+
+    if date_window == "auto":
+        date_window = "YS" if timestep == "Daily" else None
+
+    batches = [
+        selected_reservoirs[i:i + batch_size] for i in range(0, len(selected_reservoirs), batch_size)
+    ]
+    windows = split_date_range(start_date, end_date, date_window)
+    units = [(batch, window) for batch in batches for window in windows]
+    if not units:
+        return pd.DataFrame()
+
+    # Records are streamed into typed column buffers: one per unit, merged once the unit succeeded
+    reservoir_data = RecordBuffer(numeric_columns=TIMESERIES_COLUMNS[2:])
+
+    def fetch_unit(unit):
+        batch, (window_start, window_end) = unit
+        batch_names_str = quote_list(batch)
+        for attempt in range(max_retries + 1):
+            try:
+                unit_data = RecordBuffer(numeric_columns=TIMESERIES_COLUMNS[2:])
+                unit_data.extend(get_reservoir_data(batch_names_str, timestep, window_start, window_end, stream=True) or [])
+                reservoir_data.merge(unit_data)
+                return
+            except RESPONSE_BODY_ERRORS:
+                if attempt == max_retries:
+                    raise
+                time.sleep(2 ** attempt)
+
+    # Requests of the workers are recorded by the collectors of the caller (see instrumentation.collect)
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(units))) as executor:
+        list(executor.map(propagate(fetch_unit), units))
+
+    reservoir_data_df = reservoir_data.to_frame()
+
+    # Stitch windows: drop rows returned by overlapping windows and restore the order
+    if {"Reservoir Name", "Date"}.issubset(reservoir_data_df.columns):
+        reservoir_data_df = build_timeseries_store(
+            reservoir_data_df, float_dtype, requests_config["reservoir"]["get_reservoir_data"].get("date_format")
+        )
+    return reservoir_data_df
+
+def fetch_new_reservoir_data(reservoir_data_df, end_date, timestep='Daily', previous_end_date=None,
+                             reservoir_names=None, **kwargs):
+    """
+    Fetches only the observations that are missing at the end of already downloaded time series.
+
+    Each reservoir is requested from its last date in `reservoir_data_df`, but not before
+    `previous_end_date`, up to `end_date`. Reservoirs that stopped reporting long ago or have no rows
+    are therefore only requested from `previous_end_date`, and reservoirs sharing the same start
+    date are fetched together (a daily update sends one batched call). The start date is requested
+    again so that values revised by the server (or partial Monthly/Yearly aggregates) are refreshed.
+
+    Parameters:
+    ----------
+    reservoir_data_df : pandas.DataFrame
+        Existing columnar time series store (see `build_timeseries_store`).
+    end_date : str
+        The end date of the data to fetch, in the format 'YYYY-MM-DD'.
+    timestep : str, optional
+        'Daily', 'Monthly' or 'Yearly'. Must match the timestep of `reservoir_data_df`. Default is 'Daily'.
+    previous_end_date : str, optional
+        End date of the previous download (e.g. `HydroFrame.end_date`). If None, each reservoir is
+        requested from its own last date and reservoirs without rows are not requested.
+    reservoir_names : list of str, optional
+        Reservoirs to update, including those without rows in `reservoir_data_df`
+        (default is the reservoirs of the store).
+    **kwargs :
+        Additional options passed on to `fetch_reservoir_timeseries` (e.g. `batch_size`, `max_workers`).
+
+    Returns:
+    -------
+    pandas.DataFrame
+        The merged columnar time series store.
+    list of str
+        Names of the reservoirs for which new rows were fetched.
+    """
+    last_dates = pd.to_datetime(reservoir_data_df['Date']).groupby(reservoir_data_df['Reservoir Name'], observed=True).max()
+    last_dates.index = last_dates.index.astype(str)
+    if reservoir_names is not None:
+        last_dates = last_dates.reindex(list(reservoir_names))
+    end = pd.to_datetime(end_date)
+
+    # Start of each request: the last date, clamped to the end of the previous download
+    if previous_end_date is not None:
+        start_dates = last_dates.fillna(pd.to_datetime(previous_end_date)).clip(lower=pd.to_datetime(previous_end_date))
+    else:
+        start_dates = last_dates.dropna()
+
+    # Keep the precision of the existing store
+    float_dtype = str(reservoir_data_df['Level'].dtype) if 'Level' in reservoir_data_df.columns else 'float64'
+    kwargs.setdefault('float_dtype', float_dtype if float_dtype in ('float32', 'float64') else 'float64')
+
+    new_data = []
+    for start, names in start_dates.groupby(start_dates).groups.items():
+        if start > end:
+            continue
+        new_data.append(fetch_reservoir_timeseries(
+            list(names), timestep, start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"), **kwargs
+        ))
+    new_data = [data_df for data_df in new_data if not data_df.empty]
+    if not new_data:
+        return reservoir_data_df, []
+
+    new_data_df = pd.concat(new_data, ignore_index=True)
+    merged_df = build_timeseries_store(
+        pd.concat([reservoir_data_df, new_data_df], ignore_index=True), kwargs['float_dtype']
+    )
+    return merged_df, list(new_data_df['Reservoir Name'].unique())
+
+def split_date_range(start_date, end_date, freq=None):
+    """
+    Splits a date range into consecutive, non-overlapping windows.
+
+    Parameters:
+    ----------
+    start_date : str
+        The start date of the range in 'YYYY-MM-DD' format.
+    end_date : str
+        The end date of the range in 'YYYY-MM-DD' format.
+    freq : str or None, optional
+        Pandas frequency string marking the window boundaries (e.g. 'YS', 'MS').
+        If None, the whole range is returned as a single window.
+
+    Returns:
+    -------
+    list of tuple
+        (window_start, window_end) date strings in 'YYYY-MM-DD' format.
+
+    Example:
+    --------
+    >>> split_date_range('2022-06-01', '2024-03-31', 'YS')
+    [('2022-06-01', '2022-12-31'), ('2023-01-01', '2023-12-31'), ('2024-01-01', '2024-03-31')]
+    """
+    if freq is None:
+        return [(str(start_date), str(end_date))]
+
+    start = pd.to_datetime(start_date)
+    end = pd.to_datetime(end_date)
+    boundaries = [date for date in pd.date_range(start, end, freq=freq) if date > start]
+    window_starts = [start] + boundaries
+    window_ends = [boundary - pd.Timedelta(days=1) for boundary in boundaries] + [end]
+    return [
+        (window_start.strftime("%Y-%m-%d"), window_end.strftime("%Y-%m-%d"))
+        for window_start, window_end in zip(window_starts, window_ends)
+    ]
+
 def check_valid_date_range(start_date, end_date, valid_date_range):
     """
     Validates the user-provided date range against the allowed date range.
@@ -412,7 +1338,8 @@ def check_valid_date_range(start_date, end_date, valid_date_range):
     if start_date > end_date:
         raise ValueError("Invalid date range. Start date must be before end date.")
     
-def get_reservoir_info(reservoir_name_str, selection_all=False):
+@memoize(ttl=requests_config["reservoir"]["get_reservoir_info"]["cache_ttl"], maxsize=32)
+def get_reservoir_info(reservoir_name_str, selection_all=False, filter_conditions=None):
     """
     Fetches detailed information for the specified reservoirs.
 
@@ -420,6 +1347,10 @@ def get_reservoir_info(reservoir_name_str, selection_all=False):
     ----------
     reservoir_name_str : str
         Comma-separated reservoir names, formatted with single quotes (e.g., "'Reservoir1','Reservoir2'").
+    selection_all : bool, optional
+        Fetch all reservoirs instead of the named ones (default is False).
+    filter_conditions : list of str, optional
+        Additional SQL conditions on the layer fields (see `pywris.utils.query.compile_filters`).
 
     Returns:
     -------
@@ -427,11 +1358,16 @@ def get_reservoir_info(reservoir_name_str, selection_all=False):
         JSON response containing detailed information about the reservoirs.
     """
     url = requests_config["reservoir"]["get_reservoir_info"]["url"]
-    if selection_all:
-        payload = deepcopy(requests_config["reservoir"]["get_reservoir_info"]["payload_all_reservoirs"])
+    if selection_all and not filter_conditions:
+        payload = requests_config["reservoir"]["get_reservoir_info"]["payload_all_reservoirs"]
     else:
-        payload = deepcopy(requests_config["reservoir"]["get_reservoir_info"]["payload"])
-    payload = payload.format(reservoir_name_str)
+        # Names and filters are URL-encoded together (names are quoted with `quote_list`)
+        conditions = ["station_type = 'Reservoir'"]
+        if not selection_all:
+            conditions.append(f"station_name IN ({reservoir_name_str})")
+        payload = requests_config["reservoir"]["get_reservoir_info"]["payload_where"].format(
+            encode_where(conditions + list(filter_conditions or []))
+        )
     method = requests_config["reservoir"]["get_reservoir_info"]["method"]
     # Send request and get response
     json_response = get_response(url, payload, method, "get_reservoir_info")
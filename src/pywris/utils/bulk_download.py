@@ -0,0 +1,415 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+import pywris.surface_water.storage.reservoir as py_reservoir
+from pywris.utils.instrumentation import propagate
+from pywris.utils.parquet_store import _require_pyarrow
+
+MANIFEST_FILE = "manifest.json"
+PROGRESS_FILE = "progress.jsonl"
+RESERVOIRS_FILE = "reservoirs.parquet"
+PARTS_DIR = "parts"
+FORMAT_VERSION = 2
+
+
+def _write_atomic(path, write):
+    """
+    Calls `write(tmp_path)` and moves the temporary file to `path`, so that an interrupted write
+    never leaves a truncated file behind.
+    """
+    tmp_path = f"{path}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+def _encode_parameters(parameters):
+    """
+    Returns the job parameters as saved in the manifest. Filter ranges (tuples) are saved as
+    {"range": [min, max]} so that they are not read back as lists of values.
+    """
+    filters = parameters.get('filters')
+    if isinstance(filters, dict):
+        filters = {
+            column: {'range': list(condition)} if isinstance(condition, tuple)
+            else sorted(condition, key=str) if isinstance(condition, (set, frozenset)) else condition
+            for column, condition in filters.items()
+        }
+    return json.loads(json.dumps({**parameters, 'filters': filters}))
+
+def _decode_parameters(parameters):
+    """
+    Inverse of `_encode_parameters`.
+    """
+    filters = parameters.get('filters')
+    if isinstance(filters, dict):
+        filters = {
+            column: tuple(condition['range']) if isinstance(condition, dict) else condition
+            for column, condition in filters.items()
+        }
+    return {**parameters, 'filters': filters}
+
+class BulkDownloadJob:
+    """
+    Resumable download of the time series of many reservoirs into a directory.
+
+    The work is split into units of one state x one batch of reservoirs x one date window. Each
+    unit is saved as a Parquet file in parts/ as soon as it is downloaded, and marked as done in
+    progress.jsonl. If the job fails or is interrupted, calling `run` again (or `BulkDownloadJob.resume`
+    from another process) downloads only the units that are not done yet.
+
+    The directory contains:
+    - manifest.json: parameters of the job, reservoir batches and units, written once when the job is planned
+    - progress.jsonl: append-only log with one line per finished or failed unit (the last line of a unit wins)
+    - reservoirs.parquet: static data of the selected reservoirs (see `build_reservoirs_gdf`)
+    - parts/<unit>.parquet: time series of one unit (see `build_timeseries_store`)
+
+    Parameters:
+    ----------
+    path : str
+        Directory of the job. Created if needed.
+    end_date : str
+        The end date of the data to fetch, in the format 'YYYY-MM-DD'.
+    start_date : str, optional
+        The start date of the data to fetch, in the format 'YYYY-MM-DD' (default is '1991-01-01').
+    timestep : str, optional
+        'Daily', 'Monthly' or 'Yearly'. Default is 'Daily'.
+    selected_states, selected_districts, selected_reservoirs, filters :
+        Reservoir selection, as in `get_reservoirs`. Default is all reservoirs of all states.
+    batch_size : int, optional
+        Maximum number of reservoirs per unit (default is 50).
+    date_window : str or None, optional
+        Length of the date window of a unit as a pandas frequency string. "auto" (default) uses
+        yearly windows for 'Daily' data and a single window otherwise.
+    float_dtype : str, optional
+        dtype of the 'Level' and 'Current Live Storage' columns, 'float64' (default) or 'float32'.
+
+    Raises:
+    ------
+    ValueError
+        If `path` holds a job with different parameters or of another format version.
+
+    Example:
+    --------
+    >>> job = BulkDownloadJob('data/india_daily', end_date='2024-12-31')
+    >>> job.run(max_workers=4)            # safe to interrupt and call again
+    >>> hf = job.to_hydroframe()
+    """
+
+    def __init__(self, path, end_date, start_date='1991-01-01', timestep='Daily', selected_states="all",
+                 selected_districts="all", selected_reservoirs="all", filters=None, batch_size=50,
+                 date_window="auto", float_dtype="float64"):
+        _require_pyarrow()
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer.")
+        self.path = path
+        self.parameters = {
+            'end_date': str(end_date),
+            'start_date': str(start_date),
+            'timestep': timestep,
+            'selected_states': selected_states,
+            'selected_districts': selected_districts,
+            'selected_reservoirs': selected_reservoirs,
+            'filters': filters,
+            'batch_size': batch_size,
+            'date_window': date_window,
+            'float_dtype': float_dtype,
+        }
+        self.manifest = None
+        self._lock = threading.Lock()
+
+        if os.path.exists(self._manifest_path()):
+            with open(self._manifest_path()) as f:
+                manifest = json.load(f)
+            if manifest.get('format_version') != FORMAT_VERSION:
+                raise ValueError(
+                    f"{path} holds a download job of another format version. Choose another directory."
+                )
+            if manifest['parameters'] != _encode_parameters(self.parameters):
+                raise ValueError(
+                    f"{path} holds a download job with different parameters. "
+                    "Use BulkDownloadJob.resume(path) to continue it or choose another directory."
+                )
+            self.manifest = self._load_manifest(manifest)
+
+    @classmethod
+    def resume(cls, path):
+        """
+        Opens the job saved in `path` with its saved parameters.
+        """
+        with open(os.path.join(path, MANIFEST_FILE)) as f:
+            parameters = json.load(f)['parameters']
+        return cls(path, **_decode_parameters(parameters))
+
+    def _manifest_path(self):
+        return os.path.join(self.path, MANIFEST_FILE)
+
+    def _part_path(self, unit_id):
+        return os.path.join(self.path, PARTS_DIR, f"{unit_id}.parquet")
+
+    def _progress_path(self):
+        return os.path.join(self.path, PROGRESS_FILE)
+
+    def _load_manifest(self, manifest):
+        """
+        Returns the manifest in memory: every unit with its state, reservoirs and status, replayed
+        from progress.jsonl. Units share the reservoir list of their batch.
+        """
+        units = {}
+        for unit_id, unit in manifest['units'].items():
+            batch = manifest['batches'][unit['batch']]
+            units[unit_id] = {
+                'state': batch['state'],
+                'reservoirs': batch['reservoirs'],
+                'start_date': unit['start_date'],
+                'end_date': unit['end_date'],
+                'status': 'pending',
+                'rows': 0,
+                'bytes': 0,
+            }
+        if os.path.exists(self._progress_path()):
+            with open(self._progress_path(), 'rb+') as f:
+                content = f.read()
+                # Drop a last line cut off by an interruption, so that new records start on their own line
+                complete = content.rfind(b"\n") + 1
+                if complete < len(content):
+                    f.truncate(complete)
+            for line in content[:complete].splitlines():
+                record = json.loads(line)
+                unit = units.get(record.pop('unit'))
+                if unit is not None:
+                    unit.pop('error', None)
+                    unit.update(record)
+        return {**manifest, 'units': units}
+
+    def _record(self, unit_id, **fields):
+        """
+        Updates a unit and appends the update to progress.jsonl. Called with self._lock held.
+        """
+        unit = self.manifest['units'][unit_id]
+        unit.pop('error', None)
+        unit.update(fields)
+        with open(self._progress_path(), 'a') as f:
+            f.write(json.dumps({'unit': unit_id, **fields}) + "\n")
+
+    def plan(self):
+        """
+        Fetches the metadata of the selected reservoirs and splits the download into units.
+        Does nothing if the job is already planned. Called by `run`.
+
+        Returns:
+        -------
+        dict
+            The manifest of the job.
+        """
+        if self.manifest is not None:
+            return self.manifest
+
+        parameters = self.parameters
+        selection = py_reservoir.select_reservoirs(
+            parameters['end_date'], parameters['start_date'], parameters['timestep'],
+            parameters['selected_states'], parameters['selected_districts'],
+            parameters['selected_reservoirs'], parameters['filters'],
+        )
+        selected_reservoirs, reservoir_info_df = (selection[0], selection[1]) if selection else ([], None)
+        reservoirs_gdf = py_reservoir.build_reservoirs_gdf(reservoir_info_df)
+
+        # Units are grouped by state so that a finished state is complete on disk
+        reservoir_states = reservoirs_gdf.drop_duplicates(subset=['reservoir_name'], keep='last') \
+            .set_index('reservoir_name')['state']
+        names_by_state = {}
+        for name in selected_reservoirs:
+            state = reservoir_states.get(name)
+            names_by_state.setdefault(state if isinstance(state, str) else 'Unknown', []).append(name)
+
+        date_window = parameters['date_window']
+        if date_window == "auto":
+            date_window = "YS" if parameters['timestep'] == "Daily" else None
+        windows = py_reservoir.split_date_range(parameters['start_date'], parameters['end_date'], date_window)
+
+        batch_size = parameters['batch_size']
+        batches = {}
+        units = {}
+        for state in sorted(names_by_state):
+            names = names_by_state[state]
+            for i in range(0, len(names), batch_size):
+                batch_id = f"{len(batches):06d}"
+                batches[batch_id] = {'state': state, 'reservoirs': names[i:i + batch_size]}
+                for window_start, window_end in windows:
+                    units[f"{len(units):06d}"] = {'batch': batch_id, 'start_date': window_start, 'end_date': window_end}
+
+        os.makedirs(os.path.join(self.path, PARTS_DIR), exist_ok=True)
+        _write_atomic(os.path.join(self.path, RESERVOIRS_FILE), reservoirs_gdf.to_parquet)
+        if os.path.exists(self._progress_path()):
+            os.remove(self._progress_path())
+        manifest = {
+            'format_version': FORMAT_VERSION,
+            'parameters': _encode_parameters(parameters),
+            'states': sorted(names_by_state),
+            'batches': batches,
+            'units': units,
+        }
+
+        def write(tmp_path):
+            with open(tmp_path, 'w') as f:
+                json.dump(manifest, f)
+        _write_atomic(self._manifest_path(), write)
+        self.manifest = self._load_manifest(manifest)
+        return self.manifest
+
+    def pending_units(self):
+        """
+        Returns the ids of the units that are not downloaded yet (including failed units, and done
+        units whose part file is missing).
+        """
+        self.plan()
+        with self._lock:
+            return [
+                unit_id for unit_id, unit in self.manifest['units'].items()
+                if unit['status'] != 'done' or (unit['rows'] and not os.path.exists(self._part_path(unit_id)))
+            ]
+
+    def _fetch_unit(self, unit_id, max_retries):
+        unit = self.manifest['units'][unit_id]
+        store = py_reservoir.fetch_reservoir_timeseries(
+            unit['reservoirs'], self.parameters['timestep'], unit['start_date'], unit['end_date'],
+            batch_size=len(unit['reservoirs']), max_workers=1, date_window=None,
+            max_retries=max_retries, float_dtype=self.parameters['float_dtype'],
+        )
+        part_path = self._part_path(unit_id)
+        rows, size = len(store), 0
+        if rows:
+            _write_atomic(part_path, lambda tmp_path: store.to_parquet(tmp_path, index=False))
+            size = os.path.getsize(part_path)
+        elif os.path.exists(part_path):
+            os.remove(part_path)
+        with self._lock:
+            self._record(unit_id, status='done', rows=rows, bytes=size)
+        return unit
+
+    def run(self, max_workers=4, max_retries=2, progress=None):
+        """
+        Downloads all units that are not done yet. Each unit is saved as soon as it is downloaded,
+        so an interrupted or failed run loses at most the units in progress.
+
+        Parameters:
+        ----------
+        max_workers : int, optional
+            Number of units downloaded concurrently (default is 4).
+        max_retries : int, optional
+            Number of times a unit whose response body could not be read is requested again within
+            this run (default is 2), see `fetch_reservoir_timeseries`. Units failing with an HTTP or
+            connection error, already retried per request, are marked as failed at once.
+        progress : callable, optional
+            Called as `progress(unit_id, unit, job)` after each unit is saved.
+
+        Returns:
+        -------
+        dict
+            Status of the job (see `status`).
+
+        Raises:
+        ------
+        RuntimeError
+            If some units still failed after their retries. They are marked as 'failed' in
+            progress.jsonl and downloaded again by the next call to `run`.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be a positive integer.")
+        pending = self.pending_units()
+        failures = {}
+        if pending:
+            executor = ThreadPoolExecutor(max_workers=min(max_workers, len(pending)))
+            try:
+                fetch_unit = propagate(self._fetch_unit)
+                futures = {executor.submit(fetch_unit, unit_id, max_retries): unit_id for unit_id in pending}
+                for future in as_completed(futures):
+                    unit_id = futures[future]
+                    try:
+                        unit = future.result()
+                    except Exception as error:
+                        failures[unit_id] = error
+                        with self._lock:
+                            self._record(unit_id, status='failed', error=str(error))
+                        continue
+                    if progress is not None:
+                        progress(unit_id, unit, self)
+            finally:
+                # On interruption, do not start the remaining units
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        if failures:
+            raise RuntimeError(
+                f"{len(failures)} of {len(self.manifest['units'])} download units failed "
+                f"(first error: {next(iter(failures.values()))}). Call run() again to retry them."
+            )
+        return self.status()
+
+    def status(self):
+        """
+        Returns the number of units per status and the rows and bytes saved so far.
+        """
+        self.plan()
+        with self._lock:
+            units = list(self.manifest['units'].values())
+        counts = {'pending': 0, 'done': 0, 'failed': 0}
+        for unit in units:
+            counts[unit['status']] += 1
+        return {
+            'units': len(units),
+            **counts,
+            'rows': sum(unit['rows'] for unit in units),
+            'bytes': sum(unit['bytes'] for unit in units),
+        }
+
+    def to_hydroframe(self, allow_partial=False):
+        """
+        Builds a HydroFrame from the downloaded units.
+
+        Parameters:
+        ----------
+        allow_partial : bool, optional
+            If True, units that are not downloaded yet are left out. Default is False.
+
+        Raises:
+        ------
+        ValueError
+            If some units are not downloaded and `allow_partial` is False.
+        """
+        import geopandas as gpd
+        from pywris.pywris import HydroFrame
+
+        pending = self.pending_units()
+        if pending and not allow_partial:
+            raise ValueError(
+                f"{len(pending)} download units are not done yet. Call run() first or use allow_partial=True."
+            )
+        parts = [
+            pd.read_parquet(self._part_path(unit_id))
+            for unit_id, unit in self.manifest['units'].items()
+            if unit_id not in pending and unit['rows']
+        ]
+        if parts:
+            timeseries_df = pd.concat(
+                [part.assign(**{'Reservoir Name': part['Reservoir Name'].astype(str)}) for part in parts],
+                ignore_index=True,
+            )
+            store = py_reservoir.build_timeseries_store(timeseries_df, self.parameters['float_dtype'])
+        else:
+            store = None
+
+        reservoirs_gdf = gpd.read_parquet(os.path.join(self.path, RESERVOIRS_FILE))
+        hf = HydroFrame()
+        if self.parameters['selected_states'] == "all":
+            hf.add_state('all')
+        elif self.manifest['states']:
+            hf.add_state([state for state in self.manifest['states'] if state != 'Unknown'])
+        hf.reservoirs_gdf = reservoirs_gdf
+        hf.reservoirs_rawData = store
+        hf.reservoirs = py_reservoir.build_reservoirs_from_gdf(reservoirs_gdf, store)
+        hf.timestep = self.parameters['timestep']
+        hf.start_date = self.parameters['start_date']
+        hf.end_date = self.parameters['end_date']
+        return hf
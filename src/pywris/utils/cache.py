@@ -0,0 +1,165 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Default location of the on-disk response cache
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "pywris", "responses.sqlite")
+
+# Active cache used by pywris.utils.fetch_wris.get_response (None when caching is disabled)
+_cache = None
+
+
+class ResponseCache:
+    """
+    SQLite-backed cache of raw IndiaWRIS response bodies.
+
+    Entries are keyed by request method, url and a hash of the canonical (key-sorted) JSON
+    payload. Expiry is decided at read time from the time-to-live of the endpoint, so the same
+    entry can be fresh for one caller and stale for another. When the total size of the stored
+    bodies exceeds `max_size_mb`, the least recently used entries are evicted.
+
+    Parameters:
+    ----------
+    path : str
+        Path of the SQLite database file. Parent directories are created if needed.
+    max_size_mb : float, optional
+        Maximum total size of the cached response bodies in megabytes (default is 512).
+    offline : bool, optional
+        If True, responses are served only from the cache and no request is sent to IndiaWRIS.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_size_mb=512, offline=False):
+        self.path = path
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.offline = offline
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, url TEXT, body BLOB, size INTEGER, "
+                "created_at REAL, last_access REAL)"
+            )
+
+    @staticmethod
+    def make_key(url, payload, method):
+        """
+        Returns the cache key for a request.
+        """
+        canonical_payload = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        payload_hash = hashlib.sha256(canonical_payload.encode("utf-8")).hexdigest()
+        return f"{method.upper()} {url} {payload_hash}"
+
+    def get(self, key, ttl=None):
+        """
+        Returns the cached response body for `key`, or None if it is missing or older than `ttl` seconds.
+        Stale entries are still served in offline mode.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT body, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            body, created_at = row
+            if ttl is not None and now - created_at > ttl and not self.offline:
+                return None
+            with self._connection:
+                self._connection.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+        return body
+
+    def set(self, key, url, body):
+        """
+        Stores a response body and evicts least recently used entries if the cache is over its size limit.
+        """
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses (key, url, body, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, url, sqlite3.Binary(body), len(body), now, now),
+            )
+            self._evict()
+
+    def _evict(self):
+        total_size = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total_size <= self.max_size_bytes:
+            return
+        rows = self._connection.execute("SELECT key, size FROM responses ORDER BY last_access ASC").fetchall()
+        for key, size in rows:
+            if total_size <= self.max_size_bytes:
+                break
+            self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total_size -= size
+
+    def size(self):
+        """
+        Returns the number of cached responses and their total size in bytes.
+        """
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+
+    def clear(self):
+        """
+        Removes all cached responses.
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses")
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+def enable_cache(path=DEFAULT_CACHE_PATH, max_size_mb=512, offline=False):
+    """
+    Enables the on-disk response cache for all IndiaWRIS requests.
+
+    Parameters:
+    ----------
+    path : str, optional
+        Path of the SQLite database file (default is ~/.cache/pywris/responses.sqlite).
+    max_size_mb : float, optional
+        Maximum total size of the cached responses in megabytes (default is 512).
+    offline : bool, optional
+        If True, requests are served only from the cache; a request that is not cached
+        raises a ConnectionError instead of reaching IndiaWRIS.
+
+    Returns:
+    -------
+    ResponseCache
+        The active cache.
+
+    Example:
+    --------
+    >>> from pywris.utils.cache import enable_cache
+    >>> enable_cache()
+    >>> hf.fetch_reservoir_data(end_date='2024-12-01')   # fetched from IndiaWRIS
+    >>> hf.fetch_reservoir_data(end_date='2024-12-01')   # served from the cache
+    """
+    global _cache
+    disable_cache()
+    _cache = ResponseCache(path, max_size_mb, offline)
+    return _cache
+
+def disable_cache():
+    """
+    Disables the response cache. Cached responses are kept on disk.
+    """
+    global _cache
+    if _cache is not None:
+        _cache.close()
+    _cache = None
+
+def get_cache():
+    """
+    Returns the active ResponseCache, or None if caching is disabled.
+    """
+    return _cache
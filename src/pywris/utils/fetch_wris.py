@@ -1,23 +1,360 @@
 import requests
+import io
 import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ProtocolError, ReadTimeoutError
+from urllib3.util.retry import Retry
+
+from pywris.static_data.request_urls import requests_config, transport_config
+from pywris.utils.cache import get_cache
+from pywris.utils.instrumentation import emit, request_event
+from pywris.utils.rate_limit import AdaptiveLimiter
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+logger = logging.getLogger(__name__)
+
+# One keep-alive session per host (indiawris.gov.in, arc.indiawris.gov.in), shared across threads
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+# Adaptive limiters keyed by (host, endpoint); endpoint is None for the shared host limiter
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+# Responses counted as failures by the limiters (server overloaded or throttling)
+LIMITER_FAILURE_STATUS = frozenset([429, 500, 502, 503, 504])
+
+# Failures while reading or parsing a response body (e.g. a connection dropped mid-body). They happen
+# after `send_request` returned the response, so callers retry them themselves; HTTP errors are not
+# included since `send_request` already retried the transient ones.
+RESPONSE_BODY_ERRORS = (ValueError, requests.exceptions.ChunkedEncodingError, ProtocolError, ReadTimeoutError)
+
+
+def get_session(url):
+    """
+    Returns the shared requests session for the host of the given url.
+
+    The session keeps a pool of keep-alive connections to the host. It does not retry failed
+    requests itself: `get_response` and `iter_response_records` retry them through the limiter
+    (see `send_request`).
+
+    Parameters:
+    ----------
+    url : str
+        Any url on the host.
+
+    Returns:
+    -------
+    requests.Session
+        Session bound to the host of the url.
+    """
+    parts = urlsplit(url)
+    host = f"{parts.scheme}://{parts.netloc}"
+    with _sessions_lock:
+        session = _sessions.get(host)
+        if session is None:
+            adapter = HTTPAdapter(
+                pool_connections=transport_config['pool_connections'],
+                pool_maxsize=transport_config['pool_maxsize'],
+                max_retries=Retry(total=0, raise_on_status=False),
+            )
+            session = requests.Session()
+            session.mount(host, adapter)
+            _sessions[host] = session
+    return session
+
+def close_sessions():
+    """
+    Closes all pooled connections. A new session is created on the next request.
+    """
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+def get_limiter(url, request_desciption=None):
+    """
+    Returns the adaptive limiter for a request.
+
+    Endpoints with a 'rate_limit' entry in `requests_config` get their own limiter; all other
+    endpoints of a host share one limiter with the defaults in `transport_config['rate_limit']`.
+
+    Parameters:
+    ----------
+    url : str
+        Request url.
+    request_desciption : str, optional
+        Name of the endpoint in `requests_config`.
+
+    Returns:
+    -------
+    AdaptiveLimiter
+        Limiter shared by all threads sending requests of this kind.
+    """
+    parts = urlsplit(url)
+    endpoint_limits = get_endpoint_config(request_desciption).get('rate_limit')
+    key = (f"{parts.scheme}://{parts.netloc}", request_desciption if endpoint_limits else None)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = AdaptiveLimiter(**{**transport_config['rate_limit'], **(endpoint_limits or {})})
+            _limiters[key] = limiter
+    return limiter
+
+def reset_limiters():
+    """
+    Discards the state of all limiters, e.g. after changing the 'rate_limit' settings.
+    """
+    with _limiters_lock:
+        _limiters.clear()
+
+def get_endpoint_config(request_desciption):
+    """
+    Returns the `requests_config` entry of an endpoint, or an empty dict if it is unknown.
+    """
+    for group in requests_config.values():
+        if request_desciption in group:
+            return group[request_desciption]
+    return {}
+
+def get_timeout(request_desciption):
+    """
+    Returns the (connect, read) timeout for an endpoint in `requests_config`,
+    falling back to the default timeout in `transport_config`.
+    """
+    return get_endpoint_config(request_desciption).get('timeout', transport_config['timeout'])
+
+def parse_body(body):
+    """
+    Parses a JSON response body, returning None for an empty or invalid body.
+    """
+    try:
+        return json.loads(body)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        logger.warning('Empty Response from the server.')
+        return None
+
+@contextmanager
+def send_request(url, payload, method, request_desciption, event, stream=False):
+    """
+    Sends a request through the limiter of its endpoint and yields the response.
+
+    5xx responses (`transport_config['status_forcelist']`), connection errors and timeouts are
+    retried up to `transport_config['max_retries']` times with exponential backoff. Every attempt
+    takes its own limiter slot and token, and every failed attempt is reported to the limiter, so
+    retries are throttled and reduce the concurrency like any other failure. The slot of the last
+    attempt is held until the block exits (i.e. until a streamed body has been read).
+
+    Parameters:
+    ----------
+    url : str
+        Request url.
+    payload : dict or str
+        JSON payload (POST) or query string (GET).
+    method : str
+        'GET' or 'POST'.
+    request_desciption : str or None
+        Name of the endpoint in `requests_config`.
+    event : dict
+        Request event (see `pywris.utils.instrumentation.add_hook`); 'queued', 'latency', 'status'
+        and 'retries' are updated.
+    stream : bool, optional
+        Stream the response body (default is False).
+    """
+    session = get_session(url)
+    timeout = get_timeout(request_desciption)
+    limiter = get_limiter(url, request_desciption)
+    max_retries = transport_config['max_retries']
+
+    for attempt in range(max_retries + 1):
+        if attempt:
+            event['retries'] += 1
+            time.sleep(transport_config['backoff_factor'] * 2 ** (attempt - 1))
+        waiting = time.perf_counter()
+        with limiter.slot() as outcome:
+            sent = time.perf_counter()
+            event['queued'] += sent - waiting
+            try:
+                if method == 'GET':
+                    response = session.get(url + payload, verify=False, timeout=timeout, stream=stream)
+                else:
+                    response = session.post(url, json=payload, verify=False, timeout=timeout, stream=stream)
+            except (requests.ConnectionError, requests.Timeout):
+                outcome['success'] = False
+                if attempt == max_retries:
+                    raise
+                continue
+            event.update(latency=time.perf_counter() - sent, status=response.status_code)
+            if response.status_code in LIMITER_FAILURE_STATUS:
+                outcome['success'] = False
+            if response.status_code in transport_config['status_forcelist'] and attempt < max_retries:
+                response.close()
+                continue
+
+            with response:
+                yield response
+            return
 
 def get_response(url,payload, method, request_desciption=None):
 
-    if method == 'GET':
-        url_complete = url + payload
-        response = requests.get(url_complete, verify=False)
+    # Every request emits one event (see pywris.utils.instrumentation.add_hook)
+    event = request_event(request_desciption or url, method)
+    started = time.perf_counter()
+    try:
+        # Serve from the response cache if enabled (see pywris.utils.cache.enable_cache)
+        cache = get_cache()
+        if cache is not None:
+            cache_key = cache.make_key(url, payload, method)
+            body = cache.get(cache_key, get_endpoint_config(request_desciption).get('cache_ttl'))
+            if body is not None:
+                event.update(cache='hit', bytes=len(body))
+                return parse_body(body)
+            event['cache'] = 'miss'
+            if cache.offline:
+                raise ConnectionError(f"Offline mode: no cached response for {request_desciption or url}.")
 
-    else:    
-        response = requests.post(url, json=payload, verify=False)
-    
-    # Checking if the request was successful
-    if response.status_code == 200:
-        try:
-            json_response = response.json()
+        with send_request(url, payload, method, request_desciption, event) as response:
+            content = response.content
+
+        # Checking if the request was successful
+        if response.status_code == 200:
+            event['bytes'] = len(content)
+            json_response = parse_body(content)
+            if cache is not None and json_response is not None:
+                cache.set(cache_key, url, content)
             return json_response
-        except json.JSONDecodeError:
-            print('Empty Response from the server.')
-            return None
+        else:
+            event['error'] = f"HTTP {response.status_code}"
+            raise Exception("Error:", response.status_code)
+    except Exception as error:
+        event['error'] = event['error'] or f"{type(error).__name__}: {error}"
+        raise
+    finally:
+        event['duration'] = time.perf_counter() - started - event['queued']
+        emit(event)
+
+class _CountingReader:
+    """
+    Binary file-like wrapper counting the bytes read from a stream, and whether any of them
+    was not whitespace.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.bytes = 0
+        self.blank = True
+
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        self.bytes += len(data)
+        if self.blank and data.strip():
+            self.blank = False
+        return data
+
+def iter_json_items(stream):
+    """
+    Yields the elements of a top-level JSON array read from a binary file-like object.
+
+    With ijson installed the array is parsed incrementally; otherwise the body is read and
+    parsed at once. An empty or `null` body yields nothing.
+
+    Raises:
+    ------
+    ValueError
+        If the body is not valid JSON, e.g. truncated after some elements were yielded.
+    """
+    if ijson is not None:
+        reader = stream if isinstance(stream, _CountingReader) else _CountingReader(stream)
+        try:
+            yield from ijson.items(reader, 'item', use_float=True)
+        except ijson.JSONError as error:
+            if reader.blank:
+                logger.warning('Empty Response from the server.')
+                return
+            raise ValueError(f"Invalid JSON response from the server: {error}") from error
     else:
-        print("Error:", response.status_code)
-        raise Exception("Error:", response.status_code)
\ No newline at end of file
+        body = stream.read()
+        if not body.strip():
+            logger.warning('Empty Response from the server.')
+            return
+        try:
+            json_response = json.loads(body)
+        except (json.JSONDecodeError, UnicodeDecodeError) as error:
+            raise ValueError(f"Invalid JSON response from the server: {error}") from error
+        if json_response:
+            yield from json_response
+
+def iter_response_records(url, payload, method, request_desciption=None):
+    """
+    Sends a request and yields the records of its JSON array response one at a time, without
+    holding the full response body or the full list of records in memory.
+
+    Parameters:
+    ----------
+    url : str
+        Request url.
+    payload : dict or str
+        JSON payload (POST) or query string (GET).
+    method : str
+        'GET' or 'POST'.
+    request_desciption : str, optional
+        Name of the endpoint in `requests_config`.
+
+    Yields:
+    ------
+    dict
+        One record of the response.
+    """
+    # The event is emitted once the body has been read (its duration includes parsing)
+    event = request_event(request_desciption or url, method)
+    started = time.perf_counter()
+    try:
+        cache = get_cache()
+        if cache is not None:
+            cache_key = cache.make_key(url, payload, method)
+            body = cache.get(cache_key, get_endpoint_config(request_desciption).get('cache_ttl'))
+            if body is not None:
+                event.update(cache='hit', bytes=len(body))
+                yield from iter_json_items(io.BytesIO(body))
+                return
+            event['cache'] = 'miss'
+            if cache.offline:
+                raise ConnectionError(f"Offline mode: no cached response for {request_desciption or url}.")
+
+        # The limiter slot is held until the body has been read, since the connection is busy until then
+        with send_request(url, payload, method, request_desciption, event, stream=True) as response:
+            if response.status_code != 200:
+                event['error'] = f"HTTP {response.status_code}"
+                raise Exception("Error:", response.status_code)
+
+            if cache is not None:
+                # The body is kept for the cache, but records are still parsed incrementally
+                body = response.content
+                event['bytes'] = len(body)
+                yield from iter_json_items(io.BytesIO(body))
+                # Only cached once the whole body parsed; a truncated body raised above
+                if body.strip():
+                    cache.set(cache_key, url, body)
+            else:
+                response.raw.decode_content = True
+                reader = _CountingReader(response.raw)
+                try:
+                    yield from iter_json_items(reader)
+                finally:
+                    event['bytes'] = reader.bytes
+    except Exception as error:
+        event['error'] = event['error'] or f"{type(error).__name__}: {error}"
+        raise
+    finally:
+        event['duration'] = time.perf_counter() - started - event['queued']
+        emit(event)
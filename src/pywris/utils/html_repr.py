@@ -0,0 +1,21 @@
+# Maximum number of entries listed in a nested section of a Jupyter HTML representation.
+# Longer sections are cut with a note, so the size of the HTML does not grow with the data.
+REPR_MAX_ITEMS = 25
+
+
+def more_items_html(shown, total, hint=""):
+    """
+    Returns a note on the entries left out of a capped HTML list, or an empty string if none were left out.
+
+    Parameters:
+    ----------
+    shown : int
+        Number of entries rendered.
+    total : int
+        Number of entries in the section.
+    hint : str, optional
+        How to access the remaining entries (e.g. "Use HydroFrame.reservoirs to access all reservoirs.").
+    """
+    if total <= shown:
+        return ""
+    return f"<p style='margin-left: 20px; margin-top: 0;'><i>... {total - shown} more not shown. {hint}</i></p>"
@@ -0,0 +1,155 @@
+import threading
+from array import array
+
+import numpy as np
+import pandas as pd
+
+
+class RecordBuffer:
+    """
+    Typed, append-only column buffers for JSON records.
+
+    Records are consumed in chunks and appended column by column: numeric columns to float64
+    buffers and all other columns to int32 category codes with one shared list of distinct values.
+    Repeated strings (reservoir names, dates, districts) are therefore stored once, and memory
+    stays close to the size of the final DataFrame instead of the list of dicts it is built from.
+
+    Parameters:
+    ----------
+    numeric_columns : iterable of str, optional
+        Columns stored as float64. Values that cannot be converted are stored as NaN.
+
+    Example:
+    --------
+    >>> buffer = RecordBuffer(numeric_columns=['Level'])
+    >>> buffer.extend([{'Reservoir Name': 'Idukki', 'Level': '712.5'}])
+    >>> buffer.to_frame()
+    """
+
+    def __init__(self, numeric_columns=()):
+        self.numeric_columns = set(numeric_columns)
+        self._columns = {}
+        self._categories = {}
+        self._length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._length
+
+    def _add_column(self, column):
+        if column in self.numeric_columns:
+            buffer = array('d', np.full(self._length, np.nan).tobytes())
+        else:
+            buffer = array('i', np.full(self._length, -1, dtype=np.int32).tobytes())
+            self._categories[column] = {}
+        self._columns[column] = buffer
+
+    def _append_chunk(self, chunk):
+        for record in chunk:
+            for column in record:
+                if column not in self._columns:
+                    self._add_column(column)
+
+        for column, buffer in self._columns.items():
+            values = [record.get(column) for record in chunk]
+            if column in self.numeric_columns:
+                numeric_values = pd.to_numeric(pd.Series(values, dtype=object), errors='coerce')
+                buffer.frombytes(numeric_values.to_numpy(dtype='float64', na_value=np.nan).tobytes())
+            else:
+                lookup = self._categories[column]
+                codes = [
+                    -1 if value is None or value != value else lookup.setdefault(
+                        value if isinstance(value, (str, int, float, bool)) else str(value), len(lookup)
+                    )
+                    for value in values
+                ]
+                buffer.frombytes(np.asarray(codes, dtype=np.int32).tobytes())
+        self._length += len(chunk)
+
+    def extend(self, records, chunk_size=10000):
+        """
+        Appends records from any iterable of dicts (a list or a streaming generator).
+
+        Parameters:
+        ----------
+        records : iterable of dict
+            Flat JSON records.
+        chunk_size : int, optional
+            Number of records converted at a time (default is 10000).
+        """
+        chunk = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) == chunk_size:
+                with self._lock:
+                    self._append_chunk(chunk)
+                chunk = []
+        if chunk:
+            with self._lock:
+                self._append_chunk(chunk)
+
+    def merge(self, other):
+        """
+        Appends all rows of another RecordBuffer, re-coding its categories.
+        """
+        with self._lock:
+            for column in other._columns:
+                if column not in self._columns:
+                    self._add_column(column)
+            for column, buffer in self._columns.items():
+                if column not in other._columns:
+                    missing = np.full(other._length, np.nan) if column in self.numeric_columns \
+                        else np.full(other._length, -1, dtype=np.int32)
+                    buffer.frombytes(missing.tobytes())
+                elif column in self.numeric_columns:
+                    buffer.frombytes(other._columns[column].tobytes())
+                else:
+                    lookup = self._categories[column]
+                    # Map codes of the other buffer to codes of this buffer; -1 (missing) stays -1
+                    recode = np.asarray(
+                        [lookup.setdefault(value, len(lookup)) for value in other._categories[column]] + [-1],
+                        dtype=np.int32,
+                    )
+                    other_codes = np.frombuffer(other._columns[column], dtype=np.int32)
+                    buffer.frombytes(recode[other_codes].tobytes())
+            self._length += other._length
+
+    def to_frame(self):
+        """
+        Returns the buffered records as a DataFrame with float64 and categorical columns.
+        """
+        with self._lock:
+            data = {}
+            for column, buffer in self._columns.items():
+                if column in self.numeric_columns:
+                    data[column] = np.frombuffer(buffer, dtype='float64').copy()
+                else:
+                    codes = np.frombuffer(buffer, dtype=np.int32).copy()
+                    data[column] = pd.Categorical.from_codes(codes, categories=list(self._categories[column]))
+            return pd.DataFrame(data, index=pd.RangeIndex(self._length))
+
+
+def memory_usage_report(df):
+    """
+    Reports the memory used by each column of a DataFrame.
+
+    Parameters:
+    ----------
+    df : pandas.DataFrame
+        Input data.
+
+    Returns:
+    -------
+    pandas.DataFrame
+        One row per column (plus 'Index' and 'Total') with the dtype, the memory in bytes
+        (including the strings of object columns) and the memory in megabytes.
+    """
+    memory = df.memory_usage(index=True, deep=True)
+    report = pd.DataFrame({
+        'dtype': [str(df.index.dtype)] + [str(df[col].dtype) for col in df.columns],
+        'bytes': memory.to_numpy(),
+    }, index=['Index'] + list(df.columns))
+    report.loc['Total'] = ['', int(memory.sum())]
+    report['bytes'] = report['bytes'].astype('int64')
+    report['MB'] = (report['bytes'] / 1024 ** 2).round(3)
+    return report
@@ -0,0 +1,316 @@
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+logger = logging.getLogger("pywris")
+
+# Upper bounds (seconds) of the request latency histogram exported in Prometheus format
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+_hooks = []
+_hooks_lock = threading.Lock()
+_logging_hook = None
+
+# Collectors of the requests sent in the current context (see `collect` and `propagate`)
+_collectors = contextvars.ContextVar('pywris_request_collectors', default=())
+
+
+def add_hook(hook):
+    """
+    Registers a function called with every request event.
+
+    Events are dictionaries with the keys:
+    - 'endpoint': name of the endpoint in `requests_config` (the `request_desciption`), or the url
+    - 'method': 'GET' or 'POST'
+    - 'status': HTTP status code, or None for a cache hit or a connection error
+    - 'queued': seconds spent waiting for the rate limiter (see `pywris.utils.rate_limit`)
+    - 'latency': seconds from sending the request to receiving the response headers (network and server)
+    - 'duration': seconds from sending the request to reading and parsing the body (adds transfer and parsing)
+    - 'bytes': size of the response body
+    - 'retries': number of retries of 5xx responses and connection errors (see `fetch_wris.send_request`)
+    - 'cache': 'hit', 'miss', or None if the response cache is disabled
+    - 'error': error message, or None
+    - 'timestamp': time the request started (seconds since the epoch)
+
+    Hooks run in the thread that sent the request and must be thread-safe. Exceptions raised by a
+    hook are logged and ignored.
+
+    Parameters:
+    ----------
+    hook : callable
+        Function taking one event.
+
+    Example:
+    --------
+    >>> slow = []
+    >>> add_hook(lambda event: event['duration'] > 10 and slow.append(event))
+    """
+    with _hooks_lock:
+        if hook not in _hooks:
+            _hooks.append(hook)
+
+def remove_hook(hook):
+    """
+    Unregisters a function registered with `add_hook`. Does nothing if it is not registered.
+    """
+    with _hooks_lock:
+        if hook in _hooks:
+            _hooks.remove(hook)
+
+def emit(event):
+    """
+    Passes a request event to the default metrics collector, the collectors of the current
+    context (see `collect`) and all registered hooks.
+    """
+    metrics.record(event)
+    for collector in _collectors.get():
+        collector.record(event)
+    with _hooks_lock:
+        hooks = list(_hooks)
+    for hook in hooks:
+        try:
+            hook(event)
+        except Exception:
+            logger.exception("Request hook %r failed.", hook)
+
+def request_event(endpoint, method, cache=None):
+    """
+    Returns a new request event (see `add_hook`) for a request starting now.
+    """
+    return {
+        'endpoint': endpoint,
+        'method': method,
+        'status': None,
+        'queued': 0.0,
+        'latency': 0.0,
+        'duration': 0.0,
+        'bytes': 0,
+        'retries': 0,
+        'cache': cache,
+        'error': None,
+        'timestamp': time.time(),
+    }
+
+def log_event(event, level=logging.DEBUG):
+    """
+    Logs a request event on the 'pywris' logger. Errors are logged at WARNING level.
+    """
+    logger.log(
+        logging.WARNING if event['error'] else level,
+        "%s %s status=%s latency=%.3fs duration=%.3fs bytes=%d retries=%d cache=%s%s",
+        event['method'], event['endpoint'], event['status'], event['latency'], event['duration'],
+        event['bytes'], event['retries'], event['cache'], f" error={event['error']}" if event['error'] else "",
+    )
+
+def enable_logging(level=logging.INFO):
+    """
+    Logs every request event on the 'pywris' logger at `level` (errors at WARNING level).
+    Configure the logger (e.g. `logging.basicConfig`) to choose where the records go.
+    """
+    global _logging_hook
+    disable_logging()
+    _logging_hook = lambda event: log_event(event, level)  # noqa: E731
+    add_hook(_logging_hook)
+
+def disable_logging():
+    """
+    Stops the request logging started by `enable_logging`.
+    """
+    global _logging_hook
+    if _logging_hook is not None:
+        remove_hook(_logging_hook)
+        _logging_hook = None
+
+
+def _escape_label(value):
+    """
+    Escapes a Prometheus label value (backslashes, double quotes and newlines).
+    """
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class RequestMetrics:
+    """
+    Thread-safe per-endpoint totals of request events: counts, errors, cache hits, retries, bytes
+    and a latency histogram.
+
+    `pywris.utils.instrumentation.metrics` collects every request of the process; HydroFrames
+    keep their own collector for the requests they send (see `HydroFrame.request_summary`).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Discards all recorded events.
+        """
+        with self._lock:
+            self.endpoints = {}
+
+    def record(self, event):
+        """
+        Adds one request event to the totals.
+        """
+        with self._lock:
+            totals = self.endpoints.get(event['endpoint'])
+            if totals is None:
+                totals = self.endpoints[event['endpoint']] = {
+                    'requests': 0, 'errors': 0, 'cache_hits': 0, 'retries': 0, 'bytes': 0,
+                    'queued': 0.0, 'latency': 0.0, 'duration': 0.0, 'max_duration': 0.0,
+                    'status': {}, 'buckets': [0] * len(LATENCY_BUCKETS),
+                }
+            totals['requests'] += 1
+            totals['errors'] += event['error'] is not None
+            totals['cache_hits'] += event['cache'] == 'hit'
+            totals['retries'] += event['retries']
+            totals['bytes'] += event['bytes']
+            totals['queued'] += event['queued']
+            totals['latency'] += event['latency']
+            totals['duration'] += event['duration']
+            totals['max_duration'] = max(totals['max_duration'], event['duration'])
+            status = 'cache' if event['cache'] == 'hit' else str(event['status'] or 'error')
+            totals['status'][status] = totals['status'].get(status, 0) + 1
+            # The latency histogram counts requests sent to the server only
+            if event['cache'] != 'hit':
+                for i, bound in enumerate(LATENCY_BUCKETS):
+                    if event['latency'] <= bound:
+                        totals['buckets'][i] += 1
+                        break
+
+    def total(self, key):
+        """
+        Returns the total of one counter over all endpoints, e.g. 'requests' or 'bytes'.
+        """
+        with self._lock:
+            return sum(totals[key] for totals in self.endpoints.values())
+
+    def summary(self):
+        """
+        Returns one row per endpoint with the number of requests, errors, cache hits and retries,
+        the megabytes received, and in seconds: the mean time queued by the rate limiter, the mean
+        latency (network and server) and the mean, maximum and total duration (including transfer
+        and parsing).
+
+        Returns:
+        -------
+        pandas.DataFrame
+            Indexed by endpoint name.
+        """
+        with self._lock:
+            rows = {
+                endpoint: {
+                    'Requests': totals['requests'],
+                    'Errors': totals['errors'],
+                    'Cache Hits': totals['cache_hits'],
+                    'Retries': totals['retries'],
+                    'MB': totals['bytes'] / 1e6,
+                    'Mean Queued (s)': totals['queued'] / totals['requests'],
+                    'Mean Latency (s)': totals['latency'] / totals['requests'],
+                    'Mean Duration (s)': totals['duration'] / totals['requests'],
+                    'Max Duration (s)': totals['max_duration'],
+                    'Total Duration (s)': totals['duration'],
+                }
+                for endpoint, totals in self.endpoints.items()
+            }
+        summary = pd.DataFrame.from_dict(rows, orient='index', columns=[
+            'Requests', 'Errors', 'Cache Hits', 'Retries', 'MB', 'Mean Queued (s)', 'Mean Latency (s)',
+            'Mean Duration (s)', 'Max Duration (s)', 'Total Duration (s)',
+        ])
+        summary.index.name = 'Endpoint'
+        return summary
+
+    def to_prometheus(self, prefix="pywris"):
+        """
+        Returns the metrics in the Prometheus text exposition format, e.g. to be written to a file
+        read by the node_exporter textfile collector.
+
+        Parameters:
+        ----------
+        prefix : str, optional
+            Prefix of the metric names (default is 'pywris').
+        """
+        with self._lock:
+            endpoints = {endpoint: dict(totals, status=dict(totals['status']), buckets=list(totals['buckets']))
+                         for endpoint, totals in self.endpoints.items()}
+
+        def labels(**values):
+            return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in values.items()) + "}"
+
+        lines = [
+            f"# HELP {prefix}_requests_total Requests sent to IndiaWRIS, by endpoint and status.",
+            f"# TYPE {prefix}_requests_total counter",
+        ]
+        for endpoint, totals in endpoints.items():
+            for status, count in sorted(totals['status'].items()):
+                lines.append(f"{prefix}_requests_total{labels(endpoint=endpoint, status=status)} {count}")
+        for name, key, help_text in (
+            ('request_errors_total', 'errors', 'Failed requests.'),
+            ('request_retries_total', 'retries', 'Retries of 5xx responses and connection errors.'),
+            ('cache_hits_total', 'cache_hits', 'Requests served from the response cache.'),
+            ('response_bytes_total', 'bytes', 'Bytes of response bodies received.'),
+            ('request_queued_seconds_total', 'queued', 'Time spent waiting for the rate limiter.'),
+            ('request_duration_seconds_total', 'duration', 'Time spent on requests, including transfer and parsing.'),
+        ):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for endpoint, totals in endpoints.items():
+                lines.append(f"{prefix}_{name}{labels(endpoint=endpoint)} {totals[key]}")
+
+        name = f"{prefix}_request_latency_seconds"
+        lines.append(f"# HELP {name} Time until the response headers were received (requests sent to the server).")
+        lines.append(f"# TYPE {name} histogram")
+        for endpoint, totals in endpoints.items():
+            sent = totals['requests'] - totals['cache_hits']
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, totals['buckets']):
+                cumulative += count
+                lines.append(f"{name}_bucket{labels(endpoint=endpoint, le=bound)} {cumulative}")
+            lines.append(f"{name}_bucket{labels(endpoint=endpoint, le='+Inf')} {sent}")
+            lines.append(f"{name}_sum{labels(endpoint=endpoint)} {totals['latency']}")
+            lines.append(f"{name}_count{labels(endpoint=endpoint)} {sent}")
+        return "\n".join(lines) + "\n"
+
+
+# Collector of all requests sent by this process
+metrics = RequestMetrics()
+
+@contextmanager
+def collect(collector):
+    """
+    Records the request events emitted while the block runs in `collector`.
+
+    Only requests sent from this thread, or from worker threads running functions wrapped with
+    `propagate`, are recorded, so concurrent blocks (e.g. two HydroFrames fetching at the same time)
+    each collect their own requests.
+    """
+    token = _collectors.set(_collectors.get() + (collector,))
+    try:
+        yield collector
+    finally:
+        _collectors.reset(token)
+
+def propagate(function):
+    """
+    Returns `function` wrapped to record its requests in the collectors of the calling context
+    (see `collect`). Wrap functions submitted to worker threads with it.
+
+    Example:
+    --------
+    >>> with ThreadPoolExecutor() as executor:
+    ...     executor.map(propagate(fetch_unit), units)
+    """
+    collectors = _collectors.get()
+
+    def run(*args, **kwargs):
+        token = _collectors.set(collectors)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _collectors.reset(token)
+    return run
@@ -0,0 +1,101 @@
+import copy
+import functools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+# Memoized functions, so that all in-process caches can be cleared at once (see clear_memoized)
+_memoized_functions = []
+
+
+def _freeze(value):
+    """
+    Returns a hashable version of an argument (lists, sets and dicts become tuples).
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(_freeze(item) for item in value))
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    return value
+
+def memoize(ttl, maxsize=128):
+    """
+    Decorator caching the results of a metadata function in memory, with a time-to-live and
+    least-recently-used eviction.
+
+    Concurrent calls with the same arguments share one in-flight call: the first caller runs the
+    function and the others wait for its result instead of sending the same request again.
+    Exceptions are passed to all waiting callers and are not cached. Callers receive a shallow
+    copy of the cached result, so adding or removing items does not change the cache.
+
+    Parameters:
+    ----------
+    ttl : float
+        Number of seconds a result is reused.
+    maxsize : int, optional
+        Maximum number of cached results (default is 128).
+
+    Example:
+    --------
+    >>> @memoize(ttl=3600)
+    ... def get_valid_date_range():
+    ...     return get_response(...)
+    >>> get_valid_date_range.cache_clear()
+    """
+    def decorator(function):
+        cache = OrderedDict()
+        in_flight = {}
+        lock = threading.Lock()
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            key = (_freeze(args), _freeze(kwargs))
+            with lock:
+                entry = cache.get(key)
+                if entry is not None and time.monotonic() - entry[0] < ttl:
+                    cache.move_to_end(key)
+                    return copy.copy(entry[1])
+                future = in_flight.get(key)
+                leader = future is None
+                if leader:
+                    future = Future()
+                    in_flight[key] = future
+
+            if not leader:
+                return copy.copy(future.result())
+
+            try:
+                result = function(*args, **kwargs)
+            except BaseException as error:
+                with lock:
+                    in_flight.pop(key, None)
+                future.set_exception(error)
+                raise
+            with lock:
+                in_flight.pop(key, None)
+                cache[key] = (time.monotonic(), result)
+                cache.move_to_end(key)
+                while len(cache) > maxsize:
+                    cache.popitem(last=False)
+            future.set_result(result)
+            return copy.copy(result)
+
+        def cache_clear():
+            with lock:
+                cache.clear()
+
+        wrapper.cache_clear = cache_clear
+        wrapper.cache_size = lambda: len(cache)
+        _memoized_functions.append(wrapper)
+        return wrapper
+    return decorator
+
+def clear_memoized():
+    """
+    Clears the in-process caches of all memoized metadata functions.
+    """
+    for function in _memoized_functions:
+        function.cache_clear()
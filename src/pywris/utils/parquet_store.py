@@ -0,0 +1,148 @@
+import json
+import os
+import shutil
+
+import pandas as pd
+
+import pywris.surface_water.storage.reservoir as py_reservoir
+
+MANIFEST_FILE = "manifest.json"
+RESERVOIRS_FILE = "reservoirs.parquet"
+TIMESERIES_DIR = "timeseries"
+FORMAT_VERSION = 1
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError(
+            "Saving and loading HydroFrames requires pyarrow. Install it with `pip install pyarrow`."
+        )
+
+def save_hydroframe(hf, path):
+    """
+    Saves the reservoir data of a HydroFrame to a directory.
+
+    The directory contains:
+    - reservoirs.parquet: `reservoirs_gdf` as GeoParquet
+    - timeseries/: `reservoirs_rawData` as Parquet, partitioned by state and year
+      (timeseries/state=<state>/year=<year>/...)
+    - manifest.json: states, timestep, date range and size of the saved data
+
+    Parameters:
+    ----------
+    hf : HydroFrame
+        HydroFrame with fetched reservoir data.
+    path : str
+        Output directory. Existing saved data in it is replaced.
+    """
+    _require_pyarrow()
+    if hf.reservoirs_gdf is None or hf.reservoirs_rawData is None:
+        raise ValueError("No reservoir data to save. Please call HydroFrame.fetch_reservoir_data() first.")
+
+    os.makedirs(path, exist_ok=True)
+    hf.reservoirs_gdf.to_parquet(os.path.join(path, RESERVOIRS_FILE))
+
+    # Partition keys: state of each reservoir from the static data, year from the date
+    reservoir_states = hf.reservoirs_gdf.drop_duplicates(subset=['reservoir_name'], keep='last').set_index('reservoir_name')['state']
+    store = hf.reservoirs_rawData
+    timeseries_df = store.assign(
+        state=store['Reservoir Name'].astype(str).map(reservoir_states).fillna('Unknown').astype(str),
+        year=store['Date'].dt.year,
+    )
+    timeseries_path = os.path.join(path, TIMESERIES_DIR)
+    if os.path.isdir(timeseries_path):
+        shutil.rmtree(timeseries_path)
+    timeseries_df.to_parquet(timeseries_path, partition_cols=['state', 'year'], index=False)
+
+    manifest = {
+        'format_version': FORMAT_VERSION,
+        'states': list(hf.states.keys()),
+        'selection_allState': hf.selection_allState,
+        'timestep': hf.timestep,
+        'start_date': hf.start_date,
+        'end_date': hf.end_date,
+        'data_start': str(store['Date'].min().date()) if len(store) else None,
+        'data_end': str(store['Date'].max().date()) if len(store) else None,
+        'reservoir_count': int(len(hf.reservoirs)),
+        'row_count': int(len(store)),
+        'partitions': {
+            'state': sorted(timeseries_df['state'].unique().tolist()),
+            'year': sorted(int(year) for year in timeseries_df['year'].unique()),
+        },
+    }
+    with open(os.path.join(path, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+def read_manifest(path):
+    """
+    Returns the manifest of a saved HydroFrame.
+    """
+    with open(os.path.join(path, MANIFEST_FILE)) as f:
+        return json.load(f)
+
+def load_hydroframe(path, states=None, start_date=None, end_date=None, columns=None):
+    """
+    Loads a HydroFrame saved with `save_hydroframe`, reading only the requested partitions and columns.
+
+    Parameters:
+    ----------
+    path : str
+        Directory written by `save_hydroframe`.
+    states : list of str, optional
+        States to load. Only the partitions of these states are read. Default loads all saved states.
+    start_date : str, optional
+        First date to load in 'YYYY-MM-DD' format. Year partitions before it are skipped.
+    end_date : str, optional
+        Last date to load in 'YYYY-MM-DD' format. Year partitions after it are skipped.
+    columns : list of str, optional
+        Time series columns to load in addition to 'Reservoir Name' and 'Date'
+        (e.g. ['Current Live Storage']). Default loads all columns.
+
+    Returns:
+    -------
+    HydroFrame
+        HydroFrame with `reservoirs`, `reservoirs_gdf` and `reservoirs_rawData` restored.
+    """
+    _require_pyarrow()
+    import geopandas as gpd
+    from pywris.pywris import HydroFrame
+
+    manifest = read_manifest(path)
+
+    filters = []
+    if states is not None:
+        filters.append(('state', 'in', list(states)))
+    if start_date is not None:
+        filters.append(('year', '>=', pd.to_datetime(start_date).year))
+        filters.append(('Date', '>=', pd.to_datetime(start_date)))
+    if end_date is not None:
+        filters.append(('year', '<=', pd.to_datetime(end_date).year))
+        filters.append(('Date', '<=', pd.to_datetime(end_date)))
+    if columns is not None:
+        columns = ['Reservoir Name', 'Date'] + [col for col in columns if col not in ('Reservoir Name', 'Date')]
+
+    timeseries_df = pd.read_parquet(
+        os.path.join(path, TIMESERIES_DIR), columns=columns, filters=filters or None
+    )
+    timeseries_df = timeseries_df.drop(columns=['state', 'year'], errors='ignore')
+    store = py_reservoir.build_timeseries_store(timeseries_df)
+
+    reservoirs_gdf = gpd.read_parquet(os.path.join(path, RESERVOIRS_FILE))
+    if states is not None:
+        reservoirs_gdf = reservoirs_gdf[reservoirs_gdf['state'].isin(states)]
+
+    hf = HydroFrame()
+    saved_states = manifest['states']
+    if states is None and manifest['selection_allState']:
+        hf.add_state('all')
+    else:
+        hf.add_state([state for state in saved_states if states is None or state in states])
+    hf.reservoirs_gdf = reservoirs_gdf
+    hf.reservoirs_rawData = store
+    hf.reservoirs = py_reservoir.build_reservoirs_from_gdf(reservoirs_gdf, store)
+    hf.timestep = manifest['timestep']
+    hf.start_date = start_date or manifest['start_date']
+    hf.end_date = end_date or manifest['end_date']
+    return hf
@@ -0,0 +1,108 @@
+import numbers
+from urllib.parse import quote
+
+# Columns of HydroFrame.reservoirs_gdf that can be filtered on the server, and the
+# matching fields of the IndiaWRIS Reservoir_Points layer (see get_reservoir_info)
+FILTER_FIELDS = {
+    'state': 'state_name',
+    'state_code': 'state_code',
+    'district': 'district_name',
+    'block_name': 'block_name',
+    'basin': 'basin_name',
+    'basin_code': 'basin_code',
+    'sub_basin': 'sub_basin_name',
+    'agency': 'agency_name',
+    'dam_code': 'dam_code',
+    'frl': 'frl',
+    'live_cap_frl': 'lsc_frl',
+}
+
+
+def quote_literal(value):
+    """
+    Returns `value` as an SQL literal: strings in single quotes with embedded quotes doubled,
+    numbers as they are.
+
+    Parameters:
+    ----------
+    value : str, int or float
+        Value to quote.
+
+    Raises:
+    ------
+    ValueError
+        If `value` is not a string or a finite number.
+    """
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    if isinstance(value, numbers.Real) and not isinstance(value, bool) and value == value \
+            and value not in (float('inf'), float('-inf')):
+        return repr(int(value)) if isinstance(value, numbers.Integral) else repr(float(value))
+    raise ValueError(f"Cannot use {value!r} in a filter. Values must be strings or numbers.")
+
+def quote_list(values):
+    """
+    Returns a comma-separated list of SQL literals (e.g. "'Idukki','Kakki'").
+    """
+    return ",".join(quote_literal(value) for value in values)
+
+def compile_filters(filters):
+    """
+    Compiles a declarative filter spec into SQL conditions on the Reservoir_Points layer.
+
+    Parameters:
+    ----------
+    filters : dict
+        Mapping of `reservoirs_gdf` column (see FILTER_FIELDS) to a condition, like `HydroFrame.filter`:
+        - a list or set of values: the column is one of the values
+        - a tuple (min, max): the column is in the inclusive range; None leaves a side open
+        - a single value: the column equals the value
+
+    Returns:
+    -------
+    list of str
+        One condition per filter, to be joined with AND.
+
+    Raises:
+    ------
+    ValueError
+        If a column cannot be filtered on the server or a condition is empty or invalid.
+
+    Example:
+    --------
+    >>> compile_filters({'basin': ['Godavari'], 'live_cap_frl': (100, None)})
+    ["basin_name IN ('Godavari')", 'lsc_frl >= 100']
+    """
+    if not isinstance(filters, dict):
+        raise ValueError("Filters must be a dictionary of column names and conditions.")
+
+    conditions = []
+    for column, condition in filters.items():
+        if column not in FILTER_FIELDS:
+            raise ValueError(
+                f"{column} cannot be filtered on the server. Valid columns are {', '.join(FILTER_FIELDS)}."
+            )
+        field = FILTER_FIELDS[column]
+        if isinstance(condition, tuple):
+            if len(condition) != 2 or all(bound is None for bound in condition):
+                raise ValueError(f"Range for {column} must be a (min, max) tuple with at least one bound.")
+            bounds = []
+            if condition[0] is not None:
+                bounds.append(f"{field} >= {quote_literal(condition[0])}")
+            if condition[1] is not None:
+                bounds.append(f"{field} <= {quote_literal(condition[1])}")
+            conditions.append(" AND ".join(bounds))
+        elif isinstance(condition, (list, set, frozenset)):
+            if not condition:
+                raise ValueError(f"Values for {column} must not be empty.")
+            values = sorted(condition, key=str) if isinstance(condition, (set, frozenset)) else condition
+            conditions.append(f"{field} IN ({quote_list(values)})")
+        else:
+            conditions.append(f"{field} = {quote_literal(condition)}")
+    return conditions
+
+def encode_where(conditions):
+    """
+    Joins SQL conditions with AND and URL-encodes them for an ArcGIS `where=` query parameter.
+    """
+    return quote(" AND ".join(conditions), safe="")
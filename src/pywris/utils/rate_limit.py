@@ -0,0 +1,173 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting the rate at which requests are started.
+
+    Parameters:
+    ----------
+    rate : float
+        Tokens added per second (sustained requests per second).
+    burst : float, optional
+        Maximum number of tokens, i.e. requests that can start at once after an idle period (default is 1).
+    """
+
+    def __init__(self, rate, burst=1):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1.")
+        self.rate = float(rate)
+        self.capacity = float(burst)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Takes one token, waiting until one is available.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class AdaptiveLimiter:
+    """
+    Rate limiter and adaptive concurrency controller for one IndiaWRIS host or endpoint.
+
+    Requests start at most `rate` times per second (token bucket) and at most `concurrency` requests
+    run at a time. The concurrency limit follows additive-increase/multiplicative-decrease (AIMD):
+    each successful request raises it by 1/limit (about +1 per round of requests), while a failure
+    (5xx, 429, connection error) or a latency spike (latency above `latency_spike` times the moving
+    average) multiplies it by `decrease_factor`, at most once per average request duration.
+
+    Parameters:
+    ----------
+    rate : float or None, optional
+        Maximum requests started per second. None disables the token bucket (default).
+    burst : int, optional
+        Size of the token bucket (default is 1).
+    initial_concurrency : int, optional
+        Concurrency limit before any feedback (default is 4).
+    min_concurrency, max_concurrency : int, optional
+        Bounds of the concurrency limit (defaults are 1 and 16).
+    decrease_factor : float, optional
+        Multiplier applied to the concurrency limit on a failure (default is 0.5).
+    latency_spike : float, optional
+        A request slower than this multiple of the average latency counts as congestion (default is 3).
+    """
+
+    def __init__(self, rate=None, burst=1, initial_concurrency=4, min_concurrency=1, max_concurrency=16,
+                 decrease_factor=0.5, latency_spike=3.0):
+        if not 1 <= min_concurrency <= max_concurrency or not 0 < decrease_factor < 1:
+            raise ValueError("Invalid limiter settings: 1 <= min_concurrency <= max_concurrency and 0 < decrease_factor < 1 are required.")
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.limit = float(min(max(initial_concurrency, min_concurrency), max_concurrency))
+        self.decrease_factor = decrease_factor
+        self.latency_spike = latency_spike
+        self.latency = None
+        self.in_flight = 0
+        self.successes = 0
+        self.failures = 0
+        self._last_decrease = float('-inf')
+        self._condition = threading.Condition()
+
+    @property
+    def concurrency(self):
+        """
+        Current maximum number of concurrent requests.
+        """
+        return max(self.min_concurrency, int(self.limit))
+
+    def acquire(self):
+        """
+        Waits for a free concurrency slot and a token. Returns the start time to pass to `release`.
+        """
+        with self._condition:
+            while self.in_flight >= self.concurrency:
+                self._condition.wait()
+            self.in_flight += 1
+        if self.bucket is not None:
+            self.bucket.acquire()
+        return time.monotonic()
+
+    def release(self, started, success=True):
+        """
+        Frees the slot taken by `acquire` and adapts the concurrency limit to the outcome of the request.
+
+        Parameters:
+        ----------
+        started : float
+            Value returned by `acquire`.
+        success : bool, optional
+            False if the request failed with a server error or a connection error.
+        """
+        now = time.monotonic()
+        latency = now - started
+        with self._condition:
+            self.in_flight -= 1
+            spike = self.latency is not None and latency > self.latency_spike * self.latency
+            if not success or spike:
+                # One decrease per round of requests, so a burst of errors does not collapse the limit
+                if now - self._last_decrease >= (self.latency or 0.0):
+                    self.limit = max(float(self.min_concurrency), self.limit * self.decrease_factor)
+                    self._last_decrease = now
+            else:
+                self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+            if success:
+                self.successes += 1
+                self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+            else:
+                self.failures += 1
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self):
+        """
+        Context manager around one request. The yielded dict's 'success' can be set to report the
+        outcome of the response; an exception raised in the block before it is set is reported as
+        a failure. Closing a generator early (GeneratorExit) is not a failure.
+
+        Example:
+        --------
+        >>> with limiter.slot() as outcome:
+        ...     response = session.get(url)
+        ...     outcome['success'] = response.status_code < 500
+        """
+        started = self.acquire()
+        outcome = {'success': None}
+        try:
+            yield outcome
+        except GeneratorExit:
+            raise
+        except BaseException:
+            if outcome['success'] is None:
+                outcome['success'] = False
+            raise
+        finally:
+            self.release(started, outcome['success'] is not False)
+
+    def stats(self):
+        """
+        Returns the current state of the limiter.
+        """
+        with self._condition:
+            return {
+                'concurrency': self.concurrency,
+                'in_flight': self.in_flight,
+                'rate': self.bucket.rate if self.bucket is not None else None,
+                'latency': self.latency,
+                'successes': self.successes,
+                'failures': self.failures,
+            }
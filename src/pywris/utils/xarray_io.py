@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+
+import pywris.surface_water.storage.reservoir as py_reservoir
+
+# Default chunk sizes of the exported cube (about 10 years of daily data for 500 reservoirs per chunk)
+DEFAULT_CHUNKS = {'reservoir': 500, 'time': 3653}
+
+# Static attributes of reservoirs_gdf exported as coordinates along the reservoir dimension
+COORDINATE_COLUMNS = {
+    'latitude': 'lat',
+    'longitude': 'long',
+    'state': 'state',
+    'district': 'district',
+    'basin': 'basin',
+    'sub_basin': 'sub_basin',
+    'agency': 'agency',
+    'frl': 'frl',
+    'live_cap_frl': 'live_cap_frl',
+}
+
+VARIABLE_ATTRS = {
+    'Level': {'long_name': 'Reservoir level', 'units': 'm'},
+    'Current Live Storage': {'long_name': 'Current live storage', 'units': 'MCM'},
+}
+
+
+def _require_xarray():
+    try:
+        import xarray
+    except ImportError:
+        raise ImportError("Exporting to xarray requires xarray. Install it with `pip install xarray`.")
+    return xarray
+
+def _require_zarr():
+    try:
+        import zarr
+    except ImportError:
+        raise ImportError("Writing to Zarr requires zarr. Install it with `pip install zarr`.")
+    return zarr
+
+def _dask_available():
+    try:
+        import dask.array  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def hydroframe_to_xarray(hf, chunks='auto'):
+    """
+    Converts the reservoir time series of a HydroFrame into a reservoir x time xarray.Dataset.
+
+    Parameters:
+    ----------
+    hf : HydroFrame
+        HydroFrame with fetched reservoir data.
+    chunks : dict, 'auto' or None, optional
+        Dask chunk sizes, e.g. {'reservoir': 500, 'time': 3653}. 'auto' (default) uses DEFAULT_CHUNKS
+        when dask is installed and returns in-memory arrays otherwise. None never chunks.
+
+    Returns:
+    -------
+    xarray.Dataset
+        Variables 'Level' and 'Current Live Storage' with dimensions (reservoir, time), and the static
+        reservoir attributes (lat, long, state, basin, frl, live_cap_frl, ...) as coordinates.
+    """
+    xr = _require_xarray()
+    if hf.reservoirs_rawData is None:
+        raise ValueError("No reservoir data loaded. Please call HydroFrame.fetch_reservoir_data() first.")
+
+    reservoir_index, dates, matrices = py_reservoir.timeseries_matrix(hf.reservoirs_rawData)
+    coords = {'reservoir': np.asarray(reservoir_index, dtype=object), 'time': dates}
+
+    if hf.reservoirs_gdf is not None:
+        reservoir_info = hf.reservoirs_gdf.drop_duplicates(subset=['reservoir_name'], keep='last')
+        reservoir_info = pd.DataFrame(reservoir_info).set_index('reservoir_name').reindex(reservoir_index)
+        for column, name in COORDINATE_COLUMNS.items():
+            if column not in reservoir_info.columns:
+                continue
+            values = reservoir_info[column]
+            numeric_values = pd.to_numeric(values, errors='coerce')
+            if numeric_values.notna().sum() == values.notna().sum():
+                coords[name] = ('reservoir', numeric_values.to_numpy(dtype='float64'))
+            else:
+                coords[name] = ('reservoir', values.fillna('').astype(str).to_numpy(dtype=object))
+
+    data_vars = {
+        column: (('reservoir', 'time'), matrix, VARIABLE_ATTRS.get(column, {}))
+        for column, matrix in matrices.items()
+    }
+    ds = xr.Dataset(data_vars, coords=coords, attrs={
+        'source': 'India WRIS (https://indiawris.gov.in)',
+        'timestep': hf.timestep or '',
+        'start_date': str(hf.start_date or ''),
+        'end_date': str(hf.end_date or ''),
+    })
+
+    if chunks == 'auto':
+        chunks = DEFAULT_CHUNKS if _dask_available() else None
+    if chunks is not None:
+        # Only the (reservoir, time) variables are chunked; the coordinates are small and stay in memory
+        for column in matrices:
+            ds[column] = ds[column].chunk(chunks)
+    return ds
+
+def hydroframe_to_zarr(hf, path, chunks='auto', mode='w'):
+    """
+    Writes the reservoir x time cube of a HydroFrame (see `hydroframe_to_xarray`) to a Zarr store.
+
+    Parameters:
+    ----------
+    hf : HydroFrame
+        HydroFrame with fetched reservoir data.
+    path : str
+        Path of the Zarr store.
+    chunks : dict, 'auto' or None, optional
+        Chunk sizes of the written arrays (default is DEFAULT_CHUNKS when dask is installed).
+    mode : str, optional
+        Zarr write mode, 'w' (default) overwrites an existing store.
+
+    Returns:
+    -------
+    xarray.Dataset
+        The exported dataset.
+    """
+    _require_zarr()
+    ds = hydroframe_to_xarray(hf, chunks)
+    ds.to_zarr(path, mode=mode)
+    return ds
@@ -1,8 +1,21 @@
+import math
+import warnings
+
+import numpy as np
 from plotly.subplots import make_subplots
 # from pywris.surface_water.storage.reservoir import Reservoir
 import plotly.graph_objects as go
 import pandas as pd
 
+# Traces with more points than this are downsampled before plotting (about the width of a
+# wide screen in pixels, twice over, which keeps the downsampled line visually identical)
+DEFAULT_MAX_POINTS = 4000
+
+# Limits of a figure with many reservoirs: points over all traces (split evenly between them), and
+# traces drawn when no reservoir names are given (the reservoirs with the largest live capacity)
+DEFAULT_MAX_TOTAL_POINTS = 200_000
+DEFAULT_MAX_TRACES = 100
+
 
 def plot_data(input_object, **args):
     """
@@ -13,12 +26,123 @@ def plot_data(input_object, **args):
     - **args: Additional arguments for customization (e.g., columns to plot, title, etc.)
     """
     from pywris.surface_water.storage.reservoir import Reservoir
+    from pywris.pywris import HydroFrame
     if isinstance(input_object, Reservoir):
         return plot_reservoir(input_object, **args)
+    elif isinstance(input_object, HydroFrame):
+        return plot_reservoirs(input_object.reservoirs, **args)
+    else:
+        raise TypeError(f"Unsupported object type: {type(input_object)}. Only 'Reservoir' and 'HydroFrame' classes are supported.")
+
+def lttb(x, y, n_out):
+    """
+    Downsamples a series with the Largest-Triangle-Three-Buckets algorithm.
+
+    The first and last points are kept; every bucket in between contributes the point forming the
+    largest triangle with the point kept in the previous bucket and the mean of the next bucket,
+    which preserves peaks, troughs and the overall shape of the line.
+
+    Parameters:
+    - x (numpy.ndarray): Sorted x values as numbers (e.g. int64 nanoseconds for dates).
+    - y (numpy.ndarray): y values without NaN.
+    - n_out (int): Number of points to keep (at least 3).
+
+    Returns:
+    - numpy.ndarray: Indices of the kept points.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    # Bucket edges over the points between the first and the last one
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(n_out - 2):
+        start, stop = edges[bucket], max(edges[bucket + 1], edges[bucket] + 1)
+        next_stop = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        next_x = x[stop:next_stop].mean() if next_stop > stop else x[-1]
+        next_y = y[stop:next_stop].mean() if next_stop > stop else y[-1]
+        # Twice the triangle areas (the factor does not change the argmax)
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        kept[bucket + 1] = previous
+    return kept
+
+def minmax_buckets(y, n_out):
+    """
+    Downsamples a series by keeping the minimum and maximum of each of n_out / 2 equal buckets.
+
+    Parameters:
+    - y (numpy.ndarray): y values without NaN.
+    - n_out (int): Number of points to keep (at least 2).
+
+    Returns:
+    - numpy.ndarray: Sorted indices of the kept points.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 2:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype='float64')
+    starts = np.linspace(0, n, n_out // 2, endpoint=False).astype(np.int64)
+    # argmin/argmax of each bucket, computed for all buckets at once on a padded matrix
+    width = int(np.max(np.diff(np.append(starts, n))))
+    positions = starts[:, None] + np.arange(width)[None, :]
+    valid = positions < np.append(starts[1:], n)[:, None]
+    positions = np.minimum(positions, n - 1)
+    values = y[positions]
+    mins = np.where(valid, values, np.inf).argmin(axis=1)
+    maxs = np.where(valid, values, -np.inf).argmax(axis=1)
+    rows = np.arange(len(starts))
+    return np.unique(np.concatenate([positions[rows, mins], positions[rows, maxs], [0, n - 1]]))
+
+def downsample(dates, values, max_points=DEFAULT_MAX_POINTS, method='lttb'):
+    """
+    Reduces a time series to at most `max_points` points for plotting. Missing values are dropped.
+
+    Parameters:
+    - dates (array-like): Dates of the series, sorted.
+    - values (array-like): Values of the series.
+    - max_points (int or None): Maximum number of points. None keeps all points.
+    - method (str or None): 'lttb' (Largest-Triangle-Three-Buckets), 'minmax' (minimum and maximum
+      per bucket, keeps every extreme) or None (no downsampling).
+
+    Returns:
+    - tuple: (dates, values) as numpy arrays.
+    """
+    if method not in ('lttb', 'minmax', None):
+        raise ValueError("Downsampling method must be 'lttb', 'minmax' or None.")
+
+    dates = pd.to_datetime(np.asarray(dates)).to_numpy()
+    values = np.asarray(values, dtype='float64')
+    present = ~np.isnan(values)
+    dates, values = dates[present], values[present]
+    if method is None or max_points is None or len(values) <= max_points:
+        return dates, values
+
+    if method == 'lttb':
+        kept = lttb(dates.astype('datetime64[ns]').astype(np.int64), values, max_points)
     else:
-        raise TypeError(f"Unsupported object type: {type(input_object)}. Only 'Reservoir' class is supported.")
-    
-def plot_reservoir(self, columns=None, title=None):
+        kept = minmax_buckets(values, max_points)
+    return dates[kept], values[kept]
+
+def timeseries_trace(dates, values, name, max_points=DEFAULT_MAX_POINTS, method='lttb', **trace_args):
+    """
+    Returns a WebGL line trace of a downsampled time series (markers are only drawn for short series).
+    """
+    n_points = int(np.count_nonzero(~np.isnan(np.asarray(values, dtype='float64'))))
+    x, y = downsample(dates, values, max_points, method)
+    mode = 'lines+markers' if max_points is None or n_points <= max_points else 'lines'
+    return go.Scattergl(x=x, y=y, mode=mode, name=name, **trace_args)
+
+def plot_reservoir(self, columns=None, title=None, max_points=DEFAULT_MAX_POINTS, downsample_method='lttb'):
         """
         Create an interactive Plotly time series plot for reservoir data.
 
@@ -26,15 +150,19 @@ def plot_reservoir(self, columns=None, title=None):
         - columns (list): List of columns to plot (Currently ['Level', 'Current Live Storage']).
                           If None, it will plot all numeric columns except 'Date'.
         - title (str): Custom title for the plot, if provied.
+        - max_points (int): Series longer than this are downsampled for display (None plots every point).
+        - downsample_method (str): 'lttb' (default) or 'minmax', see `downsample`.
         """
         if self.data is None or self.data.empty:
             raise ValueError(f"No data available for reservoir {self.reservoir_name} to plot.")
-        
-        if not pd.api.types.is_datetime64_any_dtype(self.data['Date']):
-            self.data['Date'] = pd.to_datetime(self.data['Date'])
+
+        # Dates are converted for the plot only; the data may be a view into the HydroFrame store
+        dates = self.data['Date']
+        if not pd.api.types.is_datetime64_any_dtype(dates):
+            dates = pd.to_datetime(dates)
         else:
             pass
-        
+
         if columns is None:
             columns = [col for col in self.data.columns if col != 'Date' and pd.api.types.is_numeric_dtype(self.data[col])]
         else:
@@ -44,15 +172,10 @@ def plot_reservoir(self, columns=None, title=None):
             else:
                 pass
 
-        fig = make_subplots(specs=[[{"secondary_y": True}]]) 
+        fig = make_subplots(specs=[[{"secondary_y": True}]])
         for column in columns:
             fig.add_trace(
-                go.Scatter(
-                    x=self.data['Date'],
-                    y=self.data[column],
-                    mode='lines+markers',
-                    name=column
-                ),
+                timeseries_trace(dates, self.data[column], column, max_points, downsample_method),
                 secondary_y=False
             )
         fig.update_layout(
@@ -66,3 +189,98 @@ def plot_reservoir(self, columns=None, title=None):
         fig.update_xaxes(showgrid=True)
         fig.update_yaxes(showgrid=True)
         fig.show()
+
+def plot_reservoirs(reservoirs, reservoir_names=None, column='Current Live Storage', layout='overlay',
+                    facet_cols=3, title=None, max_points=DEFAULT_MAX_POINTS, downsample_method='lttb',
+                    max_total_points=DEFAULT_MAX_TOTAL_POINTS, max_traces=DEFAULT_MAX_TRACES):
+    """
+    Create one interactive Plotly figure with the time series of many reservoirs.
+
+    Parameters:
+    - reservoirs (dict): Reservoir objects keyed by reservoir name (e.g. HydroFrame.reservoirs).
+    - reservoir_names (list): Reservoirs to plot. If None, all reservoirs with data are plotted, up to `max_traces`.
+    - column (str): Column to plot (default is 'Current Live Storage').
+    - layout (str): 'overlay' draws all reservoirs on one set of axes, 'facets' draws small multiples
+                    (one subplot per reservoir) with a shared date axis.
+    - facet_cols (int): Number of subplot columns for 'facets' (default is 3).
+    - title (str): Custom title for the plot, if provided.
+    - max_points (int): Points per reservoir above which its series is downsampled (None plots every point).
+    - downsample_method (str): 'lttb' (default) or 'minmax', see `downsample`.
+    - max_total_points (int): Points of the whole figure, split evenly between the reservoirs, so that
+                              the figure stays interactive however many reservoirs are plotted
+                              (None only applies `max_points`).
+    - max_traces (int): Without `reservoir_names`, only the reservoirs with the largest live capacity
+                        are plotted above this number, with a warning (None plots all of them).
+    """
+    if layout not in ('overlay', 'facets'):
+        raise ValueError("Layout must be 'overlay' or 'facets'.")
+
+    if reservoir_names is not None:
+        missing_reservoirs = [name for name in reservoir_names if name not in reservoirs]
+        if missing_reservoirs:
+            raise KeyError(f"The following reservoirs are not available: {missing_reservoirs}")
+        names = list(reservoir_names)
+    else:
+        # Lazily fetched reservoirs that are not loaded yet may have data
+        names = [
+            name for name, res in reservoirs.items()
+            if (getattr(res, '_loader', None) is not None and getattr(res, '_data', None) is None)
+            or (res.data is not None and not res.data.empty)
+        ]
+        if max_traces is not None and len(names) > max_traces:
+            def capacity(name):
+                value = pd.to_numeric(reservoirs[name].live_cap_frl, errors='coerce')
+                return value if pd.notna(value) else -math.inf
+            names = sorted(names, key=capacity, reverse=True)[:max_traces]
+            warnings.warn(
+                f"Plotting the {max_traces} reservoirs with the largest live capacity. "
+                "Pass reservoir_names, or max_traces=None to plot all of them."
+            )
+
+    # Download the time series of lazily fetched reservoirs in batched requests up front
+    # (see TimeseriesLoader), instead of one request per reservoir as each one is plotted
+    loader = next((reservoirs[name]._loader for name in names if getattr(reservoirs[name], '_loader', None) is not None), None)
+    if loader is not None:
+        loader.load(names)
+
+    series = []
+    for name in names:
+        data = reservoirs[name].data
+        if data is None or data.empty:
+            continue
+        if column not in data.columns:
+            raise KeyError(f"The column {column} is missing from the data of reservoir {name}.")
+        series.append((name, data['Date'], data[column]))
+    if not series:
+        raise ValueError("No data available for the selected reservoirs to plot.")
+    if max_total_points is not None:
+        trace_points = max(3, max_total_points // len(series))
+        max_points = trace_points if max_points is None else min(max_points, trace_points)
+
+    if layout == 'overlay':
+        fig = go.Figure()
+        for name, dates, values in series:
+            fig.add_trace(timeseries_trace(dates, values, name, max_points, downsample_method))
+        fig.update_layout(xaxis_title="Date", yaxis_title=column, hovermode="x unified")
+    else:
+        facet_cols = max(1, min(facet_cols, len(series)))
+        facet_rows = math.ceil(len(series) / facet_cols)
+        fig = make_subplots(
+            rows=facet_rows, cols=facet_cols, shared_xaxes=True,
+            subplot_titles=[name for name, _, _ in series],
+            vertical_spacing=min(0.08, 0.3 / facet_rows),
+        )
+        for i, (name, dates, values) in enumerate(series):
+            fig.add_trace(
+                timeseries_trace(dates, values, name, max_points, downsample_method, showlegend=False),
+                row=i // facet_cols + 1, col=i % facet_cols + 1,
+            )
+        fig.update_layout(height=max(400, 250 * facet_rows))
+
+    fig.update_layout(
+        title=title or f"{column} of {len(series)} reservoirs",
+        template="plotly_white",
+    )
+    fig.update_xaxes(showgrid=True)
+    fig.update_yaxes(showgrid=True)
+    fig.show()
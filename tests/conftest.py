@@ -0,0 +1,24 @@
+import pytest
+from unittest.mock import patch
+from pywris.static_data.request_urls import transport_config
+from pywris.utils.fetch_wris import reset_limiters
+from pywris.utils.instrumentation import metrics
+from pywris.utils.memoize import clear_memoized
+
+
+@pytest.fixture(autouse=True)
+def clear_memoized_metadata():
+    """Clear the in-process metadata caches, limiters and request metrics so that every test starts from a clean state."""
+    clear_memoized()
+    reset_limiters()
+    metrics.reset()
+    yield
+    clear_memoized()
+    reset_limiters()
+    metrics.reset()
+
+@pytest.fixture(autouse=True)
+def no_retry_backoff():
+    """Retry failed requests without waiting, so that tests of server errors run quickly."""
+    with patch.dict(transport_config, {'backoff_factor': 0}):
+        yield
@@ -141,6 +141,27 @@ def test_repr_html_with_districts(mock_state, mock_districts):
     assert "<p>Details for Kollam</p>" in html_output
 
 
+#Edge case test for _repr_html_ method of State class - districts not fetched are not requested
+def test_repr_html_without_districts(mock_state_id):
+    with patch("pywris.static_data.state_ids.state_id", mock_state_id), \
+         patch("pywris.geo_units.components.get_districts") as mock_get_districts:
+        html_output = State("Kerala")._repr_html_()
+
+    mock_get_districts.assert_not_called()
+    assert "not loaded" in html_output
+
+#Edge case test for _repr_html_ method of State class - long district lists are capped
+def test_repr_html_districts_capped():
+    from pywris.utils.html_repr import REPR_MAX_ITEMS
+    state = State("Kerala")
+    state.districts = {f"District {i}": District("Kerala", f"District {i}") for i in range(REPR_MAX_ITEMS + 5)}
+
+    html_output = state._repr_html_()
+    assert f"Districts ({REPR_MAX_ITEMS + 5})" in html_output
+    assert f"District {REPR_MAX_ITEMS - 1}<" in html_output
+    assert f"District {REPR_MAX_ITEMS}<" not in html_output
+    assert "5 more not shown" in html_output
+
 #Smoke test for Distrcit class and _repr_html_
 def test_district_initialization():
     """Test the initialization of the District class."""
@@ -0,0 +1,91 @@
+import pytest
+import geopandas as gpd
+import pandas as pd
+from shapely.geometry import Point, box
+
+import pywris.surface_water.storage.reservoir as py_reservoir
+from pywris.geo_units.spatial import ReservoirIndex, haversine_km
+from pywris.pywris import HydroFrame
+
+###################################### Mocks and Patches ##########################################################
+
+@pytest.fixture
+def reservoirs_gdf():
+    """Fixture with four reservoirs roughly 1 degree apart along the equator and one without coordinates."""
+    return gpd.GeoDataFrame({
+        'reservoir_name': ['Res A', 'Res B', 'Res C', 'Res D', 'Res E'],
+        'state': ['Kerala', 'Kerala', 'Karnataka', 'Karnataka', 'Kerala'],
+        'basin': ['West', 'West', 'East', 'East', 'West'],
+        'geometry': [Point(0, 0), Point(1, 0), Point(2, 0), Point(3, 0), None],
+    }, crs="EPSG:4326")
+
+@pytest.fixture
+def hydroframe(reservoirs_gdf):
+    """Fixture with a HydroFrame built from the reservoir GeoDataFrame and a small time series store."""
+    store = py_reservoir.build_timeseries_store(pd.DataFrame({
+        'Reservoir Name': ['Res A', 'Res B', 'Res C', 'Res D'],
+        'Date': ['2024-01-01'] * 4,
+        'Level': [1.0, 2.0, 3.0, 4.0],
+    }))
+    hf = HydroFrame()
+    hf.reservoirs_gdf = reservoirs_gdf
+    hf.reservoirs_rawData = store
+    hf.reservoirs = {name: py_reservoir.Reservoir(name, state) for name, state in zip(reservoirs_gdf['reservoir_name'], reservoirs_gdf['state'])}
+    return hf
+
+##################################################################################################################
+
+#One-shot test for haversine_km - one degree along the equator
+def test_haversine_km():
+    assert haversine_km(0, 0, [1], [0])[0] == pytest.approx(111.19, abs=0.01)
+
+#One-shot test for ReservoirIndex - missing geometries are skipped
+def test_reservoir_index_skips_missing(reservoirs_gdf):
+    index = ReservoirIndex(reservoirs_gdf)
+    assert len(index) == 4
+    assert list(index.within(box(0.5, -1, 2.5, 1))) == [1, 2]
+
+#One-shot test for HydroFrame.within
+def test_within(hydroframe):
+    filtered = hydroframe.within(box(-0.5, -1, 1.5, 1))
+    assert list(filtered.reservoirs_gdf['reservoir_name']) == ['Res A', 'Res B']
+    assert set(filtered.reservoirs) == {'Res A', 'Res B'}
+    assert list(filtered.reservoirs_rawData['Level']) == [1.0, 2.0]
+
+#One-shot test for HydroFrame.within with a GeoDataFrame in another CRS
+def test_within_geodataframe(hydroframe):
+    area = gpd.GeoDataFrame(geometry=[box(1.5, -1, 3.5, 1)], crs="EPSG:4326").to_crs("EPSG:3857")
+    filtered = hydroframe.within(area)
+    assert list(filtered.reservoirs_gdf['reservoir_name']) == ['Res C', 'Res D']
+
+#One-shot test for HydroFrame.within_distance - sorted by distance
+def test_within_distance(hydroframe):
+    filtered = hydroframe.within_distance((2.1, 0), 150)
+    assert list(filtered.reservoirs_gdf['reservoir_name']) == ['Res C', 'Res D', 'Res B']
+    assert filtered.reservoirs_gdf['distance_km'].is_monotonic_increasing
+    assert (filtered.reservoirs_gdf['distance_km'] <= 150).all()
+
+#One-shot test for HydroFrame.nearest - the search radius grows until k reservoirs are found
+def test_nearest(hydroframe):
+    filtered = hydroframe.nearest(Point(-5, 0), k=2)
+    assert list(filtered.reservoirs_gdf['reservoir_name']) == ['Res A', 'Res B']
+    assert filtered.reservoirs_gdf['distance_km'].iloc[0] == pytest.approx(5 * 111.19, abs=1)
+
+#Edge case test for HydroFrame.nearest - invalid k
+def test_nearest_invalid_k(hydroframe):
+    with pytest.raises(ValueError):
+        hydroframe.nearest((0, 0), k=0)
+
+#One-shot test for the spatial index cache - built once, rebuilt when reservoirs_gdf changes
+def test_spatial_index_reused(hydroframe, reservoirs_gdf):
+    index = hydroframe._get_spatial_index()
+    hydroframe.nearest((0, 0))
+    assert hydroframe._get_spatial_index() is index
+    hydroframe.reservoirs_gdf = reservoirs_gdf.iloc[:2]
+    assert hydroframe._get_spatial_index() is not index
+    assert len(hydroframe._get_spatial_index()) == 2
+
+#Edge case test for spatial queries without data
+def test_spatial_query_without_data():
+    with pytest.raises(ValueError):
+        HydroFrame().nearest((0, 0))
@@ -0,0 +1,81 @@
+import pytest
+import numpy as np
+import pandas as pd
+from pywris.surface_water.storage.reservoir import build_timeseries_store
+from pywris.surface_water.storage.climatology import day_of_year_slots, sorted_percentiles, compute_climatology
+
+################# MOCKS and PATCHES ############################
+
+@pytest.fixture
+def store():
+    """Fixture with four years of daily storage for two reservoirs."""
+    dates = pd.date_range("2000-01-01", "2003-12-31", freq="D")
+    return build_timeseries_store(pd.DataFrame({
+        "Reservoir Name": ["Res A"] * len(dates) + ["Res B"] * len(dates),
+        "Date": list(dates) * 2,
+        "Current Live Storage": np.concatenate([dates.year - 1999.0, np.full(len(dates), 5.0)]),
+    }))
+
+################# UNIT TESTS ############################
+#Smoke test for day_of_year_slots - calendar days share a slot in leap and non-leap years
+def test_day_of_year_slots():
+    slots = day_of_year_slots(pd.to_datetime(["2000-02-29", "2000-03-01", "2001-03-01", "2001-12-31", "2000-12-31"]))
+    assert list(slots) == [59, 60, 60, 365, 365]
+
+#One-shot test for sorted_percentiles - same result as numpy.nanpercentile
+def test_sorted_percentiles():
+    cube = np.random.default_rng(0).normal(size=(3, 10, 5))
+    cube[cube > 1] = np.nan
+    cube[1, :, 2] = np.nan
+    counts = np.sum(~np.isnan(cube), axis=1)
+
+    result = sorted_percentiles(cube, counts, (10, 50, 90))
+    for r in range(3):
+        for d in range(5):
+            if counts[r, d]:
+                assert np.allclose(result[:, r, d], np.nanpercentile(cube[r, :, d], (10, 50, 90)))
+            else:
+                assert np.isnan(result[:, r, d]).all()
+
+#One-shot test for compute_climatology - climatology, anomalies and ranks aligned to the store
+def test_compute_climatology(store):
+    climatology, anomalies = compute_climatology(store, baseline=(2000, 2002), percentiles=(50,))
+
+    # Res A stores 1, 2, 3 in the baseline years and 4 in 2003
+    jan_1 = climatology.loc[("Res A", 1)]
+    assert jan_1["Mean"] == 2.0 and jan_1["P50"] == 2.0 and jan_1["Years"] == 3
+    # Feb 29 only occurs in 2000
+    assert climatology.loc[("Res A", 60), "Years"] == 1
+
+    assert anomalies.index.equals(store.index)
+    res_a = anomalies[anomalies["Reservoir Name"] == "Res A"].set_index("Date")
+    assert res_a.loc["2003-01-01", "Anomaly"] == 2.0
+    assert res_a.loc["2003-01-01", "Percentile Rank"] == 100.0
+    assert res_a.loc["2001-01-01", "Percentile Rank"] == 50.0
+    # Ties count half: constant storage ranks at the median
+    assert (anomalies.loc[anomalies["Reservoir Name"] == "Res B", "Percentile Rank"] == 50.0).all()
+
+#One-shot test for compute_climatology - chunks and worker processes give the same result
+def test_compute_climatology_chunks(store):
+    climatology, anomalies = compute_climatology(store)
+    chunked_climatology, chunked_anomalies = compute_climatology(store, chunk_size=1, n_jobs=2)
+    pd.testing.assert_frame_equal(climatology, chunked_climatology)
+    pd.testing.assert_frame_equal(anomalies, chunked_anomalies)
+
+#Edge case test for compute_climatology - invalid column, baseline and chunk size
+def test_compute_climatology_invalid(store):
+    with pytest.raises(KeyError):
+        compute_climatology(store, column="Inflow")
+    with pytest.raises(ValueError):
+        compute_climatology(store, baseline=(2003, 2000))
+    with pytest.raises(ValueError):
+        compute_climatology(store, chunk_size=0)
+
+#Edge case test for compute_climatology - no valid date gives an empty climatology
+def test_compute_climatology_no_valid_dates(store):
+    store = store.assign(Date=pd.NaT)
+    climatology, anomalies = compute_climatology(store)
+
+    assert (climatology["Years"] == 0).all() and climatology["Mean"].isna().all()
+    assert anomalies.index.equals(store.index)
+    assert anomalies[["Anomaly", "Percentile Rank"]].isna().all().all()
@@ -2,7 +2,9 @@ import pytest
 from unittest.mock import patch, MagicMock
 from pywris.geo_units.components import State, District
 from pywris.surface_water.storage.reservoir import Reservoir
-from pywris.surface_water.storage.reservoir import get_reservoirs, get_reservoir_data_valid_date_range
+from pywris.surface_water.storage.reservoir import get_reservoirs, get_reservoir_data_valid_date_range, fetch_reservoir_timeseries, split_date_range, last_unique_values
+from pywris.surface_water.storage.reservoir import build_timeseries_store, reservoir_row_ranges, attach_timeseries, parse_dates, TimeseriesLoader, resample_timeseries, aggregate_storage
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 
 pytestmark = pytest.mark.filterwarnings("ignore::Warning")
@@ -173,4 +175,337 @@ def test_get_reservoirs_invalid_input(patches):
             selected_states=["Kerala"],
             selected_districts=["Idukki"],
             selected_reservoirs="Idukki Reservoir"
-        )
\ No newline at end of file
+        )
+
+#One-shot test for get_reservoirs() with filters - only reservoirs returned by the filtered info query are downloaded
+def test_get_reservoirs_with_filters(patches):
+    with patch("pywris.surface_water.storage.reservoir.get_reservoir_info") as mock_info, \
+         patch("pywris.surface_water.storage.reservoir.fetch_reservoir_timeseries") as mock_fetch:
+        mock_info.return_value = {"features": [{"attributes.station_name": "Idukki Reservoir"}]}
+        mock_fetch.return_value = pd.DataFrame()
+        get_reservoirs(end_date="2024-12-01", selected_states=["Kerala"], filters={"basin": ["Periyar Basin"]})
+
+    assert mock_info.call_args.args[2] == ["basin_name IN ('Periyar Basin')"]
+    assert mock_fetch.call_args.args[0] == ["Idukki Reservoir"]
+
+#Edge case test for get_reservoirs() with filters - no matching reservoirs and invalid filters
+def test_get_reservoirs_with_filters_no_match(patches):
+    with patch("pywris.surface_water.storage.reservoir.get_reservoir_info", return_value={"features": []}), \
+         patch("pywris.surface_water.storage.reservoir.fetch_reservoir_timeseries") as mock_fetch:
+        assert get_reservoirs(end_date="2024-12-01", selected_states=["Kerala"], filters={"agency": "None"}) is None
+    mock_fetch.assert_not_called()
+
+    with pytest.raises(ValueError):
+        get_reservoirs(end_date="2024-12-01", selected_states=["Kerala"], filters={"geometry": ["x"]})
+
+#One-shot test for get_reservoir_info - names are URL-encoded with or without filters
+def test_get_reservoir_info_encodes_names():
+    from pywris.surface_water.storage.reservoir import get_reservoir_info
+    from pywris.utils.query import quote_list
+    names = quote_list(["D'Souza Dam", "Kakki & Anathode"])
+    with patch("pywris.surface_water.storage.reservoir.get_response", return_value={"features": []}) as mock_response:
+        get_reservoir_info.__wrapped__(names)
+        get_reservoir_info.__wrapped__(names, False, ["basin_name IN ('Pamba')"])
+
+    plain, filtered = (call.args[1] for call in mock_response.call_args_list)
+    assert "D%27%27Souza%20Dam" in plain and "Kakki%20%26%20Anathode" in plain
+    assert filtered.startswith(plain) and filtered.endswith("basin_name%20IN%20%28%27Pamba%27%29")
+
+#One-shot test for get_reservoirs() in lazy mode - time series are fetched on first access only
+def test_get_reservoirs_lazy(patches):
+    def mock_fetch(names, timestep, start_date, end_date, **kwargs):
+        return build_timeseries_store(pd.DataFrame({
+            "Reservoir Name": names, "Date": [start_date] * len(names), "Level": [1.0] * len(names),
+        }))
+
+    with patch("pywris.surface_water.storage.reservoir.fetch_reservoir_timeseries", side_effect=mock_fetch) as mock_fetch_timeseries:
+        reservoirs, reservoir_gdf, store = get_reservoirs(end_date="2024-12-01", selected_states=["Kerala"], lazy=True)
+        assert store is None
+        mock_fetch_timeseries.assert_not_called()
+
+        assert list(reservoirs["Idukki Reservoir"].data["Level"]) == [1.0]
+        assert list(reservoirs["Idukki Reservoir"].data["Level"]) == [1.0]
+        assert mock_fetch_timeseries.call_count == 1
+        # The other pending reservoir is prefetched in the same request
+        assert mock_fetch_timeseries.call_args.args[0] == ["Idukki Reservoir", "Wayanad Reservoir"]
+        assert list(reservoirs["Wayanad Reservoir"].data["Level"]) == [1.0]
+        assert mock_fetch_timeseries.call_count == 1
+
+#One-shot test for TimeseriesLoader - concurrent accesses are coalesced into one request
+def test_timeseries_loader_coalesces():
+    reservoirs = {name: Reservoir(name, None) for name in ["Res A", "Res B", "Res C"]}
+
+    def mock_fetch(names, timestep, start_date, end_date, **kwargs):
+        return build_timeseries_store(pd.DataFrame({"Reservoir Name": names, "Date": [start_date] * len(names)}))
+
+    loader = TimeseriesLoader(reservoirs, "Daily", "2024-01-01", "2024-01-31", coalesce_delay=0.2)
+    for reservoir in reservoirs.values():
+        reservoir._loader = loader
+
+    with patch("pywris.surface_water.storage.reservoir.fetch_reservoir_timeseries", side_effect=mock_fetch) as mock_fetch_timeseries:
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            data = list(executor.map(lambda res: res.data, reservoirs.values()))
+
+    assert mock_fetch_timeseries.call_count == 1
+    assert sorted(mock_fetch_timeseries.call_args.args[0]) == ["Res A", "Res B", "Res C"]
+    assert all(len(res_data) == 1 for res_data in data)
+    assert loader.pending() == []
+
+#One-shot test for TimeseriesLoader - sequential accesses in one thread prefetch the next reservoirs in batches
+def test_timeseries_loader_prefetches():
+    reservoirs = {f"Res {i}": Reservoir(f"Res {i}", None) for i in range(5)}
+
+    def mock_fetch(names, timestep, start_date, end_date, **kwargs):
+        return build_timeseries_store(pd.DataFrame({"Reservoir Name": names, "Date": [start_date] * len(names)}))
+
+    loader = TimeseriesLoader(reservoirs, "Daily", "2024-01-01", "2024-01-31", batch_size=2, coalesce_delay=0)
+    for reservoir in reservoirs.values():
+        reservoir._loader = loader
+
+    with patch("pywris.surface_water.storage.reservoir.fetch_reservoir_timeseries", side_effect=mock_fetch) as mock_fetch_timeseries:
+        assert all(len(reservoirs[f"Res {i}"].data) == 1 for i in [1, 2, 3, 4, 0])
+
+    assert [call.args[0] for call in mock_fetch_timeseries.call_args_list] == [["Res 1", "Res 2"], ["Res 3", "Res 4"], ["Res 0"]]
+
+    # Prefetching stops at the last reservoir instead of wrapping around
+    loader = TimeseriesLoader(reservoirs, "Daily", "2024-01-01", "2024-01-31", batch_size=2, coalesce_delay=0)
+    with patch("pywris.surface_water.storage.reservoir.fetch_reservoir_timeseries", side_effect=mock_fetch) as mock_fetch_timeseries:
+        loader.load(["Res 4"], prefetch=True)
+    assert mock_fetch_timeseries.call_args.args[0] == ["Res 4"]
+
+    # Explicit loads download only the requested reservoirs
+    loader = TimeseriesLoader(reservoirs, "Daily", "2024-01-01", "2024-01-31", batch_size=2, coalesce_delay=0)
+    with patch("pywris.surface_water.storage.reservoir.fetch_reservoir_timeseries", side_effect=mock_fetch) as mock_fetch_timeseries:
+        loader.load(["Res 3"])
+    assert mock_fetch_timeseries.call_args.args[0] == ["Res 3"]
+
+#Edge case test for TimeseriesLoader - a failed batch is requested again on the next access
+def test_timeseries_loader_retries_after_error():
+    reservoirs = {"Res A": Reservoir("Res A", None)}
+    loader = TimeseriesLoader(reservoirs, "Daily", "2024-01-01", "2024-01-31", coalesce_delay=0)
+    reservoirs["Res A"]._loader = loader
+
+    with patch("pywris.surface_water.storage.reservoir.fetch_reservoir_timeseries", side_effect=ConnectionError("Timeout")):
+        with pytest.raises(ConnectionError):
+            reservoirs["Res A"].data
+    assert loader.pending() == ["Res A"]
+
+    with patch("pywris.surface_water.storage.reservoir.fetch_reservoir_timeseries", return_value=pd.DataFrame()):
+        assert reservoirs["Res A"].data is None
+    assert loader.pending() == []
+
+#One-shot test for fetch_reservoir_timeseries - batching of the reservoir list
+def test_fetch_reservoir_timeseries_batches():
+    """Test that the reservoir list is split into batches and merged in order."""
+    def mock_get_reservoir_data(names_str, timestep, start_date, end_date, stream=False):
+        return [{"Reservoir Name": name.strip("'"), "Date": start_date} for name in names_str.split(",")]
+
+    with patch("pywris.surface_water.storage.reservoir.get_reservoir_data", side_effect=mock_get_reservoir_data) as mock_fetch:
+        records = fetch_reservoir_timeseries(
+            ["Res A", "Res B", "Res C", "Res D", "Res E"], "Daily", "2024-01-01", "2024-01-31",
+            batch_size=2, max_workers=3
+        )
+
+    assert mock_fetch.call_count == 3
+    assert list(records["Reservoir Name"]) == ["Res A", "Res B", "Res C", "Res D", "Res E"]
+
+#Edge case test for fetch_reservoir_timeseries - invalid batch size
+def test_fetch_reservoir_timeseries_invalid_batch_size():
+    with pytest.raises(ValueError):
+        fetch_reservoir_timeseries(["Res A"], "Daily", "2024-01-01", "2024-01-31", batch_size=0)
+
+#One-shot test for split_date_range
+def test_split_date_range():
+    assert split_date_range("2022-06-01", "2024-03-31", "YS") == [
+        ("2022-06-01", "2022-12-31"), ("2023-01-01", "2023-12-31"), ("2024-01-01", "2024-03-31")
+    ]
+    assert split_date_range("2022-06-01", "2024-03-31") == [("2022-06-01", "2024-03-31")]
+    assert split_date_range("2023-01-01", "2023-01-01", "YS") == [("2023-01-01", "2023-01-01")]
+
+#One-shot test for fetch_reservoir_timeseries - windows are stitched, de-duplicated and sorted
+def test_fetch_reservoir_timeseries_windows():
+    def mock_get_reservoir_data(names_str, timestep, start_date, end_date, stream=False):
+        # Every window also returns the first day of the range, which must be de-duplicated
+        return [
+            {"Reservoir Name": "Res B", "Date": end_date, "Level": 2},
+            {"Reservoir Name": "Res A", "Date": end_date, "Level": 1},
+            {"Reservoir Name": "Res A", "Date": "2022-06-01", "Level": 0},
+        ]
+
+    with patch("pywris.surface_water.storage.reservoir.get_reservoir_data", side_effect=mock_get_reservoir_data) as mock_fetch:
+        records = fetch_reservoir_timeseries(["Res A", "Res B"], "Daily", "2022-06-01", "2024-03-31")
+
+    assert mock_fetch.call_count == 3
+    assert list(records["Reservoir Name"]) == ["Res A"] * 4 + ["Res B"] * 3
+    assert list(records["Date"][:4].dt.strftime("%Y-%m-%d")) == ["2022-06-01", "2022-12-31", "2023-12-31", "2024-03-31"]
+
+#Edge case test for fetch_reservoir_timeseries - a window with an unreadable body is retried on its own
+def test_fetch_reservoir_timeseries_retries_window():
+    calls = []
+    def mock_get_reservoir_data(names_str, timestep, start_date, end_date, stream=False):
+        calls.append(start_date)
+        if start_date == "2023-01-01" and calls.count(start_date) == 1:
+            raise ValueError("Invalid JSON response from the server: premature EOF")
+        return [{"Reservoir Name": "Res A", "Date": start_date}]
+
+    with patch("pywris.surface_water.storage.reservoir.get_reservoir_data", side_effect=mock_get_reservoir_data), \
+         patch("pywris.surface_water.storage.reservoir.time.sleep"):
+        records = fetch_reservoir_timeseries(["Res A"], "Daily", "2022-06-01", "2023-03-31", max_workers=1)
+
+    assert sorted(calls) == ["2022-06-01", "2023-01-01", "2023-01-01"]
+    assert list(records["Date"].dt.strftime("%Y-%m-%d")) == ["2022-06-01", "2023-01-01"]
+
+    # HTTP errors were already retried by send_request and are raised at once
+    with patch("pywris.surface_water.storage.reservoir.get_reservoir_data", side_effect=Exception("Error:", 404)) as mock_data, \
+         patch("pywris.surface_water.storage.reservoir.time.sleep"):
+        with pytest.raises(Exception):
+            fetch_reservoir_timeseries(["Res A"], "Daily", "2023-01-01", "2023-03-31", max_workers=1)
+    assert mock_data.call_count == 1
+
+#One-shot test for last_unique_values - matches unique()[-1] per group
+def test_last_unique_values():
+    df = pd.DataFrame({
+        "name": ["A", "A", "A", "B"],
+        "value": [1, 2, 1, 5],
+    })
+    result = last_unique_values(df, "name", ["value"])
+
+    assert result.loc["A", "value"] == df[df["name"] == "A"]["value"].unique()[-1] == 2
+    assert result.loc["B", "value"] == 5
+
+#One-shot test for build_timeseries_store and attach_timeseries - reservoir data are views into the store
+def test_timeseries_store_views():
+    import numpy as np
+    raw_df = pd.DataFrame({
+        "Reservoir Name": ["Res B", "Res A", "Res B", "Res A", "Res A"],
+        "Date": ["2024-01-02", "2024-01-01", "2024-01-01", "2024-01-02", "2024-01-02"],
+        "Level": ["1", 2, 3, 4, 5],
+        "Current Live Storage": [5, 6, 7, 8, 9],
+        "Child": ["Idukki"] * 5,
+    })
+    store = build_timeseries_store(raw_df)
+
+    assert list(store.columns[:4]) == ["Reservoir Name", "Date", "Level", "Current Live Storage"]
+    assert isinstance(store["Reservoir Name"].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_any_dtype(store["Date"])
+    assert list(store["Level"]) == [2.0, 5.0, 3.0, 1.0]
+    assert reservoir_row_ranges(store) == {"Res A": slice(0, 2), "Res B": slice(2, 4)}
+
+    reservoirs = {"Res A": Reservoir("Res A", "Kerala"), "Res B": Reservoir("Res B", "Kerala")}
+    attach_timeseries(reservoirs, store)
+    assert list(reservoirs["Res B"].data.columns) == ["Date", "Level", "Current Live Storage"]
+    assert list(reservoirs["Res B"].data["Level"]) == [3.0, 1.0]
+    assert np.shares_memory(reservoirs["Res B"].data["Level"].to_numpy(), store["Level"].to_numpy())
+
+#One-shot test for build_timeseries_store - compact dtypes
+def test_timeseries_store_compact_dtypes():
+    raw_df = pd.DataFrame({
+        "Reservoir Name": ["Res A", "Res A", "Res B"],
+        "Date": ["2024-01-02", "2024-01-01", "2024-01-01"],
+        "Level": ["1.5", None, 3],
+        "Current Live Storage": [5, 6, 7],
+        "Child": ["Idukki", "Idukki", "Wayanad"],
+    })
+    store = build_timeseries_store(raw_df, float_dtype="float32", date_format="%Y-%m-%d")
+
+    assert store["Level"].dtype == "float32"
+    assert store["Current Live Storage"].dtype == "float32"
+    assert isinstance(store["Child"].dtype, pd.CategoricalDtype)
+    assert list(store["Date"].dt.strftime("%Y-%m-%d")) == ["2024-01-01", "2024-01-02", "2024-01-01"]
+
+    with pytest.raises(ValueError):
+        build_timeseries_store(raw_df, float_dtype="int8")
+
+#Edge case test for parse_dates - format mismatch falls back to inference
+def test_parse_dates():
+    dates = pd.Series(["2024-01-31", None, "2024-01-31"]).astype("category")
+    parsed = parse_dates(dates, "%Y-%m-%d")
+    assert parsed[0] == pd.Timestamp("2024-01-31") and pd.isna(parsed[1])
+
+    parsed = parse_dates(pd.Series(["2024/01/31"]), "%Y-%m-%d")
+    assert parsed[0] == pd.Timestamp("2024-01-31")
+
+#One-shot test for resample_timeseries - all reservoirs aggregated per period, empty periods left out
+def test_resample_timeseries():
+    store = build_timeseries_store(pd.DataFrame({
+        "Reservoir Name": ["Res A", "Res A", "Res A", "Res B", "Res B"],
+        "Date": ["2024-01-01", "2024-01-20", "2024-03-02", "2024-02-01", "2024-02-02"],
+        "Level": [1.0, 2.0, 3.0, 4.0, None],
+        "Current Live Storage": [10.0, 20.0, 30.0, 40.0, 50.0],
+    }))
+
+    monthly = resample_timeseries(store, "Monthly")
+    assert list(monthly.index) == [
+        ("Res A", pd.Timestamp("2024-01-01")), ("Res A", pd.Timestamp("2024-03-01")), ("Res B", pd.Timestamp("2024-02-01")),
+    ]
+    assert list(monthly[("Level", "mean")]) == [1.5, 3.0, 4.0]
+    assert list(monthly[("Level", "count")]) == [2, 1, 1]
+    assert list(monthly[("Current Live Storage", "last")]) == [20.0, 30.0, 50.0]
+
+    yearly = resample_timeseries(store, "Yearly", how="max", columns=["Level"])
+    assert list(yearly.columns) == ["Level"]
+    assert list(yearly["Level"]) == [3.0, 4.0]
+
+#Edge case test for resample_timeseries - weeks run from Monday to Sunday and are labelled by their Monday
+def test_resample_timeseries_weekly():
+    store = build_timeseries_store(pd.DataFrame({
+        "Reservoir Name": ["Res A"] * 10,
+        "Date": pd.date_range("2024-01-01", periods=10).strftime("%Y-%m-%d"),
+        "Level": [1.0] * 10,
+    }))
+    weekly = resample_timeseries(store, "Weekly", "count")
+    assert list(weekly.index.get_level_values("Date").strftime("%Y-%m-%d")) == ["2024-01-01", "2024-01-08"]
+    assert list(weekly["Level"]) == [7, 3]
+
+#Edge case test for resample_timeseries - invalid statistics and columns
+def test_resample_timeseries_invalid():
+    store = build_timeseries_store(pd.DataFrame({"Reservoir Name": ["Res A"], "Date": ["2024-01-01"], "Level": [1.0]}))
+    with pytest.raises(ValueError):
+        resample_timeseries(store, "Monthly", how="median")
+    with pytest.raises(KeyError):
+        resample_timeseries(store, "Monthly", columns=["Inflow"])
+
+#One-shot test for aggregate_storage - storage sums and capacity-weighted fill fraction per state and date
+def test_aggregate_storage():
+    store = build_timeseries_store(pd.DataFrame({
+        "Reservoir Name": ["Res A", "Res A", "Res B", "Res B", "Res C", "Res D"],
+        "Date": ["2024-01-01", "2024-01-02", "2024-01-01", "2024-01-02", "2024-01-01", "2024-01-01"],
+        "Current Live Storage": [10.0, 20.0, 30.0, None, 5.0, 7.0],
+    }))
+    reservoir_gdf = pd.DataFrame({
+        "reservoir_name": ["Res A", "Res B", "Res C"],
+        "state": ["Kerala", "Kerala", "Tamil Nadu"],
+        "live_cap_frl": [100.0, "200", None],
+    })
+
+    aggregated = aggregate_storage(store, reservoir_gdf, by="state")
+
+    # Res D has no static data and is left out
+    assert list(aggregated.index) == [
+        ("Kerala", pd.Timestamp("2024-01-01")), ("Kerala", pd.Timestamp("2024-01-02")), ("Tamil Nadu", pd.Timestamp("2024-01-01")),
+    ]
+    assert list(aggregated["Live Storage"]) == [40.0, 20.0, 5.0]
+    assert list(aggregated["Reservoirs Reporting"]) == [2, 1, 1]
+    # Res B does not report on 2024-01-02, so only the capacity of Res A counts
+    assert list(aggregated["Fill Fraction"][:2]) == [40.0 / 300.0, 20.0 / 100.0]
+    assert list(aggregated["Total Capacity"][:2]) == [300.0, 300.0]
+    assert pd.isna(aggregated["Fill Fraction"].iloc[2])
+
+#Edge case test for aggregate_storage - unknown grouping column
+def test_aggregate_storage_invalid_column():
+    store = build_timeseries_store(pd.DataFrame({"Reservoir Name": ["Res A"], "Date": ["2024-01-01"], "Current Live Storage": [1.0]}))
+    with pytest.raises(KeyError):
+        aggregate_storage(store, pd.DataFrame({"reservoir_name": ["Res A"], "live_cap_frl": [1.0]}), by="basin")
+
+#Edge case test for fetch_new_reservoir_data - without a previous end date each reservoir starts at its own last date
+def test_fetch_new_reservoir_data_own_last_dates():
+    from pywris.surface_water.storage.reservoir import fetch_new_reservoir_data
+    store = build_timeseries_store(pd.DataFrame({
+        "Reservoir Name": ["Res A", "Res B"], "Date": ["2024-01-02", "2015-06-30"], "Level": [1.0, 2.0],
+    }))
+    with patch("pywris.surface_water.storage.reservoir.fetch_reservoir_timeseries", return_value=pd.DataFrame()) as mock_fetch:
+        merged, updated = fetch_new_reservoir_data(store, "2024-01-03", reservoir_names=["Res A", "Res B", "Res C"])
+    assert sorted((call.args[0][0], call.args[2]) for call in mock_fetch.call_args_list) == [
+        ("Res A", "2024-01-02"), ("Res B", "2015-06-30"),
+    ]
+    assert merged is store and updated == []
@@ -0,0 +1,102 @@
+import pytest
+import pandas as pd
+from unittest.mock import patch
+from pywris.cli import main, JOB_DIR
+
+pytest.importorskip("pyarrow")
+
+###################################### Mocks and Patches ##########################################################
+
+@pytest.fixture
+def mock_selection():
+    """Fixture to mock the reservoir selection: one reservoir in Kerala and one in Tamil Nadu."""
+    info_df = pd.DataFrame([
+        {
+            "attributes.station_name": name, "attributes.state_name": state, "attributes.state_code": "XX",
+            "attributes.district_name": "District", "attributes.lat": 10.0, "attributes.long": 77.0,
+            "attributes.agency_name": "Agency", "attributes.dam_code": "D01", "attributes.frl": 100.0,
+            "attributes.lsc_frl": 50.0, "attributes.block_name": "Block", "attributes.basin_name": "Basin",
+            "attributes.basin_code": "B01", "attributes.sub_basin_name": "Sub-Basin",
+        }
+        for name, state in [("Idukki", "Kerala"), ("Mettur", "Tamil Nadu")]
+    ])
+    with patch("pywris.surface_water.storage.reservoir.select_reservoirs", return_value=(["Idukki", "Mettur"], info_df, {})):
+        yield
+
+def mock_get_reservoir_data(names_str, timestep, start_date, end_date, stream=False):
+    return [
+        {"Reservoir Name": name.strip("'"), "Date": start_date, "Level": 1.0, "Current Live Storage": 2.0}
+        for name in names_str.split(",")
+    ]
+
+############################################# Unit Tests #######################################################
+#One-shot test for pywris download - partitioned output and progress
+def test_download(mock_selection, tmp_path, capsys):
+    out = tmp_path / "data"
+    with patch("pywris.surface_water.storage.reservoir.get_reservoir_data", side_effect=mock_get_reservoir_data):
+        status = main([
+            "download", "--states", "Kerala", "Tamil Nadu", "--start", "2022-01-01", "--end", "2023-12-31",
+            "--out", str(out), "--workers", "2",
+        ])
+
+    assert status == 0
+    assert (out / "timeseries" / "state=Kerala" / "year=2023").is_dir()
+    assert not (out / JOB_DIR).exists()
+    err = capsys.readouterr().err
+    assert "[4/4]" in err
+    assert "rows/s" in err and "MB/s" in err
+
+#One-shot test for pywris download - request metrics in Prometheus format
+def test_download_metrics(mock_selection, tmp_path):
+    metrics_path = tmp_path / "pywris.prom"
+    with patch("pywris.surface_water.storage.reservoir.get_reservoir_data", side_effect=mock_get_reservoir_data):
+        status = main([
+            "download", "--start", "2023-01-01", "--end", "2023-12-31", "--out", str(tmp_path / "data"),
+            "--quiet", "--metrics", str(metrics_path),
+        ])
+    assert status == 0
+    # get_reservoir_data is mocked, so only the metrics file itself is checked
+    assert "# TYPE pywris_requests_total counter" in metrics_path.read_text()
+
+#Edge case test for pywris download - failed units are kept for the next run
+def test_download_failure_resumes(mock_selection, tmp_path):
+    out = tmp_path / "data"
+    arguments = ["download", "--end", "2023-12-31", "--start", "2023-01-01", "--out", str(out), "--retries", "0", "--quiet"]
+    with patch("pywris.surface_water.storage.reservoir.get_reservoir_data", side_effect=Exception("Error:", 503)):
+        assert main(arguments) == 1
+    assert (out / JOB_DIR / "manifest.json").exists()
+
+    with patch("pywris.surface_water.storage.reservoir.get_reservoir_data", side_effect=mock_get_reservoir_data):
+        assert main(arguments) == 0
+    assert (out / "manifest.json").exists()
+
+#Edge case test for pywris download - invalid arguments
+def test_download_invalid_arguments(tmp_path):
+    with pytest.raises(SystemExit):
+        main(["download", "--end", "2023-12-31", "--out", str(tmp_path), "--workers", "0"])
+    with pytest.raises(SystemExit):
+        main(["download", "--out", str(tmp_path)])
+
+#Edge case test for pywris download - missing dependencies of the output format fail before the download
+def test_download_zarr_missing_dependency(tmp_path):
+    with patch("pywris.utils.xarray_io._require_zarr", side_effect=ImportError("Writing to Zarr requires zarr.")), \
+         patch("pywris.surface_water.storage.reservoir.select_reservoirs") as mock_select:
+        with pytest.raises(SystemExit):
+            main(["download", "--end", "2023-12-31", "--out", str(tmp_path), "--format", "zarr"])
+    mock_select.assert_not_called()
+
+#One-shot test for ProgressReporter - MB/s counts the response bytes received, not the files written
+def test_progress_reporter_received_bytes(capsys):
+    from unittest.mock import MagicMock
+    from pywris.cli import ProgressReporter
+    from pywris.utils import instrumentation
+
+    reporter = ProgressReporter()
+    instrumentation.emit(dict(instrumentation.request_event("get_reservoir_data", "POST"), bytes=10 ** 9))
+    job = MagicMock()
+    job.status.return_value = {"done": 1, "units": 1}
+    unit = {"state": "Kerala", "start_date": "2023-01-01", "end_date": "2023-12-31", "reservoirs": ["Idukki"], "rows": 10, "bytes": 0}
+    reporter("000000", unit, job)
+
+    megabytes_per_second = float(capsys.readouterr().err.split(" rows/s, ")[1].split(" MB/s")[0].replace(",", ""))
+    assert megabytes_per_second > 0
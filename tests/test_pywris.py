@@ -1,8 +1,10 @@
 # import modules and functions
+import logging
 import pytest
 from unittest.mock import patch, MagicMock
 from pywris import HydroFrame
 import pywris.surface_water.storage.reservoir as py_reservoir
+import pywris.surface_water.storage.climatology as climatology
 
 
 ########################################## Mocks and Patches ##########################################################
@@ -99,3 +101,237 @@ def test_fetch_reservoir_data(mock_get_reservoirs):
     assert hydroframe.reservoirs == ['Reservoir1', 'Reservoir2', 'Reservoir3']
     assert hydroframe.reservoirs_gdf is not None
     assert hydroframe.reservoirs_rawData is not None
+
+#Edge case test for fetch_reservoir_data method - no reservoir matches the filters
+def test_fetch_reservoir_data_no_match(patches, caplog):
+    hydroframe = HydroFrame(states=["Kerala"])
+    with patch('pywris.surface_water.storage.reservoir.get_reservoirs', return_value=None), \
+         caplog.at_level(logging.INFO, logger="pywris"):
+        hydroframe.fetch_reservoir_data(end_date='2024-12-01', filters={'basin': ['X']})
+
+    assert hydroframe.reservoirs == {}
+    assert hydroframe.reservoirs_gdf.empty
+    assert hydroframe.reservoirs_rawData is None
+    assert "No reservoirs found." in caplog.text
+
+#One-shot test for update method - only the missing tail is fetched and appended
+def test_update():
+    from pywris.surface_water.storage.reservoir import Reservoir
+    import pandas as pd
+
+    hydroframe = HydroFrame()
+    hydroframe.timestep = 'Daily'
+    hydroframe.start_date = '2020-01-01'
+    hydroframe.end_date = '2024-01-02'
+    hydroframe.reservoirs = {name: Reservoir(name, 'Kerala') for name in ['Res A', 'Res B', 'Res C']}
+    hydroframe.reservoirs_rawData = pd.DataFrame({
+        'Reservoir Name': ['Res A', 'Res A', 'Res B'],
+        'Date': ['2024-01-01', '2024-01-02', '2020-01-01'],
+        'Level': [1.0, 2.0, 3.0],
+        'Current Live Storage': [10.0, 20.0, 30.0],
+    })
+
+    def mock_fetch(names, timestep, start_date, end_date, **kwargs):
+        return pd.DataFrame({
+            'Reservoir Name': names,
+            'Date': [end_date] * len(names),
+            'Level': [9.0] * len(names),
+            'Current Live Storage': [90.0] * len(names),
+        })
+
+    with patch.object(py_reservoir, 'get_reservoir_data_valid_date_range', return_value=['1991-01-01', '2024-01-03']), \
+         patch.object(py_reservoir, 'fetch_reservoir_timeseries', side_effect=mock_fetch) as mock_fetch_timeseries:
+        hydroframe.update()
+
+    # The stale reservoir (Res B) and the one without rows (Res C) start at the previous end date,
+    # so all reservoirs are fetched in one call
+    assert mock_fetch_timeseries.call_count == 1
+    assert sorted(mock_fetch_timeseries.call_args.args[0]) == ['Res A', 'Res B', 'Res C']
+    assert mock_fetch_timeseries.call_args.args[2] == '2024-01-02'
+
+    assert hydroframe.end_date == '2024-01-03'
+    assert len(hydroframe.reservoirs_rawData) == 6
+    assert list(hydroframe.reservoirs['Res A'].data['Level']) == [1.0, 2.0, 9.0]
+    assert hydroframe.reservoirs['Res B'].data['Date'].max() == pd.Timestamp('2024-01-03')
+    assert list(hydroframe.reservoirs['Res C'].data['Level']) == [9.0]
+
+#Edge case test for update method - nothing fetched yet
+def test_update_without_data():
+    hydroframe = HydroFrame()
+    with pytest.raises(ValueError):
+        hydroframe.update()
+
+#One-shot test for load_data method - pending reservoirs are loaded and combined into reservoirs_rawData
+def test_load_data():
+    from pywris.surface_water.storage.reservoir import Reservoir, TimeseriesLoader, build_timeseries_store
+    import pandas as pd
+
+    hydroframe = HydroFrame()
+    hydroframe.reservoirs = {name: Reservoir(name, None) for name in ['Res A', 'Res B']}
+    loader = TimeseriesLoader(hydroframe.reservoirs, 'Daily', '2024-01-01', '2024-01-02', batch_size=1, coalesce_delay=0)
+    for reservoir in hydroframe.reservoirs.values():
+        reservoir._loader = loader
+
+    def mock_fetch(names, timestep, start_date, end_date, **kwargs):
+        return build_timeseries_store(pd.DataFrame({
+            'Reservoir Name': names, 'Date': [end_date] * len(names), 'Level': [float(len(names))] * len(names),
+        }))
+
+    with patch.object(py_reservoir, 'fetch_reservoir_timeseries', side_effect=mock_fetch) as mock_fetch_timeseries:
+        assert list(hydroframe.reservoirs['Res A'].data['Level']) == [1.0]
+        hydroframe.load_data()
+
+    assert mock_fetch_timeseries.call_args.args[0] == ['Res B']
+    assert list(hydroframe.reservoirs_rawData['Reservoir Name']) == ['Res A', 'Res B']
+    assert hydroframe.reservoirs['Res B'].data['Level'].iloc[0] == 1.0
+
+#Edge case test for request_summary method - lazy loads of Reservoir.data are included
+def test_request_summary_lazy():
+    import pywris.utils.instrumentation as instrumentation
+    from pywris.surface_water.storage.reservoir import build_timeseries_store
+    import pandas as pd
+
+    def mock_fetch(names, timestep, start_date, end_date, **kwargs):
+        instrumentation.emit(instrumentation.request_event('get_reservoir_data', 'POST'))
+        return build_timeseries_store(pd.DataFrame({'Reservoir Name': names, 'Date': [end_date] * len(names)}))
+
+    hydroframe = HydroFrame()
+    hydroframe.selection_allState = True
+    with patch.object(py_reservoir, 'select_reservoirs', return_value=(['Res A', 'Res B'], None, {})), \
+         patch.object(py_reservoir, 'fetch_reservoir_timeseries', side_effect=mock_fetch):
+        hydroframe.fetch_reservoir_data(end_date='2024-01-02', lazy=True)
+        assert hydroframe.request_summary().empty
+        hydroframe.reservoirs['Res A'].data
+
+    summary = hydroframe.request_summary()
+    assert summary.loc['get_reservoir_data', 'Requests'] == 1
+
+#Edge case test for load_data method - HydroFrame not fetched lazily
+def test_load_data_not_lazy():
+    hydroframe = HydroFrame()
+    with pytest.raises(ValueError):
+        hydroframe.load_data()
+
+#Edge case test for _repr_html_ method - output size does not grow with the number of reservoirs
+def test_repr_html_bounded():
+    from pywris.surface_water.storage.reservoir import Reservoir, TimeseriesLoader
+
+    def build(count):
+        hydroframe = HydroFrame()
+        hydroframe.add_state(['Kerala'])
+        hydroframe.reservoirs = {f'Res {i}': Reservoir(f'Res {i}', 'Kerala') for i in range(count)}
+        loader = TimeseriesLoader(hydroframe.reservoirs, 'Daily', '2024-01-01', '2024-01-02')
+        for reservoir in hydroframe.reservoirs.values():
+            reservoir._loader = loader
+        return hydroframe
+
+    with patch('pywris.geo_units.components.get_districts') as mock_get_districts, \
+         patch.object(py_reservoir, 'fetch_reservoir_timeseries') as mock_fetch_timeseries:
+        html_small = build(50)._repr_html_()
+        html_large = build(5000)._repr_html_()
+
+    mock_get_districts.assert_not_called()
+    mock_fetch_timeseries.assert_not_called()
+    assert 'Reservoirs (5000)' in html_large
+    assert '4975 more not shown' in html_large
+    assert len(html_large) - len(html_small) < 100
+
+#One-shot test for resample method - memoized until reservoirs_rawData changes
+def test_resample_memoized():
+    from pywris.surface_water.storage.reservoir import build_timeseries_store
+    import pandas as pd
+
+    hydroframe = HydroFrame()
+    hydroframe.reservoirs_rawData = build_timeseries_store(pd.DataFrame({
+        'Reservoir Name': ['Res A', 'Res A'], 'Date': ['2024-01-01', '2024-02-01'], 'Level': [1.0, 2.0],
+    }))
+
+    with patch.object(py_reservoir, 'resample_timeseries', wraps=py_reservoir.resample_timeseries) as mock_resample:
+        monthly = hydroframe.resample('Monthly', how='mean')
+        hydroframe.resample('Monthly', how='mean')
+        assert mock_resample.call_count == 1
+        assert list(monthly['Level']) == [1.0, 2.0]
+
+        hydroframe.reservoirs_rawData = build_timeseries_store(pd.DataFrame({
+            'Reservoir Name': ['Res A'], 'Date': ['2024-01-01'], 'Level': [5.0],
+        }))
+        assert list(hydroframe.resample('Monthly', how='mean')['Level']) == [5.0]
+        assert mock_resample.call_count == 2
+
+#Edge case test for resample method - nothing fetched yet
+def test_resample_without_data():
+    with pytest.raises(ValueError):
+        HydroFrame().resample('Monthly')
+
+#One-shot test for aggregate method - cached per grouping until reservoirs_gdf changes
+def test_aggregate_cached():
+    from pywris.surface_water.storage.reservoir import build_timeseries_store
+    import pandas as pd
+
+    hydroframe = HydroFrame()
+    hydroframe.reservoirs_rawData = build_timeseries_store(pd.DataFrame({
+        'Reservoir Name': ['Res A', 'Res B'], 'Date': ['2024-01-01', '2024-01-01'], 'Current Live Storage': [10.0, 30.0],
+    }))
+    hydroframe.reservoirs_gdf = pd.DataFrame({
+        'reservoir_name': ['Res A', 'Res B'], 'state': ['Kerala', 'Kerala'], 'basin': ['West', 'East'], 'live_cap_frl': [100.0, 100.0],
+    })
+
+    with patch.object(py_reservoir, 'aggregate_storage', wraps=py_reservoir.aggregate_storage) as mock_aggregate:
+        by_state = hydroframe.aggregate('state')
+        hydroframe.aggregate('state')
+        by_basin = hydroframe.aggregate('basin')
+        assert mock_aggregate.call_count == 2
+        assert by_state['Fill Fraction'].iloc[0] == 0.2
+        assert list(by_basin.index.get_level_values('basin')) == ['East', 'West']
+
+        hydroframe.reservoirs_gdf = hydroframe.reservoirs_gdf.iloc[:1]
+        assert hydroframe.aggregate('state')['Live Storage'].iloc[0] == 10.0
+        assert mock_aggregate.call_count == 3
+
+#One-shot test for climatology and anomalies methods - computed once and aligned to Reservoir.data
+def test_climatology_and_anomalies():
+    from pywris.surface_water.storage.reservoir import Reservoir, build_timeseries_store, attach_timeseries
+    import pandas as pd
+
+    hydroframe = HydroFrame()
+    hydroframe.reservoirs = {'Res A': Reservoir('Res A', 'Kerala'), 'Res B': Reservoir('Res B', 'Kerala')}
+    hydroframe.reservoirs_rawData = build_timeseries_store(pd.DataFrame({
+        'Reservoir Name': ['Res A', 'Res A', 'Res B', 'Res B'],
+        'Date': ['2000-01-01', '2001-01-01', '2000-01-01', '2001-01-01'],
+        'Current Live Storage': [1.0, 3.0, 5.0, 5.0],
+    }))
+    attach_timeseries(hydroframe.reservoirs, hydroframe.reservoirs_rawData)
+
+    with patch.object(climatology, 'compute_climatology', wraps=climatology.compute_climatology) as mock_compute:
+        clim = hydroframe.climatology()
+        anomalies = hydroframe.anomalies()
+        assert mock_compute.call_count == 1
+
+    assert clim.loc[('Res A', 1), 'Mean'] == 2.0
+    assert list(anomalies.loc[hydroframe.reservoirs['Res A'].data.index, 'Anomaly']) == [-1.0, 1.0]
+
+#Edge case test for filter method - reservoir data of the filtered HydroFrame index into its own store
+def test_filter_reattaches_timeseries():
+    from pywris.surface_water.storage.reservoir import Reservoir, build_timeseries_store, attach_timeseries
+    import geopandas as gpd
+    import pandas as pd
+
+    hydroframe = HydroFrame()
+    hydroframe.reservoirs = {'Res A': Reservoir('Res A', 'Kerala'), 'Res B': Reservoir('Res B', 'Kerala')}
+    hydroframe.reservoirs_gdf = gpd.GeoDataFrame({
+        'reservoir_name': ['Res A', 'Res B'], 'state': ['Kerala', 'Kerala'], 'basin': ['East', 'West'],
+    }, geometry=gpd.points_from_xy([76.0, 77.0], [10.0, 11.0]), crs="EPSG:4326")
+    hydroframe.reservoirs_rawData = build_timeseries_store(pd.DataFrame({
+        'Reservoir Name': ['Res A', 'Res A', 'Res B', 'Res B'],
+        'Date': ['2000-01-01', '2001-01-01', '2000-01-01', '2001-01-01'],
+        'Current Live Storage': [1.0, 3.0, 5.0, 7.0],
+    }))
+    attach_timeseries(hydroframe.reservoirs, hydroframe.reservoirs_rawData)
+
+    filtered = hydroframe.filter('reservoir', 'basin', values=['West'])
+    data = filtered.reservoirs['Res B'].data
+
+    assert list(data.index) == [0, 1]
+    assert list(filtered.reservoirs_rawData.loc[data.index, 'Current Live Storage']) == [5.0, 7.0]
+    assert list(filtered.anomalies().loc[data.index, 'Anomaly']) == [-1.0, 1.0]
+    assert list(hydroframe.reservoirs['Res B'].data.index) == [2, 3]
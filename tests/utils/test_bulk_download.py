@@ -0,0 +1,97 @@
+import json
+import pytest
+import pandas as pd
+from unittest.mock import patch
+from pywris import BulkDownloadJob
+
+pytest.importorskip("pyarrow")
+
+###################################### Mocks and Patches ##########################################################
+
+def info_row(name, state):
+    return {
+        "attributes.station_name": name, "attributes.state_name": state, "attributes.state_code": state[:2],
+        "attributes.district_name": "District", "attributes.lat": 10.0, "attributes.long": 77.0,
+        "attributes.agency_name": "Agency", "attributes.dam_code": name[:3], "attributes.frl": 100.0,
+        "attributes.lsc_frl": 50.0, "attributes.block_name": "Block", "attributes.basin_name": "Basin",
+        "attributes.basin_code": "B01", "attributes.sub_basin_name": "Sub-Basin",
+    }
+
+@pytest.fixture
+def mock_selection():
+    """Fixture to mock the reservoir selection: two reservoirs in Kerala and one in Tamil Nadu."""
+    info_df = pd.DataFrame([info_row("Idukki", "Kerala"), info_row("Kakki", "Kerala"), info_row("Mettur", "Tamil Nadu")])
+    selection = (["Idukki", "Kakki", "Mettur"], info_df, {})
+    with patch("pywris.surface_water.storage.reservoir.select_reservoirs", return_value=selection) as mock_select:
+        yield mock_select
+
+def mock_get_reservoir_data(names_str, timestep, start_date, end_date, stream=False):
+    return [
+        {"Reservoir Name": name.strip("'"), "Date": date, "Level": 1.0, "Current Live Storage": 2.0}
+        for name in names_str.split(",") for date in (start_date, end_date)
+    ]
+
+############################################# Unit Tests #######################################################
+#One-shot test for BulkDownloadJob - units per state, reservoir batch and date window
+def test_bulk_download_job(mock_selection, tmp_path):
+    job = BulkDownloadJob(str(tmp_path), end_date="2023-06-30", start_date="2022-01-01", batch_size=1)
+    with patch("pywris.surface_water.storage.reservoir.get_reservoir_data", side_effect=mock_get_reservoir_data):
+        status = job.run(max_workers=2)
+
+    # 3 reservoirs in batches of 1, 2 yearly windows
+    assert status == {"units": 6, "pending": 0, "done": 6, "failed": 0, "rows": 12, "bytes": status["bytes"]}
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    assert manifest["states"] == ["Kerala", "Tamil Nadu"]
+    assert [manifest["batches"][unit["batch"]]["state"] for unit in manifest["units"].values()] == ["Kerala"] * 4 + ["Tamil Nadu"] * 2
+    # Reservoir names are saved once per batch, and completions are appended to the progress log
+    assert [batch["reservoirs"] for batch in manifest["batches"].values()] == [["Idukki"], ["Kakki"], ["Mettur"]]
+    progress = [json.loads(line) for line in (tmp_path / "progress.jsonl").read_text().splitlines()]
+    assert sorted(record["unit"] for record in progress) == sorted(manifest["units"])
+    assert all(record["status"] == "done" for record in progress)
+    assert len(list((tmp_path / "parts").glob("*.parquet"))) == 6
+
+    hf = job.to_hydroframe()
+    assert hf.timestep == "Daily"
+    assert list(hf.reservoirs_rawData["Reservoir Name"].cat.categories) == ["Idukki", "Kakki", "Mettur"]
+    assert list(hf.reservoirs["Mettur"].data["Date"].dt.strftime("%Y-%m-%d")) == [
+        "2022-01-01", "2022-12-31", "2023-01-01", "2023-06-30"
+    ]
+    assert hf.reservoirs["Idukki"].latitude == 10.0
+
+#One-shot test for BulkDownloadJob - a failed run keeps finished units and the next run fetches only the rest
+def test_bulk_download_job_resume(mock_selection, tmp_path):
+    def failing_get_reservoir_data(names_str, timestep, start_date, end_date, stream=False):
+        if names_str == "'Mettur'":
+            raise Exception("Error:", 503)
+        return mock_get_reservoir_data(names_str, timestep, start_date, end_date)
+
+    job = BulkDownloadJob(str(tmp_path), end_date="2023-06-30", start_date="2022-01-01", batch_size=2,
+                          filters={"live_cap_frl": (10, None)})
+    with patch("pywris.surface_water.storage.reservoir.get_reservoir_data", side_effect=failing_get_reservoir_data), \
+         patch("pywris.surface_water.storage.reservoir.time.sleep"):
+        with pytest.raises(RuntimeError):
+            job.run(max_workers=1, max_retries=1)
+    assert job.status()["done"] == 2
+    assert job.status()["failed"] == 2
+    with pytest.raises(ValueError):
+        job.to_hydroframe()
+    assert set(job.to_hydroframe(allow_partial=True).reservoirs_rawData["Reservoir Name"]) == {"Idukki", "Kakki"}
+
+    # Another process picks the job up from the directory, even after a progress line was cut off
+    with open(tmp_path / "progress.jsonl", "a") as f:
+        f.write('{"unit": "0000')
+    resumed = BulkDownloadJob.resume(str(tmp_path))
+    assert resumed.parameters["filters"] == {"live_cap_frl": (10, None)}
+    with patch("pywris.surface_water.storage.reservoir.get_reservoir_data", side_effect=mock_get_reservoir_data) as mock_fetch:
+        status = resumed.run()
+    assert mock_fetch.call_count == 2
+    assert status["done"] == 4
+    assert mock_selection.call_count == 1
+    assert BulkDownloadJob.resume(str(tmp_path)).status()["done"] == 4
+    assert set(resumed.to_hydroframe().reservoirs) == {"Idukki", "Kakki", "Mettur"}
+
+#Edge case test for BulkDownloadJob - the directory holds a job with other parameters
+def test_bulk_download_job_other_parameters(mock_selection, tmp_path):
+    BulkDownloadJob(str(tmp_path), end_date="2023-06-30").plan()
+    with pytest.raises(ValueError):
+        BulkDownloadJob(str(tmp_path), end_date="2024-06-30")
@@ -0,0 +1,78 @@
+import time
+import pytest
+from unittest.mock import patch, MagicMock
+from pywris.utils.cache import ResponseCache, enable_cache, disable_cache, get_cache
+from pywris.utils.fetch_wris import get_response
+
+###################################### Mocks and Patches ##########################################################
+
+@pytest.fixture
+def cache(tmp_path):
+    """Fixture to enable the response cache in a temporary directory."""
+    cache = enable_cache(str(tmp_path / "responses.sqlite"))
+    yield cache
+    disable_cache()
+
+@pytest.fixture
+def mock_session():
+    """Fixture to mock the pooled session returned by get_session."""
+    session = MagicMock()
+    session.post.return_value = MagicMock(status_code=200, content=b'[["1991-01-01", "2024-12-31"]]')
+    with patch("pywris.utils.fetch_wris.get_session", return_value=session):
+        yield session
+
+############################################# Unit Tests #######################################################
+#Smoke test for the cache key - canonical payload
+def test_make_key_canonical_payload():
+    key_a = ResponseCache.make_key("http://mock-url.com", {"a": 1, "b": {"c": 2}}, "POST")
+    key_b = ResponseCache.make_key("http://mock-url.com", {"b": {"c": 2}, "a": 1}, "POST")
+    key_c = ResponseCache.make_key("http://mock-url.com", {"a": 2, "b": {"c": 2}}, "POST")
+
+    assert key_a == key_b
+    assert key_a != key_c
+
+#One-shot test for get_response - second request is served from the cache
+def test_get_response_cached(cache, mock_session):
+    payload = {"stnVal": {"qry": "select 1"}}
+    first = get_response("http://mock-url.com", payload, "POST", "get_reservoir_data_valid_date_range")
+    second = get_response("http://mock-url.com", payload, "POST", "get_reservoir_data_valid_date_range")
+
+    assert first == second == [["1991-01-01", "2024-12-31"]]
+    assert mock_session.post.call_count == 1
+    assert cache.size()[0] == 1
+
+#Edge case test for the cache - expired entries are not served
+def test_cache_ttl(tmp_path):
+    cache = ResponseCache(str(tmp_path / "responses.sqlite"))
+    cache.set("key", "http://mock-url.com", b"[]")
+
+    assert cache.get("key", ttl=60) == b"[]"
+    with patch("pywris.utils.cache.time.time", return_value=time.time() + 120):
+        assert cache.get("key", ttl=60) is None
+        cache.offline = True
+        assert cache.get("key", ttl=60) == b"[]"
+    cache.close()
+
+#Edge case test for offline mode - missing responses raise instead of reaching the server
+def test_get_response_offline_miss(tmp_path, mock_session):
+    enable_cache(str(tmp_path / "responses.sqlite"), offline=True)
+    try:
+        with pytest.raises(ConnectionError):
+            get_response("http://mock-url.com", {"stnVal": {}}, "POST", "get_reservoir_data")
+        mock_session.post.assert_not_called()
+    finally:
+        disable_cache()
+    assert get_cache() is None
+
+#One-shot test for size-based eviction of least recently used entries
+def test_cache_eviction(tmp_path):
+    cache = ResponseCache(str(tmp_path / "responses.sqlite"), max_size_mb=2 / 1024)
+    cache.set("old", "http://mock-url.com", b"x" * 1024)
+    cache.set("new", "http://mock-url.com", b"y" * 1024)
+    cache.get("old")
+    cache.set("newest", "http://mock-url.com", b"z" * 1024)
+
+    assert cache.get("old") is not None
+    assert cache.get("new") is None
+    assert cache.get("newest") is not None
+    cache.close()
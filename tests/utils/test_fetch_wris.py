@@ -0,0 +1,132 @@
+import pytest
+from unittest.mock import patch, MagicMock
+import pywris.utils.fetch_wris as fetch_wris
+from pywris.utils.fetch_wris import get_session, get_timeout, get_response, close_sessions, iter_response_records
+from pywris.static_data.request_urls import requests_config, transport_config
+
+###################################### Mocks and Patches ##########################################################
+
+@pytest.fixture
+def mock_session():
+    """Fixture to mock the pooled session returned by get_session."""
+    session = MagicMock()
+    session.get.return_value = MagicMock(status_code=200, content=b'{"features": []}')
+    session.post.return_value = MagicMock(status_code=200, content=b'[["Idukki Reservoir"]]')
+    with patch("pywris.utils.fetch_wris.get_session", return_value=session):
+        yield session
+
+@pytest.fixture
+def fresh_sessions():
+    """Fixture to start and end each test with an empty session pool."""
+    close_sessions()
+    yield
+    close_sessions()
+
+############################################# Unit Tests #######################################################
+#Smoke test for get_session - one session per host
+def test_get_session_reused_per_host(fresh_sessions):
+    session_a = get_session("https://indiawris.gov.in/getReservoirBusinessData")
+    session_b = get_session("https://indiawris.gov.in/resdnlddata")
+    session_c = get_session("https://arc.indiawris.gov.in/server/rest/services/Admin/query?")
+
+    assert session_a is session_b
+    assert session_a is not session_c
+
+#One-shot test for the retry configuration of the pooled session - retries are made through the limiter instead
+def test_get_session_retry_config(fresh_sessions):
+    session = get_session("https://indiawris.gov.in/resdnlddata")
+    adapter = session.get_adapter("https://indiawris.gov.in/resdnlddata")
+
+    assert adapter.max_retries.total == 0
+
+#One-shot test for per-endpoint timeouts
+def test_get_timeout():
+    assert get_timeout("get_reservoir_data") == requests_config["reservoir"]["get_reservoir_data"]["timeout"]
+    assert get_timeout("get_districts") == requests_config["geounits"]["get_districts"]["timeout"]
+    assert get_timeout(None) == transport_config["timeout"]
+
+#Smoke test for get_response with GET and POST requests
+def test_get_response_uses_session(mock_session):
+    result = get_response("http://mock-url.com/query?", "f=json", "GET", "get_districts")
+    assert result == {"features": []}
+    mock_session.get.assert_called_once_with(
+        "http://mock-url.com/query?f=json", verify=False, timeout=get_timeout("get_districts"), stream=False
+    )
+
+    result = get_response("http://mock-url.com", {"stnVal": {}}, "POST", "get_reservoir_names")
+    assert result == [["Idukki Reservoir"]]
+    mock_session.post.assert_called_once_with(
+        "http://mock-url.com", json={"stnVal": {}}, verify=False, timeout=get_timeout("get_reservoir_names"), stream=False
+    )
+
+#Edge case test for get_response - server error after retries
+def test_get_response_error(mock_session):
+    mock_session.post.return_value = MagicMock(status_code=503)
+    with pytest.raises(Exception):
+        get_response("http://mock-url.com", {"stnVal": {}}, "POST", "get_reservoir_data")
+
+#One-shot test for get_response - server errors and connection errors are retried
+def test_get_response_retries(mock_session):
+    import requests
+    mock_session.post.side_effect = [
+        MagicMock(status_code=503), requests.ConnectionError("reset"), MagicMock(status_code=200, content=b"[]"),
+    ]
+    assert get_response("http://mock-url.com", {"stnVal": {}}, "POST", "get_reservoir_data") == []
+    assert mock_session.post.call_count == 3
+
+    mock_session.post.side_effect = None
+    mock_session.post.return_value = MagicMock(status_code=503)
+    mock_session.post.reset_mock()
+    with pytest.raises(Exception):
+        get_response("http://mock-url.com", {"stnVal": {}}, "POST", "get_reservoir_data")
+    assert mock_session.post.call_count == transport_config['max_retries'] + 1
+
+#Edge case test for get_response - empty body
+def test_get_response_empty_body(mock_session):
+    mock_session.post.return_value = MagicMock(status_code=200, content=b"")
+    assert get_response("http://mock-url.com", {"stnVal": {}}, "POST", "get_reservoir_data") is None
+
+#One-shot test for iter_response_records - records are streamed from the response body
+@pytest.mark.parametrize("use_ijson", [True, False])
+def test_iter_response_records(mock_session, use_ijson):
+    import io
+    class RawBody(io.BytesIO):
+        decode_content = False
+    response = MagicMock(status_code=200)
+    response.raw = RawBody(b'[{"Reservoir Name": "Idukki", "Level": 1.5}, {"Reservoir Name": "Mettur", "Level": 2}]')
+    mock_session.post.return_value = response
+
+    ijson_module = fetch_wris.ijson if use_ijson else None
+    if use_ijson and ijson_module is None:
+        pytest.skip("ijson is not installed")
+    with patch("pywris.utils.fetch_wris.ijson", ijson_module):
+        records = iter_response_records("http://mock-url.com", {"stnVal": {}}, "POST", "get_reservoir_data")
+        assert mock_session.post.call_count == 0
+        assert list(records) == [{"Reservoir Name": "Idukki", "Level": 1.5}, {"Reservoir Name": "Mettur", "Level": 2}]
+    assert mock_session.post.call_args.kwargs["stream"] is True
+
+#Edge case test for iter_response_records - a body truncated after the first record raises and is not cached
+@pytest.mark.parametrize("use_ijson", [True, False])
+def test_iter_response_records_truncated(mock_session, use_ijson, tmp_path):
+    from pywris.utils.cache import enable_cache, disable_cache, get_cache
+    body = b'[{"Reservoir Name": "Idukki", "Level": 1.5}, {"Reservoir Name": "Met'
+    mock_session.post.return_value = MagicMock(status_code=200, content=body)
+
+    ijson_module = fetch_wris.ijson if use_ijson else None
+    if use_ijson and ijson_module is None:
+        pytest.skip("ijson is not installed")
+    enable_cache(tmp_path / "cache.sqlite")
+    try:
+        with patch("pywris.utils.fetch_wris.ijson", ijson_module):
+            with pytest.raises(ValueError):
+                list(iter_response_records("http://mock-url.com", {"stnVal": {}}, "POST", "get_reservoir_data"))
+        cache = get_cache()
+        assert cache.get(cache.make_key("http://mock-url.com", {"stnVal": {}}, "POST")) is None
+    finally:
+        disable_cache()
+
+#Edge case test for iter_json_items - empty and null bodies yield nothing
+@pytest.mark.parametrize("body", [b"", b"  \n", b"null"])
+def test_iter_json_items_empty(body):
+    import io
+    assert list(fetch_wris.iter_json_items(io.BytesIO(body))) == []
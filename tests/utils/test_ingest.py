@@ -0,0 +1,55 @@
+import pytest
+import numpy as np
+import pandas as pd
+from pywris.utils.ingest import RecordBuffer, memory_usage_report
+
+############################################# Unit Tests #######################################################
+#Smoke test for RecordBuffer - typed columns
+def test_record_buffer_types():
+    buffer = RecordBuffer(numeric_columns=["Level"])
+    buffer.extend([
+        {"Reservoir Name": "Idukki", "Date": "2024-01-01", "Level": "712.5"},
+        {"Reservoir Name": "Idukki", "Date": "2024-01-02", "Level": None},
+        {"Reservoir Name": "Mettur", "Date": "2024-01-01", "Level": 240},
+    ], chunk_size=2)
+    df = buffer.to_frame()
+
+    assert len(buffer) == 3
+    assert df["Level"].dtype == "float64"
+    assert np.isnan(df["Level"][1])
+    assert list(df["Level"][[0, 2]]) == [712.5, 240.0]
+    assert isinstance(df["Reservoir Name"].dtype, pd.CategoricalDtype)
+    assert list(df["Reservoir Name"]) == ["Idukki", "Idukki", "Mettur"]
+    assert list(df["Reservoir Name"].cat.categories) == ["Idukki", "Mettur"]
+
+#One-shot test for RecordBuffer - columns appearing late and generators
+def test_record_buffer_new_columns():
+    buffer = RecordBuffer()
+    buffer.extend(iter([{"a": "x"}, {"a": "y", "b": "z"}]))
+    df = buffer.to_frame()
+
+    assert list(df.columns) == ["a", "b"]
+    assert df["b"].isna().tolist() == [True, False]
+
+#One-shot test for RecordBuffer.merge - categories are re-coded
+def test_record_buffer_merge():
+    first = RecordBuffer(numeric_columns=["Level"])
+    first.extend([{"Reservoir Name": "Idukki", "Level": 1}])
+    second = RecordBuffer(numeric_columns=["Level"])
+    second.extend([{"Reservoir Name": "Mettur", "Level": 2}, {"Reservoir Name": "Idukki", "Child": "Idukki"}])
+    first.merge(second)
+    df = first.to_frame()
+
+    assert list(df["Reservoir Name"]) == ["Idukki", "Mettur", "Idukki"]
+    assert df["Level"].tolist()[:2] == [1.0, 2.0]
+    assert df["Child"].isna().tolist() == [True, True, False]
+
+#Smoke test for memory_usage_report
+def test_memory_usage_report():
+    df = pd.DataFrame({"Level": np.zeros(10), "Child": pd.Categorical(["Idukki"] * 10)})
+    report = memory_usage_report(df)
+
+    assert list(report.index) == ["Index", "Level", "Child", "Total"]
+    assert report.loc["Level", "bytes"] == 80
+    assert report.loc["Level", "dtype"] == "float64"
+    assert report.loc["Total", "bytes"] == report["bytes"][:-1].sum()
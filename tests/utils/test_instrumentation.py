@@ -0,0 +1,148 @@
+import io
+import logging
+import pytest
+from unittest.mock import patch, MagicMock
+from pywris import HydroFrame
+from pywris.utils.cache import enable_cache, disable_cache
+from pywris.utils.fetch_wris import get_response, iter_response_records
+from pywris.utils.instrumentation import (
+    add_hook, remove_hook, emit, request_event, enable_logging, disable_logging, metrics, RequestMetrics,
+)
+
+###################################### Mocks and Patches ##########################################################
+
+@pytest.fixture
+def mock_session():
+    """Fixture to mock the pooled session returned by get_session."""
+    session = MagicMock()
+    session.post.return_value = MagicMock(status_code=200, content=b'[["1991-01-01", "2024-12-31"]]')
+    with patch("pywris.utils.fetch_wris.get_session", return_value=session):
+        yield session
+
+@pytest.fixture
+def events():
+    """Fixture to record the request events emitted during a test."""
+    recorded = []
+    add_hook(recorded.append)
+    yield recorded
+    remove_hook(recorded.append)
+
+############################################# Unit Tests #######################################################
+#One-shot test for get_response - one event per request, with cache misses and hits
+def test_get_response_events(mock_session, events, tmp_path):
+    enable_cache(str(tmp_path / "responses.sqlite"))
+    try:
+        for _ in range(2):
+            get_response("http://mock-url.com", {"stnVal": {}}, "POST", "get_reservoir_data_valid_date_range")
+    finally:
+        disable_cache()
+
+    assert [event["cache"] for event in events] == ["miss", "hit"]
+    assert events[0]["endpoint"] == "get_reservoir_data_valid_date_range"
+    assert events[0]["status"] == 200
+    assert events[0]["bytes"] == events[1]["bytes"] == len(b'[["1991-01-01", "2024-12-31"]]')
+    assert events[1]["status"] is None and events[1]["latency"] == 0.0
+    assert all(event["error"] is None and event["duration"] >= 0 for event in events)
+
+#Edge case test for get_response - failed requests are reported and logged
+def test_get_response_error_event(mock_session, events, caplog):
+    mock_session.post.return_value = MagicMock(status_code=503)
+    enable_logging()
+    try:
+        with caplog.at_level(logging.INFO, logger="pywris"), pytest.raises(Exception):
+            get_response("http://mock-url.com", {"stnVal": {}}, "POST", "get_reservoir_names")
+    finally:
+        disable_logging()
+
+    assert events[0]["status"] == 503
+    assert events[0]["error"] == "HTTP 503"
+    assert "get_reservoir_names status=503" in caplog.text
+    assert metrics.summary().loc["get_reservoir_names", "Errors"] == 1
+
+#One-shot test for iter_response_records - bytes of a streamed body are counted once it is read
+def test_iter_response_records_event(mock_session, events):
+    body = b'[{"Reservoir Name": "Idukki", "Level": 1.5}]'
+    response = MagicMock(status_code=200)
+    response.raw = io.BytesIO(body)
+    mock_session.post.return_value = response
+
+    records = list(iter_response_records("http://mock-url.com", {"stnVal": {}}, "POST", "get_reservoir_data"))
+    assert len(records) == 1
+    assert len(events) == 1
+    assert events[0]["bytes"] == len(body)
+    assert events[0]["cache"] is None
+
+#Edge case test for emit - a failing hook does not break requests
+def test_failing_hook(events):
+    def failing_hook(event):
+        raise RuntimeError("hook failed")
+    add_hook(failing_hook)
+    try:
+        emit(request_event("get_districts", "GET"))
+    finally:
+        remove_hook(failing_hook)
+    assert len(events) == 1
+
+#One-shot test for RequestMetrics - summary and Prometheus text
+def test_request_metrics():
+    collector = RequestMetrics()
+    for status, latency, cache in [(200, 0.2, "miss"), (503, 3.0, "miss"), (None, 0.0, "hit")]:
+        event = request_event('get_reservoir_data', "POST", cache)
+        event.update(status=status, latency=latency, duration=latency + 0.1, bytes=1000, retries=1 if status == 503 else 0)
+        event["error"] = "HTTP 503" if status == 503 else None
+        collector.record(event)
+
+    summary = collector.summary()
+    row = summary.loc["get_reservoir_data"]
+    assert (row["Requests"], row["Errors"], row["Cache Hits"], row["Retries"]) == (3, 1, 1, 1)
+    assert row["MB"] == pytest.approx(0.003)
+    assert row["Max Duration (s)"] == pytest.approx(3.1)
+
+    text = collector.to_prometheus()
+    assert 'pywris_requests_total{endpoint="get_reservoir_data",status="503"} 1' in text
+    assert 'pywris_requests_total{endpoint="get_reservoir_data",status="cache"} 1' in text
+    assert 'pywris_request_latency_seconds_bucket{endpoint="get_reservoir_data",le="0.25"} 1' in text
+    assert 'pywris_request_latency_seconds_count{endpoint="get_reservoir_data"} 2' in text
+    assert "# TYPE pywris_request_latency_seconds histogram" in text
+
+#One-shot test for HydroFrame.request_summary - requests sent while fetching
+def test_hydroframe_request_summary():
+    def mock_get_reservoirs(*args, **kwargs):
+        event = request_event("get_reservoir_data", "POST")
+        event.update(status=200, bytes=2048)
+        emit(event)
+        return {}, None, None
+
+    hf = HydroFrame(states=["Kerala"])
+    with patch("pywris.surface_water.storage.reservoir.get_reservoirs", side_effect=mock_get_reservoirs):
+        hf.fetch_reservoir_data("2024-12-31")
+    emit(request_event("get_reservoir_data", "POST"))  # sent outside the HydroFrame
+
+    assert hf.request_summary().loc["get_reservoir_data", "Requests"] == 1
+    assert metrics.summary().loc["get_reservoir_data", "Requests"] == 2
+    assert "pywris_response_bytes_total" in hf.request_summary(prometheus=True)
+
+#Edge case test for collect - concurrent collectors only record their own requests, including those of worker threads
+def test_collect_concurrent():
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from pywris.utils.instrumentation import collect, propagate
+
+    collectors = {"A": RequestMetrics(), "B": RequestMetrics()}
+    both_collecting = threading.Barrier(2)
+
+    def fetch(name, n_requests):
+        with collect(collectors[name]):
+            both_collecting.wait()
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                list(executor.map(propagate(lambda i: emit(request_event(f"endpoint {name}", "POST"))), range(n_requests)))
+
+    threads = [threading.Thread(target=fetch, args=("A", 3)), threading.Thread(target=fetch, args=("B", 5))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert collectors["A"].summary()["Requests"].to_dict() == {"endpoint A": 3}
+    assert collectors["B"].summary()["Requests"].to_dict() == {"endpoint B": 5}
+    assert metrics.total("requests") == 8
@@ -0,0 +1,91 @@
+import threading
+import time
+import pytest
+from unittest.mock import patch, MagicMock
+from pywris.utils.memoize import memoize, clear_memoized
+from pywris.geo_units.components import get_districts, State
+
+############################################# Unit Tests #######################################################
+#Smoke test for memoize - results are reused and callers get their own copy
+def test_memoize_reuses_results():
+    calls = []
+
+    @memoize(ttl=60)
+    def lookup(states):
+        calls.append(states)
+        return {state: len(state) for state in states}
+
+    first = lookup(["Kerala"])
+    first["Goa"] = 3
+    assert lookup(["Kerala"]) == {"Kerala": 6}
+    lookup(["Goa"])
+    assert calls == [["Kerala"], ["Goa"]]
+
+#One-shot test for memoize - entries expire after the TTL and the least recently used is evicted
+def test_memoize_ttl_and_lru():
+    calls = []
+
+    @memoize(ttl=0.05, maxsize=2)
+    def lookup(value):
+        calls.append(value)
+        return value
+
+    lookup(1), lookup(2), lookup(1), lookup(3)
+    assert lookup.cache_size() == 2
+    lookup(1)
+    lookup(2)
+    assert calls == [1, 2, 3, 2]
+
+    time.sleep(0.1)
+    lookup(1)
+    assert calls == [1, 2, 3, 2, 1]
+
+#One-shot test for memoize - concurrent identical calls share one in-flight call
+def test_memoize_coalesces_concurrent_calls():
+    calls = []
+    started = threading.Event()
+
+    @memoize(ttl=60)
+    def slow_lookup(value):
+        calls.append(value)
+        started.set()
+        time.sleep(0.2)
+        return [value]
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(slow_lookup("Kerala"))) for _ in range(10)]
+    threads[0].start()
+    started.wait()
+    for thread in threads[1:]:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["Kerala"]
+    assert results == [["Kerala"]] * 10
+
+#Edge case test for memoize - errors are raised to every caller and not cached
+def test_memoize_does_not_cache_errors():
+    lookup = MagicMock(side_effect=[ConnectionError("Timeout"), "ok"])
+    memoized_lookup = memoize(ttl=60)(lambda: lookup())
+
+    with pytest.raises(ConnectionError):
+        memoized_lookup()
+    assert memoized_lookup() == "ok"
+    assert lookup.call_count == 2
+
+#One-shot test for the metadata functions - districts are requested once for repeated State lookups
+def test_get_districts_memoized():
+    response = {"features": [{"attributes": {
+        "district": "Idukki", "state": "KL", "district_code": 1,
+        "st_area(shape)": 1.0, "st_length(shape)": 1.0,
+    }}]}
+    with patch("pywris.geo_units.components.get_response", return_value=response) as mock_response:
+        State("Kerala").fetch_districts()
+        State("Kerala").fetch_districts()
+        assert list(get_districts(["Kerala"])) == ["Idukki"]
+        assert mock_response.call_count == 1
+
+        clear_memoized()
+        get_districts(["Kerala"])
+        assert mock_response.call_count == 2
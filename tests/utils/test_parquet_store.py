@@ -0,0 +1,82 @@
+import pytest
+import pandas as pd
+import geopandas as gpd
+from pywris import HydroFrame
+from pywris.surface_water.storage.reservoir import build_timeseries_store, build_reservoirs_from_gdf
+from pywris.utils.parquet_store import read_manifest
+
+pytest.importorskip("pyarrow")
+
+###################################### Mocks and Patches ##########################################################
+
+@pytest.fixture
+def mock_hydroframe():
+    """Fixture to create a HydroFrame with two states and two years of data, without requests."""
+    reservoirs_gdf = gpd.GeoDataFrame({
+        "reservoir_name": ["Idukki", "Mettur"],
+        "latitude": [9.85, 11.8],
+        "longitude": [76.96, 77.8],
+        "agency": ["Agency A", "Agency B"],
+        "state": ["Kerala", "Tamil Nadu"],
+        "state_code": ["KL", "TN"],
+        "district": ["Idukki", "Salem"],
+        "block_name": ["Block A", "Block B"],
+        "basin": ["Periyar", "Cauvery"],
+        "basin_code": ["PB01", "CB01"],
+        "sub_basin": ["Sub-Basin A", "Sub-Basin B"],
+        "dam_code": ["IDK001", "MTR001"],
+        "frl": [732.0, 240.0],
+        "live_cap_frl": [1460.0, 2647.0],
+    }, geometry=gpd.points_from_xy([76.96, 77.8], [9.85, 11.8]), crs="EPSG:4326")
+    dates = ["2023-12-30", "2023-12-31", "2024-01-01", "2024-01-02"]
+    store = build_timeseries_store(pd.DataFrame({
+        "Reservoir Name": ["Idukki"] * 4 + ["Mettur"] * 4,
+        "Date": dates * 2,
+        "Level": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0],
+        "Current Live Storage": [10.0, 20.0, 30.0, 40.0, 50.0, 60.0, 70.0, 80.0],
+        "Child": ["Idukki"] * 4 + ["Salem"] * 4,
+    }))
+    hf = HydroFrame()
+    hf.add_state(["Kerala", "Tamil Nadu"])
+    hf.reservoirs_gdf = reservoirs_gdf
+    hf.reservoirs_rawData = store
+    hf.reservoirs = build_reservoirs_from_gdf(reservoirs_gdf, store)
+    hf.timestep, hf.start_date, hf.end_date = "Daily", "2023-12-30", "2024-01-02"
+    return hf
+
+############################################# Unit Tests #######################################################
+#One-shot test for save and load - round trip
+def test_save_load_round_trip(mock_hydroframe, tmp_path):
+    mock_hydroframe.save(str(tmp_path))
+    manifest = read_manifest(str(tmp_path))
+    assert manifest["timestep"] == "Daily"
+    assert manifest["partitions"] == {"state": ["Kerala", "Tamil Nadu"], "year": [2023, 2024]}
+    assert (tmp_path / "timeseries" / "state=Kerala" / "year=2024").is_dir()
+
+    hf = HydroFrame.load(str(tmp_path))
+    pd.testing.assert_frame_equal(
+        hf.reservoirs_rawData[["Reservoir Name", "Date", "Level", "Current Live Storage", "Child"]],
+        mock_hydroframe.reservoirs_rawData,
+        check_categorical=False, check_dtype=False,
+    )
+    assert set(hf.states) == {"Kerala", "Tamil Nadu"}
+    assert hf.reservoirs["Idukki"].latitude == 9.85
+    assert hf.reservoirs["Idukki"].basin.basin_code == "PB01"
+    assert list(hf.reservoirs["Mettur"].data["Level"]) == [5.0, 6.0, 7.0, 8.0]
+    assert hf.reservoirs_gdf.crs.to_string() == "EPSG:4326"
+
+#One-shot test for load - partition and column pruning
+def test_load_pruning(mock_hydroframe, tmp_path):
+    mock_hydroframe.save(str(tmp_path))
+    hf = HydroFrame.load(str(tmp_path), states=["Kerala"], start_date="2024-01-01", columns=["Current Live Storage"])
+
+    assert list(hf.states) == ["Kerala"]
+    assert list(hf.reservoirs) == ["Idukki"]
+    assert list(hf.reservoirs_rawData.columns) == ["Reservoir Name", "Date", "Current Live Storage"]
+    assert list(hf.reservoirs["Idukki"].data["Current Live Storage"]) == [30.0, 40.0]
+    assert list(hf.reservoirs_gdf["reservoir_name"]) == ["Idukki"]
+
+#Edge case test for save - nothing fetched
+def test_save_without_data(tmp_path):
+    with pytest.raises(ValueError):
+        HydroFrame().save(str(tmp_path))
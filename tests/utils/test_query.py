@@ -0,0 +1,56 @@
+import pytest
+from unittest.mock import patch
+from urllib.parse import unquote
+from pywris.utils.query import quote_literal, quote_list, compile_filters, encode_where
+from pywris.surface_water.storage.reservoir import get_reservoir_info
+
+############################################# Unit Tests #######################################################
+#Smoke test for quote_literal - strings are quoted and embedded quotes doubled
+def test_quote_literal():
+    assert quote_literal("Krishna") == "'Krishna'"
+    assert quote_literal("Lower D'Souza") == "'Lower D''Souza'"
+    assert quote_literal(100) == "100"
+    assert quote_literal(12.5) == "12.5"
+    assert quote_list(["A", "B'C"]) == "'A','B''C'"
+
+#Edge case test for quote_literal - values that cannot be quoted
+@pytest.mark.parametrize("value", [None, True, float("nan"), float("inf"), ["A"]])
+def test_quote_literal_invalid(value):
+    with pytest.raises(ValueError):
+        quote_literal(value)
+
+#One-shot test for compile_filters - values, ranges and single values
+def test_compile_filters():
+    conditions = compile_filters({
+        'basin': ['Krishna', 'Godavari'],
+        'live_cap_frl': (100, None),
+        'frl': (None, 500.5),
+        'agency': 'CWC',
+    })
+    assert conditions == [
+        "basin_name IN ('Krishna','Godavari')",
+        "lsc_frl >= 100",
+        "frl <= 500.5",
+        "agency_name = 'CWC'",
+    ]
+
+#Edge case test for compile_filters - unknown columns and empty conditions
+@pytest.mark.parametrize("filters", [{'geometry': ['x']}, {'basin': []}, {'frl': (None, None)}, {'frl': (1, 2, 3)}, ['basin']])
+def test_compile_filters_invalid(filters):
+    with pytest.raises(ValueError):
+        compile_filters(filters)
+
+#One-shot test for encode_where - reserved URL characters are encoded
+def test_encode_where():
+    where = encode_where(["station_type = 'Reservoir'", "basin_name IN ('A&B #1')"])
+    assert "&" not in where and "#" not in where and " " not in where
+    assert unquote(where) == "station_type = 'Reservoir' AND basin_name IN ('A&B #1')"
+
+#One-shot test for get_reservoir_info with filters - conditions are sent in the where clause
+def test_get_reservoir_info_with_filters():
+    with patch("pywris.surface_water.storage.reservoir.get_response", return_value={"features": []}) as mock_response:
+        get_reservoir_info("'Res A'", False, compile_filters({'basin': ['Krishna']}))
+
+    payload = mock_response.call_args.args[1]
+    assert unquote(payload.split("where=")[1]) == \
+        "station_type = 'Reservoir' AND station_name IN ('Res A') AND basin_name IN ('Krishna')"
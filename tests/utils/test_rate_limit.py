@@ -0,0 +1,112 @@
+import threading
+import time
+import pytest
+from unittest.mock import patch, MagicMock
+from pywris.utils.rate_limit import TokenBucket, AdaptiveLimiter
+from pywris.utils.fetch_wris import get_response, get_limiter
+
+###################################### Mocks and Patches ##########################################################
+
+@pytest.fixture
+def mock_session():
+    """Fixture to mock the pooled session returned by get_session."""
+    session = MagicMock()
+    with patch("pywris.utils.fetch_wris.get_session", return_value=session):
+        yield session
+
+############################################# Unit Tests #######################################################
+#Smoke test for TokenBucket - requests beyond the burst wait for new tokens
+def test_token_bucket_rate():
+    bucket = TokenBucket(rate=20, burst=2)
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    # 2 tokens are available at once, the other 4 take 1/20 s each
+    assert time.monotonic() - start >= 0.18
+
+#Edge case test for the limiter settings
+def test_invalid_limiter_settings():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+    with pytest.raises(ValueError):
+        AdaptiveLimiter(min_concurrency=4, max_concurrency=2)
+    with pytest.raises(ValueError):
+        AdaptiveLimiter(decrease_factor=1.5)
+
+#One-shot test for AdaptiveLimiter - additive increase on success, multiplicative decrease on failure
+def test_adaptive_limiter_aimd():
+    # No latency spikes: the sub-millisecond latencies of this test vary too much
+    limiter = AdaptiveLimiter(initial_concurrency=4, max_concurrency=6, latency_spike=float('inf'))
+    # +1/limit per success: about one more slot per round of `concurrency` requests
+    for _ in range(5):
+        limiter.release(limiter.acquire(), success=True)
+    assert limiter.concurrency == 5
+
+    limiter.release(limiter.acquire(), success=False)
+    assert limiter.concurrency == 2
+    for _ in range(100):
+        limiter.release(limiter.acquire(), success=True)
+    assert limiter.concurrency == 6
+    assert limiter.stats()['failures'] == 1
+
+#One-shot test for AdaptiveLimiter - a latency spike counts as congestion
+def test_adaptive_limiter_latency_spike():
+    limiter = AdaptiveLimiter(initial_concurrency=8, latency_spike=3.0)
+    limiter.latency = 0.01
+    limiter.release(limiter.acquire() - 1.0, success=True)
+    assert limiter.concurrency == 4
+
+#One-shot test for AdaptiveLimiter - no more than `concurrency` requests run at a time
+def test_adaptive_limiter_caps_concurrency():
+    limiter = AdaptiveLimiter(initial_concurrency=2, max_concurrency=2)
+    running, peak = [0], [0]
+    lock = threading.Lock()
+
+    def request():
+        with limiter.slot():
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak[0] == 2
+
+#One-shot test for get_response - server errors are reported to the limiter of the endpoint
+def test_get_response_reports_server_errors(mock_session):
+    mock_session.post.return_value = MagicMock(status_code=503)
+    limiter = get_limiter("http://mock-url.com/data", "get_reservoir_data")
+    concurrency = limiter.concurrency
+
+    with pytest.raises(Exception):
+        get_response("http://mock-url.com/data", {"stnVal": {}}, "POST", "get_reservoir_data")
+
+    assert limiter.concurrency < concurrency
+    assert limiter.in_flight == 0
+
+#One-shot test for get_response - every retried attempt takes a limiter slot and is reported as a failure
+def test_get_response_retries_through_limiter(mock_session):
+    mock_session.post.side_effect = [MagicMock(status_code=503), MagicMock(status_code=503), MagicMock(status_code=200, content=b"[]")]
+    limiter = get_limiter("http://mock-url.com/data", "get_reservoir_data")
+
+    assert get_response("http://mock-url.com/data", {"stnVal": {}}, "POST", "get_reservoir_data") == []
+    assert limiter.stats()['failures'] == 2
+    assert limiter.stats()['successes'] == 1
+    assert limiter.in_flight == 0
+
+#One-shot test for get_limiter - endpoints with their own settings get their own limiter
+def test_get_limiter_per_endpoint():
+    data_limiter = get_limiter("https://indiawris.gov.in/resdnlddata", "get_reservoir_data")
+    names_limiter = get_limiter("https://indiawris.gov.in/getReservoirBusinessData", "get_reservoir_names")
+    dates_limiter = get_limiter("https://indiawris.gov.in/getReservoirBusinessData", "get_reservoir_data_valid_date_range")
+
+    assert data_limiter is not names_limiter
+    assert names_limiter is dates_limiter
+    assert data_limiter.bucket.rate == 2.0
+    assert data_limiter.max_concurrency == 8
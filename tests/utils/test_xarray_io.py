@@ -0,0 +1,74 @@
+import pytest
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+from pywris import HydroFrame
+from pywris.surface_water.storage.reservoir import build_timeseries_store, build_reservoirs_from_gdf, timeseries_matrix
+
+xr = pytest.importorskip("xarray")
+
+###################################### Mocks and Patches ##########################################################
+
+@pytest.fixture
+def mock_hydroframe():
+    """Fixture to create a HydroFrame with two reservoirs with partly overlapping dates, without requests."""
+    reservoirs_gdf = gpd.GeoDataFrame({
+        "reservoir_name": ["Idukki", "Mettur"],
+        "latitude": [9.85, 11.8],
+        "longitude": [76.96, 77.8],
+        "state": ["Kerala", "Tamil Nadu"],
+        "district": ["Idukki", "Salem"],
+        "agency": ["Agency A", "Agency B"],
+        "block_name": ["Block A", "Block B"],
+        "basin": ["Periyar", "Cauvery"],
+        "basin_code": ["PB01", "CB01"],
+        "sub_basin": ["Sub-Basin A", "Sub-Basin B"],
+        "dam_code": ["IDK001", "MTR001"],
+        "frl": [732.0, 240.0],
+        "live_cap_frl": [1460.0, 2647.0],
+    }, geometry=gpd.points_from_xy([76.96, 77.8], [9.85, 11.8]), crs="EPSG:4326")
+    store = build_timeseries_store(pd.DataFrame({
+        "Reservoir Name": ["Idukki", "Idukki", "Mettur", "Mettur"],
+        "Date": ["2024-01-01", "2024-01-02", "2024-01-02", "2024-01-03"],
+        "Level": [1.0, 2.0, 3.0, 4.0],
+        "Current Live Storage": [10.0, 20.0, 30.0, 40.0],
+    }))
+    hf = HydroFrame()
+    hf.reservoirs_gdf = reservoirs_gdf
+    hf.reservoirs_rawData = store
+    hf.reservoirs = build_reservoirs_from_gdf(reservoirs_gdf, store)
+    hf.timestep = "Daily"
+    return hf
+
+############################################# Unit Tests #######################################################
+#One-shot test for timeseries_matrix
+def test_timeseries_matrix(mock_hydroframe):
+    names, dates, matrices = timeseries_matrix(mock_hydroframe.reservoirs_rawData, ["Level"])
+
+    assert list(names) == ["Idukki", "Mettur"]
+    assert len(dates) == 3
+    np.testing.assert_array_equal(matrices["Level"], [[1.0, 2.0, np.nan], [np.nan, 3.0, 4.0]])
+
+#One-shot test for to_xarray - dimensions, variables and coordinates
+def test_to_xarray(mock_hydroframe):
+    ds = mock_hydroframe.to_xarray(chunks=None)
+
+    assert dict(ds.sizes) == {"reservoir": 2, "time": 3}
+    assert set(ds.data_vars) == {"Level", "Current Live Storage"}
+    assert ds["Current Live Storage"].sel(reservoir="Mettur", time="2024-01-03").item() == 40.0
+    assert ds["lat"].sel(reservoir="Idukki").item() == 9.85
+    assert ds["state"].sel(reservoir="Mettur").item() == "Tamil Nadu"
+    assert ds["live_cap_frl"].sel(reservoir="Mettur").item() == 2647.0
+    assert ds.attrs["timestep"] == "Daily"
+
+#One-shot test for to_xarray - chunked arrays and Zarr round trip
+def test_to_zarr(mock_hydroframe, tmp_path):
+    pytest.importorskip("dask")
+    pytest.importorskip("zarr")
+    ds = mock_hydroframe.to_xarray(chunks={"reservoir": 1, "time": 2})
+    assert ds["Level"].chunks == ((1, 1), (2, 1))
+
+    mock_hydroframe.to_zarr(str(tmp_path / "cube.zarr"), chunks={"reservoir": 1, "time": 2})
+    loaded = xr.open_zarr(str(tmp_path / "cube.zarr"))
+    np.testing.assert_array_equal(loaded["Level"].values, ds["Level"].values)
+    assert loaded["basin"].sel(reservoir="Idukki").values.item() == "Periyar"
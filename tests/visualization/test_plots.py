@@ -79,3 +79,134 @@ def test_reservoir_add_column_and_plot():
         reservoirs['Bisalpur'].plot()
     except Exception as e:
         pytest.fail(f"Adding a new column and plotting failed: {e}")
+
+def test_lttb_keeps_shape():
+    """
+    One-shot test: LTTB keeps the end points and the extremes of a long series.
+    """
+    from pywris.visualization.plot import lttb
+    x = np.arange(100000)
+    y = np.sin(x / 5000)
+    y[54321] = 10
+    kept = lttb(x, y, 500)
+    assert len(kept) == 500
+    assert kept[0] == 0 and kept[-1] == len(x) - 1
+    assert np.all(np.diff(kept) > 0)
+    assert 54321 in kept
+
+def test_minmax_buckets_keeps_extremes():
+    """
+    One-shot test: min/max downsampling keeps the minimum and maximum of every bucket.
+    """
+    from pywris.visualization.plot import minmax_buckets
+    y = np.random.default_rng(0).normal(size=10001)
+    kept = minmax_buckets(y, 100)
+    assert len(kept) <= 102
+    assert np.argmax(y) in kept and np.argmin(y) in kept
+
+def test_downsample_short_series_and_nan():
+    """
+    Edge test: short series are not downsampled, missing values are dropped and invalid methods are rejected.
+    """
+    from pywris.visualization.plot import downsample
+    dates = pd.date_range('2023-01-01', periods=4)
+    x, y = downsample(dates, [1.0, np.nan, 3.0, 4.0], max_points=10)
+    assert list(y) == [1.0, 3.0, 4.0]
+    assert len(x) == 3
+    with pytest.raises(ValueError):
+        downsample(dates, [1.0, 2.0, 3.0, 4.0], method='mean')
+
+@patch('plotly.graph_objects.Figure.show')
+def test_reservoir_plot_downsampled_webgl(mock_show):
+    """
+    One-shot test: long series are drawn as downsampled WebGL traces.
+    """
+    from pywris.surface_water.storage.reservoir import Reservoir
+    from pywris.visualization.plot import DEFAULT_MAX_POINTS
+    reservoir = Reservoir('Bisalpur', 'Rajasthan')
+    dates = pd.date_range('1991-01-01', '2024-12-31', freq='D')
+    reservoir.data = pd.DataFrame({'Date': dates, 'Level': np.random.uniform(50, 150, size=len(dates))})
+
+    with patch('plotly.graph_objects.Figure.add_trace', autospec=True, side_effect=lambda fig, trace, **kwargs: fig) as mock_add_trace:
+        reservoir.plot()
+
+    trace = mock_add_trace.call_args.args[1]
+    assert trace.type == 'scattergl'
+    assert len(trace.x) == DEFAULT_MAX_POINTS
+    mock_show.assert_called_once()
+
+@pytest.mark.parametrize('layout', ['overlay', 'facets'])
+@patch('plotly.graph_objects.Figure.show')
+def test_plot_reservoirs(mock_show, layout):
+    """
+    One-shot test: many reservoirs are plotted in one figure, as an overlay or as small multiples.
+    """
+    from pywris.visualization.plot import plot_reservoirs
+    reservoirs, _, _ = mock_get_reservoirs()
+    reservoirs['No Data'] = MagicMock(data=None)
+    plot_reservoirs(reservoirs, layout=layout)
+    mock_show.assert_called_once()
+
+def test_plot_reservoirs_invalid_input():
+    """
+    Edge test: unknown reservoirs, columns and layouts raise errors.
+    """
+    from pywris.visualization.plot import plot_reservoirs
+    reservoirs, _, _ = mock_get_reservoirs()
+    with pytest.raises(KeyError):
+        plot_reservoirs(reservoirs, reservoir_names=['Unknown'])
+    with pytest.raises(KeyError):
+        plot_reservoirs(reservoirs, column='Inflow')
+    with pytest.raises(ValueError):
+        plot_reservoirs(reservoirs, layout='grid')
+
+@patch('plotly.graph_objects.Figure.show')
+def test_plot_reservoirs_lazy(mock_show):
+    """
+    One-shot test: lazily fetched reservoirs are downloaded in one batched request before plotting.
+    """
+    from pywris.surface_water.storage.reservoir import Reservoir, TimeseriesLoader, build_timeseries_store
+    from pywris.visualization.plot import plot_reservoirs
+    reservoirs = {f'Res {i}': Reservoir(f'Res {i}', None) for i in range(20)}
+    loader = TimeseriesLoader(reservoirs, 'Daily', '2024-01-01', '2024-01-31', coalesce_delay=0)
+    for reservoir in reservoirs.values():
+        reservoir._loader = loader
+
+    def mock_fetch(names, timestep, start_date, end_date, **kwargs):
+        return build_timeseries_store(pd.DataFrame({
+            'Reservoir Name': names, 'Date': [start_date] * len(names), 'Current Live Storage': [1.0] * len(names),
+        }))
+
+    with patch('pywris.surface_water.storage.reservoir.fetch_reservoir_timeseries', side_effect=mock_fetch) as mock_fetch_timeseries:
+        plot_reservoirs(reservoirs, reservoir_names=['Res 3', 'Res 7'])
+        plot_reservoirs(reservoirs)
+
+    assert [call.args[0] for call in mock_fetch_timeseries.call_args_list] == [
+        ['Res 3', 'Res 7'], [f'Res {i}' for i in range(20) if i not in (3, 7)],
+    ]
+
+@patch('plotly.graph_objects.Figure.show')
+def test_plot_reservoirs_point_budget(mock_show):
+    """
+    Edge test: the figure's point budget is split between the traces, and without reservoir names
+    only the largest reservoirs are plotted, with a warning.
+    """
+    from pywris.surface_water.storage.reservoir import Reservoir
+    from pywris.visualization.plot import plot_reservoirs
+    dates = pd.date_range('1991-01-01', '2024-12-31', freq='D')
+    reservoirs = {}
+    for i in range(10):
+        reservoirs[f'Res {i}'] = Reservoir(f'Res {i}', 'Kerala')
+        reservoirs[f'Res {i}'].live_cap_frl = float(i)
+        reservoirs[f'Res {i}'].data = pd.DataFrame({'Date': dates, 'Current Live Storage': np.random.uniform(0, 1, len(dates))})
+
+    with patch('plotly.graph_objects.Figure.add_trace', autospec=True, side_effect=lambda fig, trace, **kwargs: fig) as mock_add_trace:
+        plot_reservoirs(reservoirs, reservoir_names=list(reservoirs), max_total_points=5000)
+    traces = [call.args[1] for call in mock_add_trace.call_args_list]
+    assert len(traces) == 10
+    assert sum(len(trace.x) for trace in traces) <= 5000
+
+    with patch('plotly.graph_objects.Figure.add_trace', autospec=True, side_effect=lambda fig, trace, **kwargs: fig) as mock_add_trace, \
+         pytest.warns(UserWarning):
+        plot_reservoirs(reservoirs, max_traces=3)
+    assert [call.args[1].name for call in mock_add_trace.call_args_list] == ['Res 9', 'Res 8', 'Res 7']